@@ -1,10 +1,8 @@
-from app import create_app, db
+from app import create_app
 
+# Servidor de desarrollo (flask run / python app.py). En producción se usa gunicorn con app.wsgi.
+# Las tablas se crean con las migraciones: flask db upgrade
 app = create_app()
-app.app_context().push()
-
-with app.app_context():
-    db.create_all()
 
 if __name__ == '__main__':
-    app.run(host="0.0.0.0", port=5000)
\ No newline at end of file
+    app.run(host="0.0.0.0", port=5000)
@@ -1,14 +1,14 @@
 from flask import Flask
 from flask_migrate import Migrate
 from app.config.config import config
-from app.config.cache_config import cache_config
+from app.config.cache_config import cache_config, redis_config
 from app.resources.routes import RouteApp
-from flask_caching import Cache
+from app.cli import rollup_cli, charts_cli, partitions_cli
+from app.instrumentation import init_instrumentation
 import os
-from app.extensions import db
+from app.extensions import db, cache, init_redis
 
 migrate = Migrate()
-cache = Cache()
 
 def create_app():
     app_context = os.getenv("FLASK_CONTEXT")
@@ -26,9 +26,21 @@ def create_app():
     
     db.init_app(app)
     migrate.init_app(app, db)
-    cache.init_app(app, config=cache_config)
+    # Cada entorno puede reemplazar la configuración de caché con claves CACHE_* propias
+    cache_settings = dict(cache_config)
+    cache_settings.update({key: value for key, value in app.config.items() if key.startswith('CACHE_')})
+    redis_client = init_redis(app, redis_config)
+    if cache_settings['CACHE_TYPE'] in ('RedisCache', 'redis'):
+        # Flask-Caching acepta un cliente ya creado en lugar del host: usa el mismo pool
+        cache_settings['CACHE_REDIS_HOST'] = redis_client
+    cache.init_app(app, config=cache_settings)
     
     route = RouteApp()
     route.init_app(app)
+    init_instrumentation(app)
+
+    app.cli.add_command(rollup_cli)
+    app.cli.add_command(charts_cli)
+    app.cli.add_command(partitions_cli)
 
     return app
\ No newline at end of file
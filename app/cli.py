@@ -0,0 +1,72 @@
+import multiprocessing
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from app.extensions import db
+from app.models.partitioning import PARTITIONED, TRANSACTION_PARTITIONS_AHEAD, ensure_future_partitions
+from app.repository.monthly_summary_repository import MonthlySummaryRepository
+
+rollup_cli = AppGroup('rollup', help='Mantenimiento del resumen mensual de transacciones.')
+
+@rollup_cli.command('rebuild')
+@click.option('--user-id', type=int, default=None, help='Recalcula solo el resumen de este usuario.')
+def rebuild_rollup(user_id):
+    """Recalcula monthly_summary a partir de la tabla transaction."""
+    rows = MonthlySummaryRepository().rebuild(user_id=user_id)
+    click.echo(f"Resumen mensual recalculado: {rows} filas")
+
+charts_cli = AppGroup('charts', help='Dibujo de gráficos en segundo plano.')
+
+@charts_cli.command('worker')
+@click.option('--concurrency', type=int, default=None, help='Procesos de dibujo (por defecto CHART_WORKER_CONCURRENCY).')
+@click.option('--burst', is_flag=True, help='Termina cuando la cola queda vacía.')
+def chart_worker(concurrency, burst):
+    """Dibuja los gráficos encolados por los pedidos en modo asíncrono."""
+    # Imports diferidos: app.wsgi importa create_app, que a su vez importa este módulo
+    from app.services.chart_worker import CHART_WORKER_CONCURRENCY, run_chart_worker
+    from app.wsgi import close_connections
+
+    app = current_app._get_current_object()
+    concurrency = concurrency or CHART_WORKER_CONCURRENCY
+    if concurrency <= 1:
+        click.echo(f"Procesados: {run_chart_worker(app, burst=burst)}")
+        return
+
+    # Dibujar es CPU: se usan procesos (fork) para aprovechar varios núcleos
+    close_connections(app)
+    context = multiprocessing.get_context('fork')
+    processes = [
+        context.Process(target=_chart_worker_process, args=(app, burst), name=f'chart-worker-{index}')
+        for index in range(concurrency)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.join()
+
+def _chart_worker_process(app, burst):
+    from app.services.chart_worker import run_chart_worker
+    from app.wsgi import after_fork
+
+    after_fork(app)
+    run_chart_worker(app, burst=burst)
+
+partitions_cli = AppGroup('partitions', help='Particiones por fecha de la tabla transaction (PostgreSQL).')
+
+@partitions_cli.command('ensure')
+@click.option('--ahead', type=int, default=TRANSACTION_PARTITIONS_AHEAD, show_default=True,
+              help='Intervalos futuros que deben existir además del actual.')
+def ensure_partitions(ahead):
+    """Crea las particiones del intervalo actual y de los próximos (para ejecutar periódicamente)."""
+    if not PARTITIONED or db.engine.dialect.name != 'postgresql':
+        click.echo("La tabla transaction no está particionada (TRANSACTION_PARTITION_INTERVAL)")
+        return
+    with db.engine.begin() as connection:
+        created = ensure_future_partitions(connection, ahead=ahead)
+    click.echo(f"Particiones creadas: {', '.join(created) if created else 'ninguna'}")
@@ -5,6 +5,7 @@ import os
 """
 Configuración de la caché para la aplicación.
 Utiliza Redis como backend de caché y carga las credenciales desde variables de entorno.
+redis_config define el pool de conexiones a Redis que comparten la caché y los servicios.
 """
 
 basedir = os.path.abspath(Path(__file__).parents[2])
@@ -18,4 +19,20 @@ cache_config = {
     'CACHE_REDIS_DB': int(os.environ.get('REDIS_DB')),
     'CACHE_REDIS_PASSWORD': os.environ.get('REDIS_PASSWORD'),
     'CACHE_KEY_PREFIX': 'flask_'
-}
\ No newline at end of file
+}
+
+redis_config = {
+    'host': os.environ.get('REDIS_HOST'),
+    'port': int(os.environ.get('REDIS_PORT')),
+    'db': int(os.environ.get('REDIS_DB')),
+    'password': os.environ.get('REDIS_PASSWORD'),
+    # Conexiones máximas por proceso (cubrir los hilos del worker y los del tablero)
+    'max_connections': int(os.environ.get('REDIS_MAX_CONNECTIONS', 20)),
+    # Segundos que se espera una conexión libre cuando el pool está lleno
+    'timeout': float(os.environ.get('REDIS_POOL_TIMEOUT', 1)),
+    # Un Redis lento corta el comando en lugar de colgar el hilo del pedido
+    'socket_timeout': float(os.environ.get('REDIS_SOCKET_TIMEOUT', 1)),
+    'socket_connect_timeout': float(os.environ.get('REDIS_CONNECT_TIMEOUT', 1)),
+    # Verifica con PING las conexiones que estuvieron inactivas más de estos segundos
+    'health_check_interval': int(os.environ.get('REDIS_HEALTH_CHECK_INTERVAL', 30)),
+}
@@ -1,10 +1,32 @@
 from dotenv import load_dotenv
 from pathlib import Path
 import os
+from app.pool_metrics import MeteredQueuePool
 
 basedir = os.path.abspath(Path(__file__).parents[2])
 load_dotenv(os.path.join(basedir, '.env'))
 
+def engine_options(pool_size: int, max_overflow: int, pool_timeout: int, pool_recycle: int,
+                   statement_timeout: int = None) -> dict:
+    """
+    Opciones del engine de SQLAlchemy (pool de conexiones para PostgreSQL).
+    Los valores recibidos son los del entorno; las variables DB_POOL_* y DB_STATEMENT_TIMEOUT los reemplazan.
+    statement_timeout está en milisegundos (0 o None = sin límite) y se envía al conectar.
+    """
+    statement_timeout = int(os.environ.get('DB_STATEMENT_TIMEOUT', statement_timeout or 0))
+    options = {
+        'poolclass': MeteredQueuePool,
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', pool_size)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', max_overflow)),
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', pool_timeout)),
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', pool_recycle)),
+        # Descarta conexiones muertas (p. ej. después de reiniciar Postgres) antes de usarlas
+        'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', 'true').lower() == 'true',
+    }
+    if statement_timeout:
+        options['connect_args'] = {'options': f'-c statement_timeout={statement_timeout}'}
+    return options
+
 class Config:
     TESTING = False
     SQLALCHEMY_TRACK_MODIFICATIONS = False
@@ -15,18 +37,27 @@ class Config:
         pass
 
 class DevelopmentConfig(Config):
-    SQLALCHEMY_TRACK_MODIFICATIONS = True
     DEBUG = True
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(pool_size=5, max_overflow=5, pool_timeout=10, pool_recycle=1800)
     SQLALCHEMY_DATABASE_URI = os.environ.get('DEV_DB_URI')
 
 class TestingConfig(Config):
-    SQLALCHEMY_TRACK_MODIFICATIONS = True
     TESTING= True
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = os.environ.get('TEST_DB_URI')
+    # Caché en memoria del proceso: los tests no dependen de Redis
+    CACHE_TYPE = 'SimpleCache'
+    # Igual que Redis: delete_many sigue aunque alguna clave no exista
+    CACHE_IGNORE_ERRORS = True
+    # Sin opciones de pool: los tests también corren sobre SQLite en memoria (StaticPool)
+    SQLALCHEMY_ENGINE_OPTIONS = {'pool_pre_ping': True}
 
 class ProductionConfig(Config):
     SQLALCHEMY_DATABASE_URI = os.environ.get('PROD_DB_URI')
+    # pool_size + max_overflow por proceso debe entrar en max_connections de Postgres
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(
+        pool_size=10, max_overflow=10, pool_timeout=5, pool_recycle=1800, statement_timeout=30000
+    )
 
 config = {
     'development': DevelopmentConfig,
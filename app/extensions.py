@@ -1,3 +1,22 @@
+import redis
+from flask import Flask, current_app
 from flask_sqlalchemy import SQLAlchemy
+from flask_caching import Cache
+from app.instrumentation import InstrumentedRedis
 
-db = SQLAlchemy()
\ No newline at end of file
+db = SQLAlchemy()
+cache = Cache()
+
+def init_redis(app: Flask, settings: dict) -> redis.Redis:
+    """
+    Crea el cliente Redis de la app sobre un único pool de conexiones, compartido por la caché y los servicios.
+    El pool es bloqueante: con max_connections en uso, un pedido espera hasta timeout segundos
+    por una conexión libre en lugar de abrir otra (la cantidad de conexiones por proceso queda acotada).
+    """
+    client = InstrumentedRedis(connection_pool=redis.BlockingConnectionPool(**settings))
+    app.extensions['redis'] = client
+    return client
+
+def get_redis() -> redis.Redis:
+    """Devuelve el cliente Redis compartido de la app actual"""
+    return current_app.extensions['redis']
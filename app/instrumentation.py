@@ -0,0 +1,129 @@
+import logging
+import os
+import re
+import threading
+import time
+from typing import List
+import redis
+from flask import Flask, Response, g, has_app_context, request, before_render_template, template_rendered
+from flask_sqlalchemy.record_queries import get_recorded_queries
+
+"""
+Instrumentación por pedido.
+Lee las consultas que registra Flask-SQLAlchemy (SQLALCHEMY_RECORD_QUERIES) al terminar cada pedido:
+cuenta consultas y tiempo de base, registra en el log las lentas con sus parámetros y la ruta,
+y acumula por proceso las formas de consulta más lentas (ver /admin/slow-queries).
+Cada respuesta lleva un encabezado Server-Timing con los tiempos de base, caché, plantillas y total.
+"""
+
+logger = logging.getLogger(__name__)
+
+# Consultas que tarden más que esto (ms) se registran en el log
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 200))
+# Formas de consulta distintas que se conservan (al llenarse se descarta la de menor tiempo total)
+QUERY_STATS_MAX_SHAPES = int(os.environ.get('QUERY_STATS_MAX_SHAPES', 500))
+
+# Listas de parámetros como (?, ?, ?) o (%(id_1)s, %(id_2)s) se reducen a (?) para agrupar por forma
+_PLACEHOLDER = r"(?:\?|%\(\w+\)s|%s|\$\d+|:\w+)"
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+def query_shape(statement: str) -> str:
+    """Normaliza una sentencia para agrupar las que solo difieren en espacios o en la cantidad de parámetros"""
+    return _PLACEHOLDER_LIST.sub("(?)", _WHITESPACE.sub(" ", statement or "").strip())
+
+class QueryStats:
+    """Acumulados por forma de consulta (cantidad, tiempo total y máximo), seguros entre hilos"""
+
+    def __init__(self, max_shapes: int = QUERY_STATS_MAX_SHAPES):
+        self.max_shapes = max_shapes
+        self._lock = threading.Lock()
+        self._shapes = {}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._shapes.clear()
+
+    def record(self, statement: str, duration: float, route: str) -> None:
+        shape = query_shape(statement)
+        with self._lock:
+            stats = self._shapes.get(shape)
+            if stats is None:
+                if len(self._shapes) >= self.max_shapes:
+                    del self._shapes[min(self._shapes, key=lambda key: self._shapes[key]["total"])]
+                stats = self._shapes[shape] = {"count": 0, "total": 0.0, "max": 0.0, "route": route}
+            stats["count"] += 1
+            stats["total"] += duration
+            if duration >= stats["max"]:
+                stats["max"] = duration
+                stats["route"] = route
+
+    def top(self, limit: int = 20, order_by: str = "total") -> List[dict]:
+        """Las formas más lentas, por tiempo total (total) o por la ejecución más lenta (max)"""
+        with self._lock:
+            items = sorted(self._shapes.items(), key=lambda item: item[1][order_by], reverse=True)[:limit]
+            return [
+                {
+                    "statement": shape,
+                    "count": stats["count"],
+                    "total_ms": round(stats["total"] * 1000, 3),
+                    "avg_ms": round(stats["total"] * 1000 / stats["count"], 3),
+                    "max_ms": round(stats["max"] * 1000, 3),
+                    "slowest_route": stats["route"],
+                }
+                for shape, stats in items
+            ]
+
+query_stats = QueryStats()
+
+class InstrumentedRedis(redis.Redis):
+    """Cliente Redis que suma al pedido en curso el tiempo de cada comando (Server-Timing: cache)"""
+
+    def execute_command(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            return super().execute_command(*args, **options)
+        finally:
+            if has_app_context():
+                g.cache_time = g.get('cache_time', 0.0) + time.perf_counter() - start
+
+def init_instrumentation(app: Flask) -> None:
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    before_render_template.connect(_start_render, app)
+    template_rendered.connect(_finish_render, app)
+
+def _start_request() -> None:
+    # El contexto de aplicación puede venir de antes del pedido (tests, CLI): se cuenta desde acá
+    g.request_start = time.perf_counter()
+    g.query_offset = len(get_recorded_queries())
+    g.cache_time = 0.0
+    g.render_time = 0.0
+
+def _start_render(sender, template, context, **extra) -> None:
+    g.render_start = time.perf_counter()
+
+def _finish_render(sender, template, context, **extra) -> None:
+    if 'render_start' in g:
+        g.render_time = g.get('render_time', 0.0) + time.perf_counter() - g.pop('render_start')
+
+def _finish_request(response: Response) -> Response:
+    route = f"{request.method} {request.url_rule.rule if request.url_rule else request.path}"
+    queries = get_recorded_queries()[g.get('query_offset', 0):]
+    db_time = 0.0
+    for query in queries:
+        db_time += query.duration
+        query_stats.record(query.statement, query.duration, route)
+        if query.duration * 1000 >= SLOW_QUERY_MS:
+            logger.warning("Consulta lenta (%.1f ms) en %s desde %s: %s | parámetros: %.500r",
+                           query.duration * 1000, route, query.location, query.statement, query.parameters)
+
+    total = time.perf_counter() - g.get('request_start', time.perf_counter())
+    logger.debug("%s: %d consultas, %.1f ms de base, %.1f ms en total", route, len(queries), db_time * 1000, total * 1000)
+    response.headers['Server-Timing'] = ", ".join([
+        f'db;dur={db_time * 1000:.1f};desc="{len(queries)} queries"',
+        f"cache;dur={g.get('cache_time', 0.0) * 1000:.1f}",
+        f"render;dur={g.get('render_time', 0.0) * 1000:.1f}",
+        f"total;dur={total * 1000:.1f}",
+    ])
+    return response
@@ -1,4 +1,5 @@
 from .category_schema import CategorySchema
 from .user_schema import UserSchema
 from .transaction_schema import TransactionSchema
-from .response_schema import ResponseSchema
\ No newline at end of file
+from .response_schema import ResponseSchema
+from .fast_serializer import FastSerializer, dump_envelope
@@ -0,0 +1,99 @@
+import decimal
+from typing import Any, Callable, Iterable, List, Optional
+from marshmallow import Schema, fields
+
+"""
+Serialización rápida para los listados.
+FastSerializer recorre una sola vez los campos de un Schema de marshmallow y genera una función de volcado
+que solo lee atributos y aplica la conversión de cada campo, con el mismo resultado que Schema.dump.
+Los tipos de campo que no conoce se delegan en el propio campo de marshmallow.
+"""
+
+def _decimal_to_string(field: fields.Decimal) -> Callable[[Any], str]:
+    places = field.places
+    rounding = field.rounding
+
+    def convert(value):
+        num = decimal.Decimal(str(value))
+        if places is not None and num.is_finite():
+            num = num.quantize(places, rounding=rounding)
+        return format(num, "f")
+    return convert
+
+def _boolean(field: fields.Boolean) -> Callable[[Any], bool]:
+    def convert(value):
+        if value.__class__ is bool:
+            return value
+        return field._serialize(value, None, None)
+    return convert
+
+def _converter(field: fields.Field) -> Optional[Callable[[Any], Any]]:
+    """Devuelve la conversión equivalente a field._serialize para valores no nulos, o None si no la hay"""
+    kind = type(field)
+    if kind is fields.Nested:
+        nested = FastSerializer(field.schema)
+        return nested.dump_many if field.many else nested.dump_one
+    if kind is fields.Integer and not field.as_string:
+        return int
+    if kind is fields.Decimal and field.as_string:
+        return _decimal_to_string(field)
+    if kind in (fields.String, fields.Email):
+        return str
+    if kind is fields.Boolean:
+        return _boolean(field)
+    if kind is fields.Date and field.format in (None, "iso"):
+        return lambda value: value.isoformat()
+    if kind is fields.Raw:
+        return lambda value: value
+    return None
+
+def _compile(schema: Schema) -> Callable[[Any], dict]:
+    """
+    Genera el código de una función que vuelca un objeto con los campos del schema, por ejemplo:
+    def dump(obj): v0 = obj.id; ... return {'id': None if v0 is None else c0(v0), ...}
+    """
+    namespace = {}
+    lines = ["def dump(obj):"]
+    items = []
+    for index, (name, field) in enumerate(schema.dump_fields.items()):
+        key = field.data_key or name
+        attr = field.attribute or name
+        convert = _converter(field)
+        if convert is None or not attr.isidentifier():
+            # Se delega en marshmallow (también resuelve atributos anidados como "a.b")
+            namespace[f"f{index}"] = field
+            items.append(f"{key!r}: f{index}.serialize({name!r}, obj)")
+            continue
+        namespace[f"c{index}"] = convert
+        lines.append(f"    v{index} = obj.{attr}")
+        items.append(f"{key!r}: None if v{index} is None else c{index}(v{index})")
+    lines.append("    return {" + ", ".join(items) + "}")
+    exec("\n".join(lines), namespace)
+    return namespace["dump"]
+
+class FastSerializer:
+    """Versión precompilada de schema.dump para los campos de volcado del Schema"""
+
+    def __init__(self, schema: Schema):
+        self.dump_one = _compile(schema)
+
+    def dump_many(self, objs: Iterable[Any]) -> List[dict]:
+        dump_one = self.dump_one
+        return [dump_one(obj) for obj in objs]
+
+    def dump(self, obj: Any, many: bool = False):
+        return self.dump_many(obj) if many else self.dump_one(obj)
+
+def dump_envelope(response) -> dict:
+    """
+    Arma el cuerpo de un ResponseMessage igual que ResponseSchema.dump, sin pasar por marshmallow
+    (data ya viene serializada).
+    """
+    body = {
+        "message": response.message,
+        "status_code": response.status_code,
+        "data": response.data,
+    }
+    if response.next_cursor is not None:
+        body["next_cursor"] = response.next_cursor
+    return body
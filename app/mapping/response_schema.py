@@ -1,7 +1,15 @@
-from marshmallow import validate, fields, Schema
+from marshmallow import validate, fields, Schema, post_dump
 
 
 class ResponseSchema(Schema):
     message = fields.String(required=True, validate=validate.Length(min=1))
     status_code = fields.Integer(required=True)
-    data = fields.Raw(required=False)
\ No newline at end of file
+    data = fields.Raw(required=False)
+    next_cursor = fields.String(required=False, allow_none=True)
+
+    @post_dump
+    def remove_empty_cursor(self, data, **kwargs):
+        # Solo las respuestas paginadas por cursor con página siguiente incluyen next_cursor
+        if data.get('next_cursor') is None:
+            data.pop('next_cursor', None)
+        return data
\ No newline at end of file
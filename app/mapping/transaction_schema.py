@@ -1,6 +1,10 @@
-from marshmallow import Schema, fields, post_load
+import os
+from marshmallow import Schema, ValidationError, fields, post_load, validate, validates_schema
 from app.models import Transaction
 
+# Máximo de IDs por operación masiva (una sola sentencia)
+BULK_SELECTION_MAX_IDS = int(os.environ.get('BULK_SELECTION_MAX_IDS', 10000))
+
 class TransactionSchema(Schema):
     id = fields.Int(dump_only=True)
     amount = fields.Decimal(as_string=True, required=True)
@@ -20,3 +24,26 @@ class TransactionSchema(Schema):
     @post_load
     def make_transaction(self, data, **kwargs):
         return Transaction(**data)
+
+def transaction_fields(transaction: Transaction) -> dict:
+    """Devuelve como diccionario los campos cargados en una Transaction creada por TransactionSchema.load"""
+    return {key: value for key, value in vars(transaction).items() if not key.startswith('_')}
+
+class TransactionSelectionSchema(Schema):
+    """Transacciones de un usuario sobre las que opera un borrado o una restauración masiva: por IDs y/o filtros"""
+    FILTERS = ('start_date', 'end_date', 'is_income', 'category_id')
+
+    user_id = fields.Int(required=True)
+    ids = fields.List(fields.Int(), validate=validate.Length(min=1, max=BULK_SELECTION_MAX_IDS))
+    start_date = fields.Date()
+    end_date = fields.Date()
+    is_income = fields.Bool()
+    category_id = fields.Int()
+    # Solo para el borrado: elimina las filas en lugar de marcarlas como borradas
+    hard = fields.Bool(load_default=False)
+
+    @validates_schema
+    def require_selection(self, data, **kwargs):
+        # Sin IDs ni filtros la operación alcanzaría todas las transacciones del usuario
+        if 'ids' not in data and not any(name in data for name in self.FILTERS):
+            raise ValidationError("Indique 'ids' o al menos un filtro (start_date, end_date, is_income, category_id).")
@@ -1,3 +1,5 @@
 from .user import User
 from .category import Category
-from .transaction import Transaction
\ No newline at end of file
+from .transaction import Transaction
+from .monthly_summary import MonthlySummary
+from .records import TransactionRecord, UserRef, CategoryRef
@@ -0,0 +1,15 @@
+from app.extensions import db
+
+# Valor usado en category_id para las transacciones sin categoría (la clave primaria no admite NULL)
+NO_CATEGORY = 0
+
+class MonthlySummary(db.Model):
+    """Total y cantidad de transacciones por usuario, mes, categoría y tipo (mantenido por TransactionService)"""
+    __tablename__ = 'monthly_summary'
+
+    user_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    year_month = db.Column(db.String(7), primary_key=True)  # formato YYYY-MM
+    category_id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    is_income = db.Column(db.Boolean, primary_key=True)
+    total = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    count = db.Column(db.Integer, nullable=False, default=0)
@@ -0,0 +1,92 @@
+import os
+from datetime import date
+from typing import Iterator, List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+"""
+Particionado de la tabla transaction por rango de fecha (solo PostgreSQL).
+Con TRANSACTION_PARTITION_INTERVAL=month o year, transaction es una tabla particionada (PARTITION BY RANGE (date))
+con una partición por mes (transaction_p2025_01) o por año (transaction_p2025) y una partición por defecto
+(transaction_default) que recibe las fechas sin partición propia, así ningún INSERT falla por la fecha.
+Las consultas con límites de fecha solo leen las particiones del rango (partition pruning).
+Las particiones futuras se crean con `flask partitions ensure` (cron) y al arrancar la app de producción.
+"""
+
+# month, year o vacío (tabla sin particionar); debe coincidir con el valor usado al aplicar la migración
+TRANSACTION_PARTITION_INTERVAL = os.environ.get('TRANSACTION_PARTITION_INTERVAL', '').lower()
+# Cuántos intervalos hacia adelante se mantienen creados (además del actual)
+TRANSACTION_PARTITIONS_AHEAD = int(os.environ.get('TRANSACTION_PARTITIONS_AHEAD', 3))
+
+PARTITION_INTERVALS = ('month', 'year')
+PARTITIONED = TRANSACTION_PARTITION_INTERVAL in PARTITION_INTERVALS
+DEFAULT_PARTITION = 'transaction_default'
+
+def partition_start(day: date, interval: str) -> date:
+    """Primer día del intervalo que contiene a day"""
+    return day.replace(month=1, day=1) if interval == 'year' else day.replace(day=1)
+
+def next_start(start: date, interval: str) -> date:
+    """Primer día del intervalo siguiente"""
+    if interval == 'year':
+        return start.replace(year=start.year + 1)
+    return start.replace(year=start.year + 1, month=1) if start.month == 12 else start.replace(month=start.month + 1)
+
+def partition_name(start: date, interval: str) -> str:
+    return f"transaction_p{start:%Y}" if interval == 'year' else f"transaction_p{start:%Y_%m}"
+
+def partition_ranges(first: date, last: date, interval: str) -> Iterator[Tuple[str, date, date]]:
+    """Particiones (nombre, desde inclusive, hasta exclusive) que cubren de first a last"""
+    start = partition_start(first, interval)
+    while start <= last:
+        end = next_start(start, interval)
+        yield partition_name(start, interval), start, end
+        start = end
+
+def existing_partitions(connection: Connection) -> List[str]:
+    return list(connection.scalars(text("""
+        SELECT child.relname FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE pg_inherits.inhparent = '"transaction"'::regclass
+    """)))
+
+def ensure_partitions(connection: Connection, first: date, last: date,
+                      interval: str = TRANSACTION_PARTITION_INTERVAL) -> List[str]:
+    """
+    Crea las particiones que falten entre first y last y devuelve sus nombres.
+    Si la partición por defecto ya tiene filas del rango, se la desacopla, se crea la partición,
+    se mueven esas filas y se la vuelve a acoplar (PostgreSQL no permite crearla con filas en conflicto).
+    """
+    existing = set(existing_partitions(connection))
+    created = []
+    for name, start, end in partition_ranges(first, last, interval):
+        if name in existing:
+            continue
+        bounds = {"start": start, "end": end}
+        create = text(f"""CREATE TABLE {name} PARTITION OF "transaction" FOR VALUES FROM ('{start}') TO ('{end}')""")
+        in_default = DEFAULT_PARTITION in existing and connection.scalar(text(
+            f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE date >= :start AND date < :end)"
+        ), bounds)
+        if in_default:
+            connection.execute(text(f'ALTER TABLE "transaction" DETACH PARTITION {DEFAULT_PARTITION}'))
+            connection.execute(create)
+            connection.execute(text(
+                f'INSERT INTO "transaction" SELECT * FROM {DEFAULT_PARTITION} WHERE date >= :start AND date < :end'
+            ), bounds)
+            connection.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE date >= :start AND date < :end"), bounds)
+            connection.execute(text(f'ALTER TABLE "transaction" ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT'))
+        else:
+            connection.execute(create)
+        created.append(name)
+    return created
+
+def ensure_future_partitions(connection: Connection, ahead: int = TRANSACTION_PARTITIONS_AHEAD,
+                             today: Optional[date] = None,
+                             interval: str = TRANSACTION_PARTITION_INTERVAL) -> List[str]:
+    """Crea la partición del intervalo actual y las de los próximos `ahead` intervalos, más la de por defecto"""
+    today = today or date.today()
+    last = partition_start(today, interval)
+    for _ in range(ahead):
+        last = next_start(last, interval)
+    connection.execute(text(f'CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF "transaction" DEFAULT'))
+    return ensure_partitions(connection, today, last, interval)
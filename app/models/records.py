@@ -0,0 +1,30 @@
+from datetime import date
+from decimal import Decimal
+from typing import NamedTuple, Optional
+
+"""
+Registros de solo lectura para los listados y exportaciones.
+No están asociados a la sesión: no tienen seguimiento de cambios ni ocupan el identity map.
+Exponen los mismos atributos que usan TransactionSchema y el CSV, así se serializan igual que los modelos.
+"""
+
+class UserRef(NamedTuple):
+    id: int
+    username: str
+
+class CategoryRef(NamedTuple):
+    id: int
+    name: str
+
+class TransactionRecord(NamedTuple):
+    id: int
+    amount: Decimal
+    date: date
+    description: Optional[str]
+    method: Optional[str]
+    is_income: bool
+    deleted: bool
+    user_id: int
+    category_id: Optional[int]
+    user: UserRef
+    category: Optional[CategoryRef]
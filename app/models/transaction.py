@@ -1,28 +1,37 @@
-from sqlalchemy import Index, text
+from sqlalchemy import Index, event, text
 from app.extensions import db
+from app.models.partitioning import PARTITIONED, ensure_future_partitions
 
 class Transaction(db.Model):
     __tablename__ = 'transaction'
     __table_args__ = (
-        # Para listar rápido transacciones de un usuario
-        Index('ix_txn_user', 'user_id'),
-        # Para listar rápido transacciones de un usuario por fecha
+        # Transacciones de un usuario por fecha, incluidas las borradas (restaurar, borrar usuario)
         Index('ix_txn_user_date', 'user_id', 'date'),
         # Búsquedas por categoría
         Index('ix_txn_category', 'category_id'),
-        # Si filtras mucho por tipo ingreso/egreso
-        Index('ix_txn_income', 'is_income'),
-        # Para excluir las transacciones borradas de forma ultra‑rápida sin tocar todas las filas (Postgres partial index)
+        # Listados y reportes de un usuario sobre transacciones activas, en el orden de la paginación.
+        # INCLUDE cubre los agregados (totales, indicadores, gráfico) con un index-only scan
         Index(
-            'ix_txn_active',
-            'id',
+            'ix_txn_user_date_active',
+            'user_id', text('date DESC'), text('id DESC'),
+            postgresql_include=['amount', 'is_income', 'category_id'],
             postgresql_where=text('deleted = false')
         ),
+        # Listados y totales de todos los usuarios (sin user_id)
+        Index(
+            'ix_txn_date_active',
+            text('date DESC'), text('id DESC'),
+            postgresql_include=['amount', 'is_income'],
+            postgresql_where=text('deleted = false')
+        ),
+        # Particionada por rango de fecha (ver app/models/partitioning.py)
+        {'postgresql_partition_by': 'RANGE (date)'} if PARTITIONED else {},
     )
 
-    id = db.Column(db.Integer, primary_key=True)
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     amount = db.Column(db.Numeric(10, 2), nullable=False)
-    date = db.Column(db.Date, nullable=False)
+    # En una tabla particionada la clave primaria debe incluir la columna de partición
+    date = db.Column(db.Date, nullable=False, primary_key=PARTITIONED)
     description = db.Column(db.String(255))
     method = db.Column(db.String(50))
     is_income = db.Column(db.Boolean, nullable=False, default=False)
@@ -32,4 +41,13 @@ class Transaction(db.Model):
     category_id = db.Column(db.Integer, db.ForeignKey('category.id'))
 
     user = db.relationship('User', back_populates='transactions')
-    category = db.relationship('Category', back_populates='transactions')
\ No newline at end of file
+    category = db.relationship('Category', back_populates='transactions')
+
+    # La identidad en el ORM sigue siendo id (get(id) funciona igual con o sin particiones)
+    __mapper_args__ = {'primary_key': [id]}
+
+@event.listens_for(Transaction.__table__, 'after_create')
+def _create_partitions(target, connection, **kw):
+    """Con create_all sobre PostgreSQL crea la partición por defecto y las del intervalo actual y siguientes"""
+    if PARTITIONED and connection.dialect.name == 'postgresql':
+        ensure_future_partitions(connection)
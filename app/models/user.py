@@ -1,5 +1,5 @@
 from app.extensions import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.passwords import password_hasher
 
 class User(db.Model):
     __tablename__ = 'user'
@@ -11,7 +11,7 @@ class User(db.Model):
     transactions = db.relationship('Transaction', back_populates='user', lazy='dynamic')
 
     def set_password(self, password: str):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password: str) -> bool:
-        return check_password_hash(self.password_hash, password)
\ No newline at end of file
+        return password_hasher.verify(self.password_hash, password)
\ No newline at end of file
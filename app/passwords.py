@@ -0,0 +1,107 @@
+import logging
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+"""
+Hash de contraseñas fuera del hilo del pedido.
+Calcular o verificar un hash (scrypt o PBKDF2) es CPU pura y tarda decenas de milisegundos a propósito.
+Se ejecuta en un pool de hilos acotado: hashlib libera el GIL, así que los hashes corren en paralelo
+sin ocupar más de PASSWORD_HASH_WORKERS núcleos, y con más de PASSWORD_HASH_MAX_PENDING en curso
+los pedidos nuevos fallan rápido (PasswordHasherBusy) en lugar de acumularse durante una ráfaga de logins.
+El costo se configura con PASSWORD_HASH_METHOD (formato de werkzeug, por ejemplo scrypt:32768:8:1 o
+pbkdf2:sha256:600000); los hashes con otro costo se recalculan en el próximo login correcto.
+"""
+
+logger = logging.getLogger(__name__)
+
+PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+PASSWORD_SALT_LENGTH = int(os.environ.get('PASSWORD_SALT_LENGTH', 16))
+# Hashes simultáneos (hilos); conviene no superar los núcleos disponibles
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+# Hashes en curso o en espera antes de rechazar los nuevos
+PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', 32))
+# Segundos que un pedido espera un lugar en la cola
+PASSWORD_HASH_TIMEOUT = float(os.environ.get('PASSWORD_HASH_TIMEOUT', 2))
+
+class PasswordHasherBusy(Exception):
+    """No hay lugar para calcular otro hash: el pedido debe reintentarse más tarde"""
+
+def _thread_pool(workers: int):
+    # Con gevent (monkey patching) los hilos de threading son greenlets: se usan hilos nativos de gevent
+    monkey = sys.modules.get('gevent.monkey')
+    if monkey is not None and monkey.is_module_patched('threading'):
+        from gevent.threadpool import ThreadPoolExecutor as GeventThreadPoolExecutor
+        return GeventThreadPoolExecutor(max_workers=workers)
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+
+def normalize_method(method: str) -> str:
+    """
+    Método con todos sus parámetros tal como werkzeug lo guarda en el hash (pbkdf2 → pbkdf2:sha256:600000),
+    armado a partir del texto y sin calcular ningún hash. Lanza ValueError si el método es inválido.
+    """
+    name, *args = method.split(':')
+    if name == 'scrypt':
+        if not args:
+            return f'scrypt:{2 ** 15}:8:1'
+        try:
+            n, r, p = map(int, args)
+        except ValueError:
+            raise ValueError("'scrypt' takes 3 arguments.") from None
+        return f'scrypt:{n}:{r}:{p}'
+    if name == 'pbkdf2':
+        if len(args) > 2:
+            raise ValueError("'pbkdf2' takes 2 arguments.")
+        hash_name = args[0] if args else 'sha256'
+        iterations = int(args[1]) if len(args) == 2 else DEFAULT_PBKDF2_ITERATIONS
+        return f'pbkdf2:{hash_name}:{iterations}'
+    raise ValueError(f"Invalid hash method '{method}'.")
+
+class PasswordHasher:
+    def __init__(self, method: str = PASSWORD_HASH_METHOD, salt_length: int = PASSWORD_SALT_LENGTH,
+                 workers: int = PASSWORD_HASH_WORKERS, max_pending: int = PASSWORD_HASH_MAX_PENDING,
+                 timeout: float = PASSWORD_HASH_TIMEOUT):
+        self.method = method
+        self.salt_length = salt_length
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def run(self, func: Callable[..., Any], *args) -> Any:
+        """Ejecuta func en el pool y espera el resultado; lanza PasswordHasherBusy si la cola está llena"""
+        if not self._slots.acquire(timeout=self.timeout):
+            logger.warning("Cola de hashes de contraseña llena: se rechaza el pedido")
+            raise PasswordHasherBusy()
+        try:
+            return self._pool().submit(func, *args).result()
+        finally:
+            self._slots.release()
+
+    def hash(self, password: str) -> str:
+        return self.run(generate_password_hash, password, self.method, self.salt_length)
+
+    def verify(self, password_hash: str, password: str) -> bool:
+        return self.run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """Indica si el hash se calculó con un método o costo distinto del configurado"""
+        return password_hash.split('$', 1)[0] != self.effective_method
+
+    @property
+    def effective_method(self) -> str:
+        """Método configurado con todos sus parámetros (ver normalize_method)"""
+        return normalize_method(self.method)
+
+    def _pool(self):
+        # Se crea al primer uso: no hay hilos en el maestro de gunicorn antes del fork
+        with self._lock:
+            if self._executor is None:
+                self._executor = _thread_pool(self.workers)
+            return self._executor
+
+password_hasher = PasswordHasher()
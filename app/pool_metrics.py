@@ -0,0 +1,83 @@
+import logging
+import os
+import threading
+import time
+from sqlalchemy import exc
+from sqlalchemy.pool import Pool, QueuePool
+
+"""
+Métricas del pool de conexiones de SQLAlchemy.
+MeteredQueuePool mide cuánto tarda cada checkout en conseguir una conexión (espera en la cola
+o apertura de una conexión nueva) y cuántos terminan en timeout. Los acumulados son por proceso
+y sobreviven a engine.dispose(), que recrea el pool.
+"""
+
+logger = logging.getLogger(__name__)
+
+# Checkouts que tarden más que esto (ms) se registran en el log junto con el estado del pool
+POOL_WAIT_WARN_MS = float(os.environ.get('POOL_WAIT_WARN_MS', 100))
+
+class PoolStats:
+    """Acumulados de espera del pool, seguros entre hilos"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.total_wait = 0.0
+            self.max_wait = 0.0
+
+    def record(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait * 1000 / self.checkouts, 3) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+pool_stats = PoolStats()
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool que registra en pool_stats el tiempo de cada checkout"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            pool_stats.record(waited, timed_out)
+            if timed_out or waited * 1000 >= POOL_WAIT_WARN_MS:
+                logger.warning("Checkout del pool tardó %.1f ms%s: %s",
+                               waited * 1000, " (timeout)" if timed_out else "", self.status())
+
+def pool_status(pool: Pool) -> dict:
+    """Estado actual del pool (conexiones en uso, libres y overflow) más los acumulados de espera"""
+    status = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "timeout": pool.timeout(),
+        })
+    status.update(pool_stats.snapshot())
+    return status
@@ -1 +1,3 @@
-from .csv_export import export_transactions_to_csv
\ No newline at end of file
+from .csv_export import export_transactions_to_csv, iter_transactions_csv
+from .csv_import import iter_transaction_chunks
+from .charts import render_donut, render_donut_png, render_donut_svg, chart_mimetype
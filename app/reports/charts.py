@@ -0,0 +1,128 @@
+import math
+from io import BytesIO
+from typing import List
+from xml.sax.saxutils import escape
+
+"""
+Dibujo de gráficos.
+matplotlib (y numpy) se importan recién al dibujar el primer gráfico: el resto de los procesos
+que importan los servicios (CLI, migraciones, tests, workers sin gráficos) no pagan su carga.
+Se usa la API orientada a objetos (Figure) en lugar de pyplot, que mantiene estado global
+y no es segura con varios hilos por worker.
+render_donut_svg dibuja el mismo gráfico como SVG en Python puro, sin matplotlib.
+"""
+
+# Formatos de gráfico disponibles y su tipo MIME
+CHART_MIMETYPES = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml',
+}
+
+def _figure_class():
+    # Import diferido: la primera llamada carga matplotlib, las siguientes lo toman de sys.modules
+    from matplotlib.figure import Figure
+    return Figure
+
+def render_donut_png(amounts: List[float], labels: List[str], colors: List[str]) -> bytes:
+    """Dibuja el gráfico de dona de gastos por categoría y devuelve el PNG"""
+    fig = _figure_class()(figsize=(6, 6), dpi=100)
+    ax = fig.subplots()
+
+    wedges, _ = ax.pie(
+        amounts,
+        labels=None,
+        startangle=90,
+        wedgeprops=dict(width=0.4, edgecolor='white'),
+        colors=colors
+    )
+
+    legend_labels = [f"{label}  ${int(amount)}" for label, amount in zip(labels, amounts)]
+
+    ax.legend(
+        wedges,
+        legend_labels,
+        title="Categorías",
+        loc='lower center',
+        bbox_to_anchor=(0.5, -0.15),
+        ncol=2,
+        frameon=False,
+        fontsize=10
+    )
+
+    buffer = BytesIO()
+    try:
+        fig.savefig(buffer, format='png', transparent=True, bbox_inches='tight')
+        return buffer.getvalue()
+    finally:
+        buffer.close()
+
+# Medidas del SVG en px: dona de radio 1 con ancho 0.4 como la de matplotlib, leyenda en 2 columnas debajo
+SVG_WIDTH = 440
+SVG_RADIUS = 200
+SVG_HOLE = SVG_RADIUS * 0.6
+SVG_LEGEND_ROW = 22
+SVG_FONT = "font-family:DejaVu Sans,Verdana,sans-serif"
+
+def _point(angle: float, radius: float, center: float) -> str:
+    """Punto del círculo en coordenadas SVG (el eje y crece hacia abajo)"""
+    rad = math.radians(angle)
+    return f"{center + radius * math.cos(rad):.2f},{center - radius * math.sin(rad):.2f}"
+
+def _wedge_path(start: float, end: float, center: float) -> str:
+    """Sector de la dona entre dos ángulos (antihorario, en grados)"""
+    middle = (start + end) / 2
+    outer, hole = SVG_RADIUS, SVG_HOLE
+    # Cada arco se parte en dos mitades (de hasta 180°) para poder dibujar también el círculo completo
+    return (
+        f"M{_point(start, outer, center)}"
+        f"A{outer:g},{outer:g} 0 0 0 {_point(middle, outer, center)}"
+        f"A{outer:g},{outer:g} 0 0 0 {_point(end, outer, center)}"
+        f"L{_point(end, hole, center)}"
+        f"A{hole:g},{hole:g} 0 0 1 {_point(middle, hole, center)}"
+        f"A{hole:g},{hole:g} 0 0 1 {_point(start, hole, center)}Z"
+    )
+
+def render_donut_svg(amounts: List[float], labels: List[str], colors: List[str]) -> bytes:
+    """Dibuja el gráfico de dona de gastos por categoría como SVG (mismo aspecto y leyenda que el PNG)"""
+    center = SVG_WIDTH / 2
+    total = float(sum(amounts))
+    wedges, legend = [], []
+
+    # Sectores desde las 12 en punto, en sentido antihorario (startangle=90 de matplotlib)
+    angle = 90.0
+    # Si hay más sectores que colores se repiten, como en matplotlib
+    colors = [colors[index % len(colors)] for index in range(len(amounts))]
+    for amount, color in zip(amounts, colors):
+        sweep = 360.0 * float(amount) / total if total else 0.0
+        if sweep > 0:
+            wedges.append(f'<path d="{_wedge_path(angle, angle + sweep, center)}" fill="{color}"/>')
+        angle += sweep
+
+    # Leyenda en 2 columnas debajo de la dona
+    top = SVG_WIDTH + 10
+    legend.append(f'<text x="{center:g}" y="{top + 14}" text-anchor="middle" font-size="13">Categorías</text>')
+    for index, (label, amount, color) in enumerate(zip(labels, amounts, colors)):
+        x = 40 + (index % 2) * (SVG_WIDTH / 2)
+        y = top + 26 + (index // 2) * SVG_LEGEND_ROW
+        legend.append(
+            f'<rect x="{x:g}" y="{y}" width="18" height="12" fill="{color}"/>'
+            f'<text x="{x + 26:g}" y="{y + 11}" font-size="13">{escape(f"{label}  ${int(amount)}")}</text>'
+        )
+
+    height = top + 26 + math.ceil(len(labels) / 2) * SVG_LEGEND_ROW + 10
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{SVG_WIDTH}" height="{height}" '
+        f'viewBox="0 0 {SVG_WIDTH} {height}" style="{SVG_FONT}">'
+        f'<g stroke="#fff" stroke-width="1">{"".join(wedges)}</g>{"".join(legend)}</svg>'
+    ).encode('utf-8')
+
+def render_donut(chart_format: str, amounts: List[float], labels: List[str], colors: List[str]) -> bytes:
+    """Dibuja el gráfico en el formato pedido ('png' o 'svg')"""
+    if chart_format == 'svg':
+        return render_donut_svg(amounts, labels, colors)
+    return render_donut_png(amounts, labels, colors)
+
+def chart_mimetype(image_key: str) -> str:
+    """Tipo MIME de una imagen guardada según la extensión de su clave (sin extensión es PNG)"""
+    extension = image_key.rsplit('.', 1)[-1] if '.' in image_key else 'png'
+    return CHART_MIMETYPES.get(extension, 'application/octet-stream')
@@ -1,38 +1,62 @@
 import csv
 import io
-from typing import List
+from typing import Iterable, Iterator, List, Union
 from app.models.transaction import Transaction
+from app.models.records import TransactionRecord
 
-def export_transactions_to_csv(transactions: List[Transaction]) -> bytes:
+CSV_HEADERS = [
+    "amount",
+    "date",
+    "description",
+    "method",
+    "is_income",
+    "category_id"
+]
+
+def _transaction_row(txn: Union[Transaction, TransactionRecord]) -> list:
+    """Convierte una transacción (modelo o registro de solo lectura) en la fila CSV correspondiente"""
+    return [
+        float(txn.amount),
+        txn.date.isoformat() if txn.date else "",
+        txn.description or "",
+        txn.method or "",
+        txn.is_income,
+        txn.category_id if txn.category_id is not None else "",
+    ]
+
+def iter_transactions_csv(transactions: Iterable[Union[Transaction, TransactionRecord]], rows_per_chunk: int = 500) -> Iterator[str]:
     """
-    Recibe una lista de instancias Transaction y devuelve un archivo CSV en bytes.
-    Columnas: id, user_id, amount, date, description, method, is_income, category_id, deleted
+    Genera el CSV de forma incremental, devolviendo bloques de texto de a rows_per_chunk filas.
+    El encabezado se emite antes de consumir el iterable, así el primer byte sale
+    antes de que termine la consulta. La memoria usada depende del tamaño del bloque, no del total.
     """
-    output = io.StringIO()
-    writer = csv.writer(output)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
 
     # Encabezados
-    writer.writerow([
-        "amount",
-        "date",
-        "description",
-        "method",
-        "is_income",
-        "category_id"
-    ])
+    writer.writerow(CSV_HEADERS)
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
 
     # Filas
+    pending = 0
     for txn in transactions:
-        writer.writerow([
-            float(txn.amount),
-            txn.date.isoformat() if txn.date else "",
-            txn.description or "",
-            txn.method or "",
-            txn.is_income,
-            txn.category_id if txn.category_id is not None else "",
-        ])
+        writer.writerow(_transaction_row(txn))
+        pending += 1
+        if pending >= rows_per_chunk:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+
+    if pending:
+        yield buffer.getvalue()
+    buffer.close()
 
-    # Obtener bytes
-    csv_data = output.getvalue().encode('utf-8')
-    output.close()
-    return csv_data
+def export_transactions_to_csv(transactions: List[Transaction]) -> bytes:
+    """
+    Recibe una lista de instancias Transaction y devuelve un archivo CSV en bytes.
+    Columnas: amount, date, description, method, is_income, category_id
+    """
+    return "".join(iter_transactions_csv(transactions)).encode('utf-8')
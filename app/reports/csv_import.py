@@ -0,0 +1,67 @@
+import csv
+from typing import Dict, Iterator, List, TextIO, Tuple
+from marshmallow import ValidationError
+from app.mapping import TransactionSchema
+from app.mapping.transaction_schema import transaction_fields
+from app.reports.csv_export import CSV_HEADERS
+
+_rows_schema = TransactionSchema(many=True)
+
+def iter_transaction_chunks(
+    stream: TextIO,
+    user_id: int,
+    chunk_size: int = 5000
+) -> Iterator[Tuple[Dict[int, dict], Dict[int, dict]]]:
+    """
+    Lee un CSV con el formato de export_transactions_to_csv de forma incremental.
+    Devuelve bloques (filas válidas, errores), ambos por número de línea, de a chunk_size filas,
+    así la memoria usada no depende del tamaño del archivo. Lanza ValueError si el encabezado no coincide.
+    """
+    reader = csv.reader(stream)
+    header = next(reader, None)
+    if header is None or [column.strip() for column in header] != CSV_HEADERS:
+        raise ValueError(f"Encabezado inválido, se esperaba: {','.join(CSV_HEADERS)}")
+
+    chunk = []
+    # La línea 1 es el encabezado
+    for line_number, values in enumerate(reader, start=2):
+        if not values:
+            continue
+        chunk.append((line_number, values))
+        if len(chunk) >= chunk_size:
+            yield _validate_chunk(chunk, user_id)
+            chunk = []
+    if chunk:
+        yield _validate_chunk(chunk, user_id)
+
+def _validate_chunk(chunk: List[Tuple[int, List[str]]], user_id: int) -> Tuple[Dict[int, dict], Dict[int, dict]]:
+    """Valida un bloque de líneas con TransactionSchema y separa las filas válidas de los errores"""
+    errors = {}
+    payload = []
+    line_numbers = []
+    for line_number, values in chunk:
+        if len(values) != len(CSV_HEADERS):
+            errors[line_number] = {"_schema": [f"Se esperaban {len(CSV_HEADERS)} columnas"]}
+            continue
+        row = dict(zip(CSV_HEADERS, values))
+        # Las celdas vacías se omiten para que tomen el valor por defecto del modelo
+        row = {key: value for key, value in row.items() if value != ""}
+        row["user_id"] = user_id
+        payload.append(row)
+        line_numbers.append(line_number)
+
+    try:
+        valid_data = _rows_schema.load(payload)
+        failed = {}
+        valid_data = [transaction_fields(txn) for txn in valid_data]
+    except ValidationError as err:
+        failed = err.messages
+        valid_data = err.valid_data
+
+    rows = {}
+    for index, line_number in enumerate(line_numbers):
+        if index in failed:
+            errors[line_number] = failed[index]
+        else:
+            rows[line_number] = valid_data[index]
+    return rows, errors
@@ -1,3 +1,4 @@
 from .user_respository import UserRepository
 from .transaction_repository import TransactionRepository
-from .category_repository import CategoryRepository
\ No newline at end of file
+from .category_repository import CategoryRepository
+from .monthly_summary_repository import MonthlySummaryRepository
\ No newline at end of file
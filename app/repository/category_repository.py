@@ -1,4 +1,4 @@
-from typing import List
+from typing import Iterable, List, Set
 from app.extensions import db
 from app.models import Category
 
@@ -30,6 +30,13 @@ class CategoryRepository:
         """Devuelve la categoría por su ID."""
         return Category.query.get(category_id)
 
+    def existing_ids(self, category_ids: Iterable[int]) -> Set[int]:
+        """Devuelve cuáles de los IDs indicados existen."""
+        ids = set(category_ids)
+        if not ids:
+            return set()
+        return set(db.session.scalars(db.select(Category.id).where(Category.id.in_(ids))))
+
     def get_by_name(self, name: str) -> Category:
         """Devuelve la categoría por su name."""
         return Category.query.filter_by(name=name).all()
@@ -0,0 +1,163 @@
+from typing import Dict, List, Optional, Tuple
+from decimal import Decimal
+from app.extensions import db
+from app.models import Transaction, Category, MonthlySummary
+from app.models.monthly_summary import NO_CATEGORY
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+class MonthlySummaryRepository:
+    """
+    Repositorio del resumen mensual por usuario/mes/categoría/tipo.
+    Los métodos de escritura no hacen commit: se ejecutan en la misma transacción
+    que el cambio sobre la tabla transaction.
+    """
+
+    _upsert_insert = {
+        'postgresql': pg_insert,
+        'sqlite': sqlite_insert,
+    }
+
+    def apply(
+        self,
+        user_id: int,
+        txn_date,
+        category_id: Optional[int],
+        is_income: bool,
+        amount,
+        sign: int = 1,
+        count: int = 1
+    ) -> None:
+        """
+        Suma (sign=1) o resta (sign=-1) el monto de una transacción a la fila de su mes.
+        Con count > 1, amount es el total acumulado de count transacciones con la misma clave.
+        """
+        values = {
+            'user_id': int(user_id),
+            'year_month': self.month_key(txn_date),
+            'category_id': int(category_id) if category_id not in (None, '') else NO_CATEGORY,
+            'is_income': bool(is_income),
+            'total': Decimal(str(amount)) * sign,
+            'count': count * sign,
+        }
+        dialect = db.session.get_bind().dialect.name
+        stmt = self._upsert_insert[dialect](MonthlySummary).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['user_id', 'year_month', 'category_id', 'is_income'],
+            set_={
+                'total': MonthlySummary.total + stmt.excluded.total,
+                'count': MonthlySummary.count + stmt.excluded.count,
+            }
+        )
+        db.session.execute(stmt)
+
+    def add(self, transaction: Transaction, sign: int = 1) -> None:
+        """Aplica al resumen los valores actuales de la transacción"""
+        self.apply(
+            user_id=transaction.user_id,
+            txn_date=transaction.date,
+            category_id=transaction.category_id,
+            is_income=transaction.is_income,
+            amount=transaction.amount,
+            sign=sign
+        )
+
+    def apply_staging(self, staging_table: str) -> None:
+        """Suma al resumen las filas de una tabla temporal de importación (solo PostgreSQL)"""
+        db.session.execute(text(f"""
+            INSERT INTO monthly_summary (user_id, year_month, category_id, is_income, total, count)
+            SELECT user_id, to_char(date, 'YYYY-MM'), COALESCE(category_id, {NO_CATEGORY}), is_income, SUM(amount), COUNT(*)
+            FROM {staging_table}
+            GROUP BY user_id, to_char(date, 'YYYY-MM'), COALESCE(category_id, {NO_CATEGORY}), is_income
+            ON CONFLICT (user_id, year_month, category_id, is_income) DO UPDATE
+            SET total = monthly_summary.total + EXCLUDED.total,
+                count = monthly_summary.count + EXCLUDED.count
+        """))
+
+    def totals_by_type(
+        self,
+        user_id: Optional[int] = None,
+        months: Optional[List[str]] = None,
+        is_income: bool = None
+    ) -> Dict[bool, Decimal]:
+        """Devuelve is_income → total para los meses indicados (o todo el historial si months es None)"""
+        q = db.session.query(
+            MonthlySummary.is_income,
+            func.sum(MonthlySummary.total).label('total')
+        )
+        if user_id is not None:
+            q = q.filter(MonthlySummary.user_id == user_id)
+        if months is not None:
+            q = q.filter(MonthlySummary.year_month.in_(months))
+        if is_income is not None:
+            q = q.filter(MonthlySummary.is_income == is_income)
+        rows = q.group_by(MonthlySummary.is_income).having(func.sum(MonthlySummary.count) > 0).all()
+        return {row.is_income: row.total for row in rows}
+
+    def expenses_by_category(self, user_id: int) -> Tuple[List[float], List[str]]:
+        """Devuelve el total de gastos por categoría de un usuario (mismo formato que TransactionRepository.generate_graph)"""
+        results = (
+            db.session.query(
+                Category.name.label('category'),
+                func.sum(MonthlySummary.total).label('total')
+            )
+            .join(Category, Category.id == MonthlySummary.category_id)
+            .filter(
+                MonthlySummary.user_id == user_id,
+                MonthlySummary.is_income == False  # Solo gastos
+            )
+            .group_by(Category.name)
+            .having(func.sum(MonthlySummary.count) > 0)
+            .order_by(Category.name)
+            .all()
+        )
+        list_of_prices = [float(row.total) for row in results]
+        list_of_categories = [row.category for row in results]
+        return list_of_prices, list_of_categories
+
+    def rebuild(self, user_id: Optional[int] = None) -> int:
+        """Recalcula el resumen desde la tabla transaction (todo o solo un usuario). Devuelve las filas generadas"""
+        delete_stmt = delete(MonthlySummary)
+        if user_id is not None:
+            delete_stmt = delete_stmt.where(MonthlySummary.user_id == user_id)
+        db.session.execute(delete_stmt)
+
+        year_month = self._month_expression()
+        category_id = func.coalesce(Transaction.category_id, NO_CATEGORY)
+        source = (
+            select(
+                Transaction.user_id,
+                year_month,
+                category_id,
+                Transaction.is_income,
+                func.sum(Transaction.amount),
+                func.count(Transaction.id)
+            )
+            .where(Transaction.deleted == False)
+            .group_by(Transaction.user_id, year_month, category_id, Transaction.is_income)
+        )
+        if user_id is not None:
+            source = source.where(Transaction.user_id == user_id)
+
+        result = db.session.execute(
+            insert(MonthlySummary).from_select(
+                ['user_id', 'year_month', 'category_id', 'is_income', 'total', 'count'],
+                source
+            )
+        )
+        db.session.commit()
+        return result.rowcount
+
+    @staticmethod
+    def month_key(value) -> str:
+        """Convierte una fecha (date, texto YYYY-MM-DD o una clave YYYY-MM) en la clave YYYY-MM"""
+        if isinstance(value, str):
+            return value[:7]
+        return value.strftime('%Y-%m')
+
+    def _month_expression(self):
+        """Expresión SQL que calcula YYYY-MM a partir de Transaction.date según el motor"""
+        if db.session.get_bind().dialect.name == 'postgresql':
+            return func.to_char(Transaction.date, 'YYYY-MM')
+        return func.strftime('%Y-%m', Transaction.date)
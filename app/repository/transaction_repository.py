@@ -1,8 +1,12 @@
-from typing import List, Optional
+import csv
+import io
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import date
 from app.extensions import db
-from app.models import Transaction, Category
-from sqlalchemy import func
+from app.models import Transaction, Category, User, TransactionRecord, UserRef, CategoryRef
+from sqlalchemy import Integer, Row, any_, bindparam, delete, func, insert, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import joinedload
 
 class TransactionRepository:
 
@@ -12,19 +16,81 @@ class TransactionRepository:
         db.session.commit()
         return transaction
     
+    def bulk_insert(self, rows: List[Dict[str, Any]], batch_size: int = 1000, commit: bool = True) -> List[int]:
+        """
+        Inserta muchas transacciones con executemany, de a batch_size filas,
+        en una sola transacción y con un único commit (ninguno con commit=False). Devuelve los IDs en el orden recibido.
+        """
+        ids = []
+        stmt = insert(Transaction).returning(Transaction.id, sort_by_parameter_order=True)
+        for start in range(0, len(rows), batch_size):
+            ids.extend(db.session.scalars(stmt, rows[start:start + batch_size]).all())
+        if commit:
+            db.session.commit()
+        return ids
+
+    # Tabla temporal usada por la importación con COPY (se elimina al hacer commit)
+    STAGING_TABLE = 'transaction_staging'
+    STAGING_COLUMNS = ('amount', 'date', 'description', 'method', 'is_income', 'user_id', 'category_id')
+
+    def supports_copy(self) -> bool:
+        """Indica si el motor permite cargar con COPY FROM STDIN (solo PostgreSQL)"""
+        return db.session.get_bind().dialect.name == 'postgresql'
+
+    def create_staging(self) -> None:
+        """Crea la tabla temporal de importación dentro de la transacción actual"""
+        db.session.execute(text(f"""
+            CREATE TEMP TABLE {self.STAGING_TABLE} (
+                amount NUMERIC(10, 2) NOT NULL,
+                date DATE NOT NULL,
+                description VARCHAR(255),
+                method VARCHAR(50),
+                is_income BOOLEAN NOT NULL,
+                user_id INTEGER NOT NULL,
+                category_id INTEGER
+            ) ON COMMIT DROP
+        """))
+
+    def copy_to_staging(self, rows: List[Dict[str, Any]]) -> None:
+        """Envía un bloque de filas a la tabla temporal con COPY FROM STDIN"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow(['' if row.get(column) is None else row[column] for column in self.STAGING_COLUMNS])
+        buffer.seek(0)
+
+        # COPY no está disponible en SQLAlchemy: se usa el cursor de psycopg2 de la misma conexión
+        cursor = db.session.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {self.STAGING_TABLE} ({', '.join(self.STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+        finally:
+            cursor.close()
+            buffer.close()
+
+    def merge_staging(self) -> int:
+        """Inserta en transaction las filas de la tabla temporal y hace commit. Devuelve la cantidad insertada"""
+        columns = ', '.join(self.STAGING_COLUMNS)
+        result = db.session.execute(text(f"""
+            INSERT INTO "transaction" ({columns}, deleted)
+            SELECT {columns}, false FROM {self.STAGING_TABLE}
+        """))
+        db.session.commit()
+        return result.rowcount
+
     def get_by_id(self, transaction_id: int) -> Optional[Transaction]:
         """Devuelve una transacción por su ID (incluye borradas)"""
         return Transaction.query.get(transaction_id)
     
-    def get_all(self, page: int = 1, per_page: int = 20) -> List[Transaction]:
+    def get_all(self, page: int = 1, per_page: int = 20, read_only: bool = False) -> List[Transaction]:
         """Lista todas las transacciones no eliminadas, paginadas"""
-        pag = Transaction.query.filter_by(deleted=False).order_by(Transaction.date.desc()).paginate(page=page, per_page=per_page, error_out=False)
-        return pag.items
+        return self.filter(page=page, per_page=per_page, read_only=read_only)
     
-    def get_by_user(self, user_id: int, page: int = 1, per_page: int = 20) -> List[Transaction]:
+    def get_by_user(self, user_id: int, page: int = 1, per_page: int = 20, read_only: bool = False) -> List[Transaction]:
         """Lista transacciones de un usuario, no eliminadas, paginadas"""
-        pag = Transaction.query.filter_by(user_id=user_id, deleted=False).order_by(Transaction.date.desc()).paginate(page=page, per_page=per_page, error_out=False)
-        return pag.items
+        return self.filter(user_id=user_id, page=page, per_page=per_page, read_only=read_only)
     
     def filter(
         self,
@@ -34,23 +100,188 @@ class TransactionRepository:
         is_income: bool = None,
         category_id: int = None,
         page: int = 1,
-        per_page: int = 20
+        per_page: int = 20,
+        read_only: bool = False
+    ) -> List[Transaction]:
+        """
+        Filtra por rango de fechas, tipo y categoría.
+        Con read_only=True devuelve TransactionRecord en lugar de instancias del ORM.
+        """
+        q = self._apply_filters(
+            self._base_query(read_only),
+            user_id=user_id,
+            start_date=start_date,
+            end_date=end_date,
+            is_income=is_income,
+            category_id=category_id
+        )
+        # Mismo orden que ix_txn_user_date_active / ix_txn_date_active (id desempata entre filas del mismo día)
+        q = q.order_by(Transaction.date.desc(), Transaction.id.desc())
+        if read_only:
+            page = max(page, 1)
+            per_page = per_page if per_page >= 1 else 20
+            return self._fetch_records(q.limit(per_page).offset((page - 1) * per_page))
+        pag = q.paginate(page=page, per_page=per_page, error_out=False, count=False)
+        return pag.items
+
+    def filter_keyset(
+        self,
+        user_id: Optional[int] = None,
+        start_date: date = None,
+        end_date: date = None,
+        is_income: bool = None,
+        category_id: int = None,
+        after: Optional[Tuple[date, int]] = None,
+        limit: int = 20,
+        read_only: bool = False
     ) -> List[Transaction]:
-        """Filtra por rango de fechas, tipo y categoría"""
-        q = Transaction.query.filter_by(deleted=False)
+        """
+        Filtra igual que filter() pero pagina por clave (date DESC, id DESC) en lugar de OFFSET.
+        after es la posición (date, id) de la última fila de la página anterior.
+        """
+        q = self._apply_filters(
+            self._base_query(read_only),
+            user_id=user_id,
+            start_date=start_date,
+            end_date=end_date,
+            is_income=is_income,
+            category_id=category_id
+        )
+        if after is not None:
+            # La condición redundante sobre date permite descartar particiones y acotar el índice
+            q = q.filter(Transaction.date <= after[0], tuple_(Transaction.date, Transaction.id) < tuple_(*after))
+        q = q.order_by(Transaction.date.desc(), Transaction.id.desc()).limit(limit)
+        return self._fetch_records(q) if read_only else q.all()
+
+    def stream(
+        self,
+        user_id: Optional[int] = None,
+        start_date: date = None,
+        end_date: date = None,
+        is_income: bool = None,
+        category_id: int = None,
+        chunk_size: int = 1000,
+        read_only: bool = False
+    ) -> Iterator[Transaction]:
+        """
+        Recorre las transacciones filtradas sin cargarlas todas en memoria.
+        Usa un cursor del lado del servidor y trae las filas de a chunk_size.
+        La consulta recién se ejecuta al pedir la primera fila.
+        """
+        q = self._apply_filters(
+            self._records_select() if read_only else Transaction.query,
+            user_id=user_id,
+            start_date=start_date,
+            end_date=end_date,
+            is_income=is_income,
+            category_id=category_id
+        )
+        q = q.order_by(Transaction.date.desc(), Transaction.id.desc())
+        if read_only:
+            result = db.session.execute(q, execution_options={'yield_per': chunk_size})
+            yield from self._to_records(result)
+        else:
+            yield from q.yield_per(chunk_size)
+
+    def aggregate(
+        self,
+        user_id: Optional[int] = None,
+        start_date: date = None,
+        end_date: date = None,
+        is_income: bool = None,
+        category_id: int = None
+    ) -> Dict[bool, Any]:
+        """
+        Calcula SUM/MIN/MAX/COUNT de los montos agrupados por is_income, con los mismos filtros que filter().
+        Devuelve un diccionario is_income → fila con los campos total, minimum, maximum y count.
+        """
+        q = db.session.query(
+            Transaction.is_income,
+            func.sum(Transaction.amount).label('total'),
+            func.min(Transaction.amount).label('minimum'),
+            func.max(Transaction.amount).label('maximum'),
+            func.count(Transaction.id).label('count')
+        )
+        q = self._apply_filters(
+            q,
+            user_id=user_id,
+            start_date=start_date,
+            end_date=end_date,
+            is_income=is_income,
+            category_id=category_id
+        )
+        return {row.is_income: row for row in q.group_by(Transaction.is_income).all()}
+
+    # Columnas de TransactionRecord, más el nombre de usuario y de categoría
+    RECORD_COLUMNS = (
+        Transaction.id, Transaction.amount, Transaction.date, Transaction.description, Transaction.method,
+        Transaction.is_income, Transaction.deleted, Transaction.user_id, Transaction.category_id,
+        User.username, Category.name
+    )
+
+    def _base_query(self, read_only: bool):
+        return self._records_select() if read_only else self._with_relations(Transaction.query)
+
+    def _records_select(self):
+        """SELECT de Core con solo las columnas que necesitan los listados (sin pasar por el ORM)"""
+        return (
+            select(*self.RECORD_COLUMNS)
+            .select_from(Transaction)
+            .join(User, User.id == Transaction.user_id)
+            .outerjoin(Category, Category.id == Transaction.category_id)
+        )
+
+    def _fetch_records(self, stmt) -> List[TransactionRecord]:
+        return list(self._to_records(db.session.execute(stmt)))
+
+    @staticmethod
+    def _to_records(rows) -> Iterator[TransactionRecord]:
+        """Arma los TransactionRecord; el usuario y la categoría se comparten entre filas"""
+        users, categories = {}, {}
+        for *columns, user_id, category_id, username, category_name in rows:
+            user = users.get(user_id)
+            if user is None:
+                user = users[user_id] = UserRef(user_id, username)
+            category = None
+            if category_id is not None:
+                category = categories.get(category_id)
+                if category is None:
+                    category = categories[category_id] = CategoryRef(category_id, category_name)
+            yield TransactionRecord(*columns, user_id, category_id, user, category)
+
+    def _with_relations(self, q):
+        """
+        Carga user y category en la misma consulta que la página (evita una consulta por fila
+        al serializar), trayendo solo las columnas que usa TransactionSchema.
+        """
+        return q.options(
+            joinedload(Transaction.user, innerjoin=True).load_only(User.id, User.username),
+            joinedload(Transaction.category).load_only(Category.id, Category.name)
+        )
+
+    def _apply_filters(
+        self,
+        q,
+        user_id: Optional[int] = None,
+        start_date: date = None,
+        end_date: date = None,
+        is_income: bool = None,
+        category_id: int = None
+    ):
+        """Aplica a la consulta los filtros comunes de transacciones no eliminadas"""
+        q = q.filter(Transaction.deleted == False)
 
         if user_id is not None:
-            q = q.filter_by(user_id=user_id)
+            q = q.filter(Transaction.user_id == user_id)
         if start_date:
             q = q.filter(Transaction.date >= start_date)
         if end_date:
             q = q.filter(Transaction.date <= end_date)
         if is_income is not None:
-            q = q.filter_by(is_income=is_income)
+            q = q.filter(Transaction.is_income == is_income)
         if category_id:
-            q = q.filter_by(category_id=category_id)
-        pag = q.order_by(Transaction.date.desc()).paginate(page=page, per_page=per_page, error_out=False)
-        return pag.items
+            q = q.filter(Transaction.category_id == category_id)
+        return q
 
     def update(self, transaction: Transaction, **kwargs) -> Transaction:
         """Actualiza campos de la transacción"""
@@ -76,6 +307,78 @@ class TransactionRepository:
         db.session.commit()
         return transaction
 
+    # Columnas que devuelven las operaciones masivas: el ID y lo necesario para ajustar el resumen mensual
+    BULK_RETURNING = (
+        Transaction.id, Transaction.user_id, Transaction.date, Transaction.category_id,
+        Transaction.is_income, Transaction.amount
+    )
+
+    def set_deleted_many(self, user_id: int, deleted: bool, ids: Optional[Iterable[int]] = None, **filters) -> List[Row]:
+        """
+        Marca como borradas (deleted=True) o restaura (deleted=False) en un solo UPDATE las transacciones
+        del usuario indicadas por ids y/o filtros (start_date, end_date, is_income, category_id).
+        Solo toca las que cambian de estado y devuelve sus columnas BULK_RETURNING. No hace commit.
+        """
+        stmt = (
+            update(Transaction)
+            .where(
+                *self._selection(user_id, ids, **filters),
+                # deleted NULL no cuenta como activa ni en los listados ni en el resumen mensual
+                Transaction.deleted == (not deleted)
+            )
+            .values(deleted=deleted)
+            .returning(*self.BULK_RETURNING)
+        )
+        return db.session.execute(stmt, execution_options={'synchronize_session': False}).all()
+
+    def delete_many(self, user_id: int, ids: Optional[Iterable[int]] = None, **filters) -> List[Row]:
+        """
+        Elimina físicamente en un solo DELETE las transacciones del usuario indicadas por ids y/o filtros,
+        borradas o no. Devuelve sus columnas BULK_RETURNING más deleted. No hace commit.
+        """
+        stmt = (
+            delete(Transaction)
+            .where(*self._selection(user_id, ids, **filters))
+            .returning(*self.BULK_RETURNING, Transaction.deleted)
+        )
+        return db.session.execute(stmt, execution_options={'synchronize_session': False}).all()
+
+    def commit(self) -> None:
+        db.session.commit()
+
+    def rollback(self) -> None:
+        db.session.rollback()
+
+    def _selection(
+        self,
+        user_id: int,
+        ids: Optional[Iterable[int]] = None,
+        start_date: date = None,
+        end_date: date = None,
+        is_income: bool = None,
+        category_id: int = None
+    ) -> list:
+        """Condiciones de las operaciones masivas: siempre acotadas al usuario"""
+        criteria = [Transaction.user_id == user_id]
+        if ids is not None:
+            criteria.append(self._id_in(ids))
+        if start_date:
+            criteria.append(Transaction.date >= start_date)
+        if end_date:
+            criteria.append(Transaction.date <= end_date)
+        if is_income is not None:
+            criteria.append(Transaction.is_income == is_income)
+        if category_id:
+            criteria.append(Transaction.category_id == category_id)
+        return criteria
+
+    def _id_in(self, ids: Iterable[int]):
+        """id = ANY(:ids) en PostgreSQL: un solo parámetro (un array) sin importar cuántos IDs sean"""
+        ids = list(ids)
+        if db.session.get_bind().dialect.name == 'postgresql':
+            return Transaction.id == any_(bindparam('ids', ids, type_=ARRAY(Integer)))
+        return Transaction.id.in_(ids)
+
     def generate_graph(self, user_id: int ):
         """Devuelve el total de gastos por categoría de un usuario"""
         results = (
@@ -90,6 +393,7 @@ class TransactionRepository:
                 Transaction.is_income == False  # Solo gastos
             )
             .group_by(Category.name)
+            .order_by(Category.name)
             .all()
         )
         list_of_prices = [float(row.total) for row in results]
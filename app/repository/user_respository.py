@@ -1,4 +1,5 @@
-from typing import List, Optional
+from typing import Iterable, List, Optional, Set
+from sqlalchemy import or_
 from app.extensions import db
 from app.models import User
 
@@ -22,6 +23,25 @@ class UserRepository:
         """Busca un usuario por su email"""
         return User.query.filter_by(email=email).first()
     
+    def get_by_login(self, login: str) -> Optional[User]:
+        """
+        Busca por username o email en una sola consulta (usa los índices únicos de ambas columnas).
+        Si el texto es el username de un usuario y el email de otro, gana el username.
+        """
+        return (
+            User.query
+            .filter(or_(User.username == login, User.email == login))
+            .order_by((User.username == login).desc())
+            .first()
+        )
+
+    def existing_ids(self, user_ids: Iterable[int]) -> Set[int]:
+        """Devuelve cuáles de los IDs indicados existen"""
+        ids = set(user_ids)
+        if not ids:
+            return set()
+        return set(db.session.scalars(db.select(User.id).where(User.id.in_(ids))))
+
     def get_all(self, page: int = 1, per_page: int = 20) -> List[User]:
         """Lista usuarios paginados"""
         pag = User.query.paginate(page=page, per_page=per_page, error_out=False)
@@ -34,6 +54,10 @@ class UserRepository:
         db.session.commit()
         return user
 
+    def rollback(self) -> None:
+        """Descarta los cambios pendientes de la sesión"""
+        db.session.rollback()
+
     def delete(self, user: User) -> None:
         """Elimina físicamente el usuario"""
         db.session.delete(user)
@@ -3,4 +3,5 @@ from .user import user_bp
 from .category import category_bp
 from .transaction import transaction_bp
 from .expense import expense_bp
-from .home import home_bp
\ No newline at end of file
+from .home import home_bp
+from .admin import admin_bp
@@ -0,0 +1,51 @@
+import hmac
+import os
+from flask import Blueprint, request
+from app.services import ResponseBuilder
+from app.mapping import ResponseSchema
+from app.extensions import db
+from app.instrumentation import query_stats
+from app.pool_metrics import pool_status
+
+admin_bp = Blueprint('admin', __name__)
+
+response_schema = ResponseSchema()
+
+# Los endpoints de administración exigen el encabezado X-Admin-Token; sin ADMIN_TOKEN quedan deshabilitados
+ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+
+@admin_bp.before_request
+def require_admin_token():
+    token = request.headers.get('X-Admin-Token', '')
+    if not ADMIN_TOKEN or not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        builder = ResponseBuilder().add_message("No autorizado").add_status_code(403)
+        return response_schema.dump(builder.build()), 403
+
+@admin_bp.route('/slow-queries', methods=['GET'])
+def slow_queries():
+    """Formas de consulta más lentas de este proceso (?limit=20&order_by=total|max)"""
+    builder = ResponseBuilder()
+    limit = request.args.get('limit', default=20, type=int)
+    order_by = request.args.get('order_by', default='total')
+    if order_by not in ('total', 'max'):
+        builder.add_message("Error de validación").add_status_code(422).add_data({"error": "order_by debe ser total o max"})
+        return response_schema.dump(builder.build()), 422
+
+    data = query_stats.top(limit=limit, order_by=order_by)
+    builder.add_message("Consultas más lentas").add_status_code(200).add_data(data)
+    return response_schema.dump(builder.build()), 200
+
+@admin_bp.route('/slow-queries', methods=['DELETE'])
+def reset_slow_queries():
+    """Reinicia los acumulados de consultas"""
+    query_stats.reset()
+    builder = ResponseBuilder().add_message("Estadísticas de consultas reiniciadas").add_status_code(200)
+    return response_schema.dump(builder.build()), 200
+
+@admin_bp.route('/pool', methods=['GET'])
+def pool():
+    """Estado del pool de conexiones de este proceso (para dimensionar pool_size y max_overflow)"""
+    builder = ResponseBuilder()
+    data = pool_status(db.engine.pool)
+    builder.add_message("Estado del pool de conexiones").add_status_code(200).add_data(data)
+    return response_schema.dump(builder.build()), 200
@@ -1,12 +1,12 @@
 from flask import Blueprint, request
 from marshmallow import ValidationError
 from app.services import CategoryService, ResponseBuilder
-from app.mapping import CategorySchema, ResponseSchema
+from app.mapping import CategorySchema, ResponseSchema, FastSerializer, dump_envelope
 
 category_bp = Blueprint('categories', __name__)
 service = CategoryService()
 category_schema = CategorySchema()
-categories_schema = CategorySchema(many=True)
+categories_serializer = FastSerializer(CategorySchema())
 response_schema = ResponseSchema()
 
 @category_bp.route('', methods=['POST'])
@@ -15,8 +15,12 @@ def create_category():
     try:
         # Validación y deserialización
         c = category_schema.load(request.json or {})
-        # Guardado mediante el repositorio
-        created = service.repo.save(c)
+        # Guardado mediante el servicio (invalida la caché de categorías)
+        created = service.create_category(
+            name=c.name,
+            is_favorite=bool(c.is_favorite),
+            is_recurring=bool(c.is_recurring)
+        )
         data = category_schema.dump(created)
         # Construcción de respuesta exitosa
         builder.add_message("Categoría creada correctamente").add_status_code(201).add_data(data)
@@ -33,9 +37,9 @@ def list_categories():
     favorites = request.args.get('favorites_only', 'false').lower() == 'true'
     recurring = request.args.get('recurring_only', 'false').lower() == 'true'
     cats = service.list_categories(favorites_only=favorites, recurring_only=recurring)
-    data = categories_schema.dump(cats)
+    data = categories_serializer.dump_many(cats)
     builder.add_message("Listado de categorías").add_status_code(200).add_data(data)
-    return response_schema.dump(builder.build()), 200
+    return dump_envelope(builder.build()), 200
 
 @category_bp.route('/<int:category_id>', methods=['GET'])
 def get_category(category_id):
@@ -1,16 +1,68 @@
-from flask import Blueprint, Response, request, render_template, redirect, url_for, flash, session
-import requests 
+from flask import Blueprint, Response, request, render_template, redirect, url_for, flash, session, stream_with_context, current_app
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from app.mapping import ResponseSchema
-from app.services import TransactionService, UserService
-from app.reports.csv_export import export_transactions_to_csv
+import io
+import logging
+import os
+from app.mapping import ResponseSchema, CategorySchema
+from app.services import TransactionService, UserService, CategoryService, ExpenseService
+from app.services.transaction_service import CHART_RENDER_MODE
+from app.passwords import PasswordHasherBusy
+from app.reports.csv_export import iter_transactions_csv
 
 
 home_bp = Blueprint('home', __name__)
+logger = logging.getLogger(__name__)
 
 response_schema = ResponseSchema()
+categories_schema = CategorySchema(many=True)
 user_service = UserService()
 transaction_service = TransactionService()
+category_service = CategoryService()
+expense_service = ExpenseService()
+
+# Hilos para calcular en paralelo las secciones independientes del dashboard
+dashboard_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('DASHBOARD_WORKERS', 3)),
+    thread_name_prefix='dashboard'
+)
+
+def _in_app_context(app, func, *args, **kwargs):
+    """Ejecuta func dentro de un contexto de aplicación propio (cada hilo usa su propia sesión)"""
+    with app.app_context():
+        return func(*args, **kwargs)
+
+def _load_graph_url(user_id: int):
+    """
+    Devuelve la URL del gráfico de gastos, o None si no se pudo generar.
+    En modo asíncrono muestra el último gráfico disponible mientras el worker dibuja el nuevo.
+    """
+    try:
+        if CHART_RENDER_MODE == 'async':
+            return transaction_service.request_graph(user_id)["image_url"]
+        return transaction_service.generate_graph(user_id)
+    except ValueError:
+        # El usuario todavía no tiene gastos para graficar
+        return None
+    except Exception as e:
+        print(f"❌ Error al generar el gráfico: {e}")
+        return None
+
+def _load_categories():
+    """Devuelve las categorías serializadas como las entrega /categories/all, o [] si no se pudieron obtener"""
+    try:
+        return categories_schema.dump(category_service.list_categories())
+    except Exception:
+        logger.exception("Error al obtener las categorías del dashboard")
+        return []
+
+def _load_totals(user_id: int):
+    """Devuelve los totales de ingresos, gastos y balance del usuario, o {} si no se pudieron calcular"""
+    try:
+        return expense_service.total_income_expense_balance(user_id)
+    except Exception:
+        logger.exception("Error al calcular los totales del dashboard")
+        return {}
 
 @home_bp.route('/login', methods=['GET', 'POST'])
 def login():
@@ -18,7 +70,12 @@ def login():
         login = request.form.get('login')
         password = request.form.get('password')
 
-        user = user_service.authenticate(login, password)
+        try:
+            user = user_service.authenticate(login, password)
+        except PasswordHasherBusy:
+            # Ráfaga de logins: se rechaza rápido en lugar de ocupar el worker esperando
+            flash('Hay demasiados inicios de sesión en curso. Inténtalo de nuevo en unos segundos.', 'warning')
+            return render_template('login.html'), 503, {'Retry-After': '1'}
         if user:
             session['user_id'] = user.id  # Guarda el ID del usuario en la sesión
             flash('Inicio de sesión exitoso', 'success')
@@ -35,14 +92,12 @@ def index():
         return redirect(url_for('home.login'))  # Redirige al login si no está autenticado
 
     user_id = session['user_id']  # Obtiene el ID del usuario autenticado
+    app = current_app._get_current_object()
 
-    # Llamada a tu endpoint que genera el gráfico
-    response = requests.get(f'http://localhost:5000/transactions/{user_id}/graph')
-    image_url = None
-
-    if response.status_code == 200:
-        json_data = response.json()
-        image_url = json_data['data']['image_url']
+    # Gráfico, categorías y totales no dependen entre sí: se calculan en paralelo
+    graph_future = dashboard_executor.submit(_in_app_context, app, _load_graph_url, user_id)
+    categories_future = dashboard_executor.submit(_in_app_context, app, _load_categories)
+    totals_future = dashboard_executor.submit(_in_app_context, app, _load_totals, user_id)
 
     # Obtiene los parámetros de filtro del formulario
     start_date = request.args.get('start_date')
@@ -60,20 +115,20 @@ def index():
         start_date=start_date,
         end_date=end_date,
         is_income=is_income,
-        category_id=category_id
+        category_id=category_id,
+        read_only=True
     )
 
+    image_url = graph_future.result()
+
     # Obtiene las categorías para el filtro
-    resp = requests.get('http://localhost:5000/categories/all')
-    categories = resp.json().get('data', []) if resp.status_code == 200 else []
+    categories = categories_future.result()
 
     # Crea un diccionario id → nombre para lookup rápido
     category_dict = {cat['id']: cat['name'] for cat in categories}
 
-    # Obtiene los totales dinámicos de ingresos, gastos y balance con filtros aplicados
-    totals_url = f'http://localhost:5000/expenses/total_income_expense_balance?user_id={user_id}'
-    totals_response = requests.get(totals_url)
-    totals = totals_response.json().get('data', {}) if totals_response.status_code == 200 else {}
+    # Obtiene los totales de ingresos, gastos y balance del usuario
+    totals = totals_future.result()
 
     # Convertir los valores a float
     total_ingresos = float(totals.get('total_ingresos', 0))
@@ -93,15 +148,11 @@ def index():
 
 @home_bp.route('/add', methods=['GET', 'POST'])
 def add_transaction():
-    resp = requests.get('http://localhost:5000/categories/all')
     if 'user_id' not in session:  # Verifica si el usuario está autenticado
         flash('Debes iniciar sesión para acceder a esta página.', 'warning')
         return redirect(url_for('home.login'))  # Redirige al login si no está autenticado
     
-    if resp.status_code == 200:
-        categories = resp.json().get('data', [])  # extrae la lista real del JSON
-    else:
-        categories = []
+    categories = _load_categories()
 
     if request.method == 'POST':
         user_id = session.get('user_id')  # Obtiene el ID del usuario autenticado
@@ -172,11 +223,12 @@ def delete_transaction():
         return redirect(url_for('home.login'))  # Redirige al login si no está autenticado
 
     if request.method == 'POST':
-        transaction_id = request.form.get('transaction_id')  # Obtiene el ID de la transacción a eliminar
-        if transaction_id:
-            success = transaction_service.delete_transaction(transaction_id)
-            if success:
-                flash('Transacción eliminada correctamente.', 'success')
+        transaction_ids = request.form.getlist('transaction_id', type=int)  # IDs de las transacciones a eliminar
+        if transaction_ids:
+            # Una sola sentencia, limitada a las transacciones del usuario autenticado
+            deleted = transaction_service.bulk_delete_transactions(user_id=session['user_id'], ids=transaction_ids)
+            if deleted:
+                flash(f'Transacciones eliminadas correctamente: {len(deleted)}.', 'success')
             else:
                 flash('No se pudo eliminar la transacción. Verifica el ID.', 'danger')
         return redirect(url_for('home.index'))
@@ -206,23 +258,19 @@ def export_transactions():
         start_date = start_date and datetime.strptime(start_date, "%Y-%m-%d").date()
         end_date = end_date and datetime.strptime(end_date, "%Y-%m-%d").date()
 
-        # Filtrar transacciones solo del usuario autenticado
-        transactions = transaction_service.filter_transactions(
+        # Recorrer por bloques las transacciones del usuario autenticado
+        transactions = transaction_service.stream_transactions(
             user_id=user_id,  # Filtra por el usuario autenticado
             start_date=start_date,
             end_date=end_date,
             is_income=is_income,
             category_id=category_id,
-            page=1,
-            per_page=10**6  # Exportar todas las transacciones
+            read_only=True
         )
 
-        # Generar CSV
-        csv_data = export_transactions_to_csv(transactions)
-
-        # Crear respuesta con el archivo CSV
+        # Crear respuesta con el CSV generado de forma incremental
         response = Response(
-            csv_data,
+            stream_with_context(iter_transactions_csv(transactions)),
             mimetype='text/csv',
             headers={
                 "Content-Disposition": "attachment; filename=transactions.csv"
@@ -234,6 +282,32 @@ def export_transactions():
         flash('Error al exportar transacciones.', 'danger')
         return redirect(url_for('home.index'))
 
+@home_bp.route('/import', methods=['POST'])
+def import_transactions():
+    """Importa transacciones desde un CSV con el formato de exportación"""
+    user_id = session.get('user_id')  # Obtiene el ID del usuario autenticado
+    if not user_id:
+        flash('Debes iniciar sesión para importar datos.', 'warning')
+        return redirect(url_for('home.login'))
+
+    upload = request.files.get('file')
+    if not upload or not upload.filename:
+        flash('Selecciona un archivo CSV para importar.', 'warning')
+        return redirect(url_for('home.index'))
+
+    try:
+        stream = io.TextIOWrapper(upload.stream, encoding='utf-8-sig', newline='')
+        imported, _, error_count = transaction_service.import_csv(stream, user_id)
+    except (ValueError, UnicodeDecodeError):
+        flash('El archivo no tiene el formato de exportación de transacciones.', 'danger')
+        return redirect(url_for('home.index'))
+
+    if error_count:
+        flash(f'Se importaron {imported} transacciones; {error_count} filas tenían errores.', 'warning')
+    else:
+        flash(f'Se importaron {imported} transacciones.', 'success')
+    return redirect(url_for('home.index'))
+
 @home_bp.route('/logout')
 def logout():
     session.pop('user_id', None)  # Elimina el ID del usuario de la sesión
@@ -1,8 +1,9 @@
 class RouteApp:
     def init_app(self, app):
-        from app.resources import user_bp, category_bp, transaction_bp, expense_bp, home_bp
+        from app.resources import user_bp, category_bp, transaction_bp, expense_bp, home_bp, admin_bp
         app.register_blueprint(user_bp, url_prefix='/users')
         app.register_blueprint(category_bp, url_prefix='/categories')
         app.register_blueprint(transaction_bp, url_prefix='/transactions')
         app.register_blueprint(expense_bp, url_prefix='/expenses')
         app.register_blueprint(home_bp, url_prefix='/')
+        app.register_blueprint(admin_bp, url_prefix='/admin')
@@ -1,16 +1,24 @@
+import io
 from datetime import datetime
-from flask import Blueprint, Response, request
+from flask import Blueprint, Response, request, stream_with_context
 from marshmallow import ValidationError
 from app.services import TransactionService, ResponseBuilder
-from app.mapping import TransactionSchema, ResponseSchema
-from app.reports.csv_export import export_transactions_to_csv
+from app.services.transaction_service import CHART_RENDER_MODE
+from app.mapping import TransactionSchema, ResponseSchema, FastSerializer, dump_envelope
+from app.mapping.transaction_schema import TransactionSelectionSchema, transaction_fields
+from app.reports.csv_export import iter_transactions_csv
+from app.reports.charts import CHART_MIMETYPES, chart_mimetype
 
 transaction_bp = Blueprint('transactions', __name__)
 
 response_schema = ResponseSchema()
 transaction_schema = TransactionSchema()
 transactions_schema = TransactionSchema(many=True)
+# Los listados se vuelcan con el serializador precompilado (mismo JSON que transactions_schema)
+transactions_serializer = FastSerializer(TransactionSchema())
 transaction_service = TransactionService()
+delete_selection_schema = TransactionSelectionSchema()
+restore_selection_schema = TransactionSelectionSchema(exclude=('hard',))
 
 @transaction_bp.route('', methods=['POST'])
 def create_transaction():
@@ -34,6 +42,38 @@ def create_transaction():
         builder.add_message("Error de validación").add_status_code(422).add_data(err.messages)
         return response_schema.dump(builder.build()), 422
 
+@transaction_bp.route('/bulk', methods=['POST'])
+def bulk_create_transactions():
+    """
+    Crea muchas transacciones en un solo pedido. Recibe una lista JSON con el mismo formato que POST /transactions.
+    Las filas inválidas se informan en data.errors (por posición) sin impedir la carga de las válidas.
+    """
+    builder = ResponseBuilder()
+    payload = request.json
+    if not isinstance(payload, list):
+        builder.add_message("Error de validación").add_status_code(422).add_data({"error": "Se esperaba una lista de transacciones"})
+        return response_schema.dump(builder.build()), 422
+
+    try:
+        loaded = transactions_schema.load(payload)
+        errors = {}
+        rows = {index: transaction_fields(txn) for index, txn in enumerate(loaded)}
+    except ValidationError as err:
+        # valid_data conserva la posición de cada fila; se descartan las que tienen errores
+        errors = err.messages
+        rows = {index: row for index, row in enumerate(err.valid_data) if index not in errors}
+
+    created_ids, reference_errors = transaction_service.bulk_create_transactions(rows)
+    errors.update(reference_errors)
+    data = {"created": len(created_ids), "ids": created_ids, "errors": errors}
+
+    if not created_ids:
+        builder.add_message("Error de validación").add_status_code(422).add_data(data)
+        return response_schema.dump(builder.build()), 422
+
+    builder.add_message("Transacciones creadas correctamente").add_status_code(201).add_data(data)
+    return response_schema.dump(builder.build()), 201
+
 @transaction_bp.route('', methods=['GET'])
 def list_transactions():
     builder = ResponseBuilder()
@@ -45,6 +85,28 @@ def list_transactions():
     category_id = request.args.get('category_id',   type=int)
     page        = request.args.get('page',          default=1,  type=int)
     per_page    = request.args.get('per_page',      default=20, type=int)
+    cursor      = request.args.get('cursor')        # token opaco; vacío para la primera página
+
+    # Con el parámetro cursor se pagina por clave (date, id) en lugar de OFFSET
+    if cursor is not None:
+        try:
+            transactions, next_cursor = transaction_service.filter_transactions_by_cursor(
+                user_id=user_id,
+                start_date=start_date,
+                end_date=end_date,
+                is_income=is_income,
+                category_id=category_id,
+                cursor=cursor,
+                per_page=per_page,
+                read_only=True
+            )
+        except ValueError as err:
+            builder.add_message("Error de validación").add_status_code(422).add_data({"error": str(err)})
+            return response_schema.dump(builder.build()), 422
+
+        data = transactions_serializer.dump_many(transactions)
+        builder.add_message("Listado de transacciones").add_status_code(200).add_data(data).add_next_cursor(next_cursor)
+        return dump_envelope(builder.build()), 200
 
     # Siempre usamos filter_transactions, dejando que el repo decida qué aplicar
     transaction = transaction_service.filter_transactions(
@@ -54,12 +116,13 @@ def list_transactions():
         is_income=is_income,
         category_id=category_id,
         page=page,
-        per_page=per_page
+        per_page=per_page,
+        read_only=True
     )
 
-    data = transactions_schema.dump(transaction)
+    data = transactions_serializer.dump_many(transaction)
     builder.add_message("Listado de transacciones").add_status_code(200).add_data(data)
-    return response_schema.dump(builder.build()), 200
+    return dump_envelope(builder.build()), 200
 
 @transaction_bp.route('/<int:transaction_id>', methods=['GET'])
 def get_transaction(transaction_id):
@@ -120,6 +183,39 @@ def restore_transaction(transaction_id):
     builder.add_message("Transacción restaurada").add_status_code(200).add_data(data)
     return response_schema.dump(builder.build()), 200
 
+@transaction_bp.route('', methods=['DELETE'])
+def bulk_delete_transactions():
+    """
+    Elimina en una sola sentencia las transacciones de un usuario, por lista de IDs y/o filtros:
+    {"user_id": 1, "ids": [...], "start_date", "end_date", "is_income", "category_id", "hard": false}.
+    Devuelve los IDs afectados; los de otro usuario o ya eliminados se ignoran.
+    """
+    builder = ResponseBuilder()
+    try:
+        selection = delete_selection_schema.load(request.json or {})
+    except ValidationError as err:
+        builder.add_message("Error de validación").add_status_code(422).add_data(err.messages)
+        return response_schema.dump(builder.build()), 422
+
+    soft = not selection.pop('hard')
+    ids = transaction_service.bulk_delete_transactions(soft=soft, **selection)
+    builder.add_message("Transacciones eliminadas").add_status_code(200).add_data({"count": len(ids), "ids": ids})
+    return response_schema.dump(builder.build()), 200
+
+@transaction_bp.route('/restore', methods=['PATCH'])
+def bulk_restore_transactions():
+    """Restaura en una sola sentencia las transacciones eliminadas de un usuario, por lista de IDs y/o filtros"""
+    builder = ResponseBuilder()
+    try:
+        selection = restore_selection_schema.load(request.json or {})
+    except ValidationError as err:
+        builder.add_message("Error de validación").add_status_code(422).add_data(err.messages)
+        return response_schema.dump(builder.build()), 422
+
+    ids = transaction_service.bulk_restore_transactions(**selection)
+    builder.add_message("Transacciones restauradas").add_status_code(200).add_data({"count": len(ids), "ids": ids})
+    return response_schema.dump(builder.build()), 200
+
 @transaction_bp.route('/export', methods=['GET'])
 def export_transactions():
     """
@@ -143,23 +239,19 @@ def export_transactions():
         start_date = start_date and datetime.strptime(start_date, "%Y-%m-%d").date()
         end_date = end_date and datetime.strptime(end_date, "%Y-%m-%d").date()
 
-        # Obtener transacciones filtradas
-        transactions = transaction_service.filter_transactions(
+        # Recorrer las transacciones filtradas por bloques
+        transactions = transaction_service.stream_transactions(
             user_id=user_id,
             start_date=start_date,
             end_date=end_date,
             is_income=is_income,
             category_id=category_id,
-            page=1,
-            per_page=10**6  # Exportar todas las transacciones
+            read_only=True
         )
 
-        # Generar CSV
-        csv_data = export_transactions_to_csv(transactions)
-
-        # Crear respuesta con el archivo CSV
+        # Crear respuesta con el CSV generado de forma incremental
         response = Response(
-            csv_data,
+            stream_with_context(iter_transactions_csv(transactions)),
             mimetype='text/csv',
             headers={
                 "Content-Disposition": "attachment; filename=transactions.csv"
@@ -172,11 +264,55 @@ def export_transactions():
         builder.add_message("Error al exportar transacciones").add_status_code(500).add_data({"error": str(e)})
         return response_schema.dump(builder.build()), 500
 
+@transaction_bp.route('/import', methods=['POST'])
+def import_transactions():
+    """
+    Importa transacciones desde un archivo CSV con el formato de /transactions/export.
+    Parámetros:
+    - file: archivo CSV (multipart/form-data).
+    - user_id: ID del usuario al que se asignan las transacciones.
+    """
+    builder = ResponseBuilder()
+    user_id = request.args.get('user_id', type=int) or request.form.get('user_id', type=int)
+    upload = request.files.get('file')
+    if not user_id or not upload:
+        builder.add_message("Error de validación").add_status_code(422).add_data({"error": "Se requieren 'user_id' y 'file'"})
+        return response_schema.dump(builder.build()), 422
+
+    try:
+        # El archivo se lee como stream de texto, sin cargarlo completo en memoria
+        stream = io.TextIOWrapper(upload.stream, encoding='utf-8-sig', newline='')
+        imported, errors, error_count = transaction_service.import_csv(stream, user_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        builder.add_message("Error de validación").add_status_code(422).add_data({"error": str(e)})
+        return response_schema.dump(builder.build()), 422
+
+    data = {"imported": imported, "error_count": error_count, "errors": errors}
+    builder.add_message("Importación finalizada").add_status_code(201).add_data(data)
+    return response_schema.dump(builder.build()), 201
+
 @transaction_bp.route('/<int:user_id>/graph', methods=['GET'])
 def summary_by_category(user_id):
     builder = ResponseBuilder()
+    # Formato opcional: ?format=png|svg (por defecto el configurado en CHART_FORMAT)
+    chart_format = request.args.get('format')
+    if chart_format is not None and chart_format not in CHART_MIMETYPES:
+        builder.add_message("Error de validación").add_status_code(422).add_data(
+            {"error": f"Formato no soportado, use uno de: {', '.join(CHART_MIMETYPES)}"})
+        return response_schema.dump(builder.build()), 422
+    # Modo opcional: ?mode=sync|async (por defecto CHART_RENDER_MODE)
+    mode = request.args.get('mode', CHART_RENDER_MODE)
     try:
-        image_url = transaction_service.generate_graph(user_id)
+        if mode == 'async':
+            # No dibuja en el pedido: 200 si la imagen ya existe; si no, 202 con el último gráfico disponible
+            result = transaction_service.request_graph(user_id, chart_format=chart_format)
+            if result["status"] == "ready":
+                builder.add_message("Gráfico generado exitosamente").add_status_code(200).add_data(result)
+                return response_schema.dump(builder.build()), 200
+            builder.add_message("Gráfico en preparación").add_status_code(202).add_data(result)
+            return response_schema.dump(builder.build()), 202, {"Retry-After": "1"}
+
+        image_url = transaction_service.generate_graph(user_id, chart_format=chart_format)
         builder.add_message("Gráfico generado exitosamente").add_status_code(200).add_data({"image_url": image_url})
         return response_schema.dump(builder.build()), 200
     except ValueError as e:
@@ -191,7 +327,7 @@ def serve_image(image_key):
         if not image_data:
             return Response("Imagen no encontrada", status=404)
 
-        return Response(image_data, mimetype='image/png')
+        return Response(image_data, mimetype=chart_mimetype(image_key))
     except Exception as e:
         print(f"❌ Error al servir la imagen: {e}")
         return Response("Error interno del servidor", status=500)
\ No newline at end of file
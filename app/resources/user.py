@@ -1,15 +1,23 @@
 from flask import Blueprint, request
 from marshmallow import ValidationError
 from app.services import UserService, ResponseBuilder
-from app.mapping import UserSchema, ResponseSchema
+from app.mapping import UserSchema, ResponseSchema, FastSerializer, dump_envelope
+from app.passwords import PasswordHasherBusy
 
 user_bp = Blueprint('users', __name__)
 
 response_schema = ResponseSchema()
 user_schema = UserSchema()
-users_schema = UserSchema(many=True)
+users_serializer = FastSerializer(UserSchema())
 user_service = UserService()
 
+@user_bp.errorhandler(PasswordHasherBusy)
+def password_hasher_busy(err):
+    # Demasiados hashes de contraseña en curso (alta o cambio de contraseña): reintentar en unos segundos
+    builder = ResponseBuilder()
+    builder.add_message("Servicio ocupado, intente nuevamente").add_status_code(503)
+    return response_schema.dump(builder.build()), 503, {"Retry-After": "1"}
+
 @user_bp.route('', methods=['POST'])
 def create_user():
     builder = ResponseBuilder()
@@ -38,9 +46,9 @@ def list_users():
     page = request.args.get('page', default=1, type=int)
     per_page = request.args.get('per_page', default=20, type=int)
     users = user_service.list_users(page=page, per_page=per_page)
-    data = users_schema.dump(users)
+    data = users_serializer.dump_many(users)
     builder.add_message("Listado de usuarios").add_status_code(200).add_data(data)
-    return response_schema.dump(builder.build()), 200
+    return dump_envelope(builder.build()), 200
 
 @user_bp.route('/<int:user_id>', methods=['GET'])
 def get_user(user_id):
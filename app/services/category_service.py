@@ -1,7 +1,21 @@
+import logging
+import os
 from typing import List, Optional
+from app.extensions import cache
 from app.models.category import Category
 from app.repository.category_repository import CategoryRepository
 
+logger = logging.getLogger(__name__)
+
+# Segundos que el catálogo de categorías permanece en caché (se invalida en cada escritura)
+CATEGORY_CACHE_TIMEOUT = int(os.environ.get('CATEGORY_CACHE_TIMEOUT', 3600))
+CATEGORY_FIELDS = ("id", "name", "is_favorite", "is_recurring")
+LIST_KEYS = {
+    "all": "categories:list:all",
+    "favorites": "categories:list:favorites",
+    "recurring": "categories:list:recurring",
+}
+
 class CategoryService:
     def __init__(self, repo: CategoryRepository = None):
         self.repo = repo or CategoryRepository()
@@ -13,23 +27,43 @@ class CategoryService:
             is_favorite=is_favorite,
             is_recurring=is_recurring
         )
-        return self.repo.save(category)
+        created = self.repo.save(category)
+        self._invalidate()
+        return created
 
     def get_category(self, category_id: int) -> Optional[Category]:
-        """Obtiene una categoría por su ID"""
-        return self.repo.get_by_id(category_id)
-    
+        """Obtiene una categoría por su ID (desde la caché si está disponible)"""
+        key = self._item_key(category_id)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return Category(**cached)
+        category = self.repo.get_by_id(category_id)
+        if category:
+            self._cache_set(key, self._to_row(category))
+        return category
+
     def get_category_name(self, category_name: int) -> Optional[Category]:
         """Obtiene una categoría por su nombre"""
         return self.repo.get_by_name(category_name)
 
     def list_categories(self, favorites_only: bool = False, recurring_only: bool = False) -> List[Category]:
-        """Lista categorías, con opción de filtrar por favoritas o recurrentes"""
+        """
+        Lista categorías, con opción de filtrar por favoritas o recurrentes.
+        El resultado se guarda en caché hasta la próxima escritura sobre categorías.
+        """
         if favorites_only:
-            return self.repo.get_favorites()
-        if recurring_only:
-            return self.repo.get_recurring()
-        return self.repo.get_all()
+            kind, load = "favorites", self.repo.get_favorites
+        elif recurring_only:
+            kind, load = "recurring", self.repo.get_recurring
+        else:
+            kind, load = "all", self.repo.get_all
+
+        cached = self._cache_get(LIST_KEYS[kind])
+        if cached is not None:
+            return [Category(**row) for row in cached]
+        categories = load()
+        self._cache_set(LIST_KEYS[kind], [self._to_row(category) for category in categories])
+        return categories
 
     def update_category(self, category_id: int, **updates) -> Optional[Category]:
         """
@@ -44,7 +78,9 @@ class CategoryService:
         if not data:
             return None
         # Aplica los cambios y devuelve la categoría actualizada
-        return self.repo.update(category_id, **data)
+        updated = self.repo.update(category_id, **data)
+        self._invalidate(category_id)
+        return updated
 
     def delete_category(self, category_id: int, soft: bool = True) -> bool:
         """
@@ -54,5 +90,41 @@ class CategoryService:
         """
         if soft and hasattr(Category, 'deleted'):
             # asume que el modelo tiene un campo deleted
-            return self.repo.update(category_id, deleted=True) is not None
-        return self.repo.delete(category_id)
+            deleted = self.repo.update(category_id, deleted=True) is not None
+        else:
+            deleted = self.repo.delete(category_id)
+        self._invalidate(category_id)
+        return deleted
+
+    @staticmethod
+    def _item_key(category_id: int) -> str:
+        return f"categories:item:{category_id}"
+
+    @staticmethod
+    def _to_row(category: Category) -> dict:
+        """Copia los campos de la categoría a un diccionario apto para la caché"""
+        return {field: getattr(category, field) for field in CATEGORY_FIELDS}
+
+    def _invalidate(self, category_id: int = None) -> None:
+        """Elimina de la caché los listados (y la categoría indicada)"""
+        keys = list(LIST_KEYS.values())
+        if category_id is not None:
+            keys.append(self._item_key(category_id))
+        try:
+            cache.delete_many(*keys)
+        except Exception as e:
+            logger.warning("No se pudo invalidar la caché de categorías: %s", e)
+
+    def _cache_get(self, key: str):
+        """Lee de la caché; si no está disponible se consulta la base de datos"""
+        try:
+            return cache.get(key)
+        except Exception as e:
+            logger.warning("Caché de categorías no disponible: %s", e)
+            return None
+
+    def _cache_set(self, key: str, value) -> None:
+        try:
+            cache.set(key, value, timeout=CATEGORY_CACHE_TIMEOUT)
+        except Exception as e:
+            logger.warning("No se pudo guardar en la caché de categorías: %s", e)
@@ -0,0 +1,48 @@
+import json
+import os
+from typing import Optional
+
+"""
+Cola de dibujo de gráficos en Redis.
+Los pedidos se agregan a una lista (LPUSH) y los workers los toman con BRPOP (ver chart_worker).
+Mientras un gráfico de un usuario está pendiente no se vuelve a encolar; además se recuerda
+el último gráfico dibujado de cada usuario para mostrarlo mientras se dibuja el nuevo.
+"""
+
+CHART_QUEUE_KEY = 'charts:queue'
+# Segundos que un pedido pendiente evita nuevos encolados del mismo gráfico (si el worker falla, vence)
+CHART_PENDING_TTL = int(os.environ.get('CHART_PENDING_TTL', 120))
+
+def _pending_key(user_id: int, chart_format: str) -> str:
+    return f"charts:pending:{user_id}:{chart_format}"
+
+def _last_key(user_id: int, chart_format: str) -> str:
+    return f"charts:last:{user_id}:{chart_format}"
+
+def enqueue_chart(client, user_id: int, chart_format: str) -> bool:
+    """Encola el dibujo del gráfico; devuelve False si ya había uno pendiente para el mismo usuario y formato"""
+    if not client.set(_pending_key(user_id, chart_format), 1, nx=True, ex=CHART_PENDING_TTL):
+        return False
+    client.lpush(CHART_QUEUE_KEY, json.dumps({"user_id": user_id, "format": chart_format}))
+    return True
+
+def pop_chart_job(client, timeout: float) -> Optional[dict]:
+    """Espera hasta timeout segundos el próximo pedido de la cola"""
+    item = client.brpop(CHART_QUEUE_KEY, timeout=timeout)
+    return json.loads(item[1]) if item else None
+
+def finish_chart_job(client, job: dict) -> None:
+    """Libera el pedido para que el gráfico se pueda volver a encolar"""
+    client.delete(_pending_key(job["user_id"], job["format"]))
+
+def remember_chart(client, user_id: int, chart_format: str, image_key: str, ttl: int) -> None:
+    """Registra image_key como el último gráfico dibujado del usuario"""
+    client.set(_last_key(user_id, chart_format), image_key, ex=ttl)
+
+def last_chart(client, user_id: int, chart_format: str) -> Optional[str]:
+    """Clave del último gráfico dibujado del usuario, si la imagen todavía existe"""
+    image_key = client.get(_last_key(user_id, chart_format))
+    if image_key is None:
+        return None
+    image_key = image_key.decode('utf-8')
+    return image_key if client.exists(image_key) else None
@@ -0,0 +1,52 @@
+import logging
+import os
+import redis
+from flask import Flask
+from app.config.cache_config import redis_config
+from app.services.chart_queue import pop_chart_job, finish_chart_job
+from app.services.transaction_service import TransactionService
+
+"""
+Worker de la cola de gráficos: toma pedidos de chart_queue, dibuja el gráfico y lo guarda en Redis.
+Se ejecuta con flask charts worker (ver app/cli.py).
+"""
+
+logger = logging.getLogger(__name__)
+
+# Procesos de dibujo que lanza flask charts worker
+CHART_WORKER_CONCURRENCY = int(os.environ.get('CHART_WORKER_CONCURRENCY', 2))
+# Segundos que cada BRPOP espera un pedido antes de volver a intentar
+CHART_WORKER_POLL = int(os.environ.get('CHART_WORKER_POLL', 5))
+
+def worker_redis_client(poll_timeout: int) -> redis.Redis:
+    """Cliente propio del worker: el timeout de lectura debe superar la espera del BRPOP"""
+    settings = dict(redis_config, socket_timeout=poll_timeout + redis_config['socket_timeout'], max_connections=2)
+    return redis.Redis(connection_pool=redis.BlockingConnectionPool(**settings))
+
+def run_chart_worker(app: Flask, client=None, poll_timeout: int = CHART_WORKER_POLL, burst: bool = False) -> int:
+    """
+    Procesa pedidos de la cola hasta que se interrumpa el proceso
+    (o, con burst=True, hasta que la cola quede vacía). Devuelve la cantidad de pedidos procesados.
+    """
+    client = client or worker_redis_client(poll_timeout)
+    service = TransactionService(redis_client=client)
+    processed = 0
+    while True:
+        job = pop_chart_job(client, poll_timeout)
+        if job is None:
+            if burst:
+                return processed
+            continue
+
+        # Un contexto por pedido: cada gráfico usa una sesión nueva de la base
+        with app.app_context():
+            try:
+                service.generate_graph(job["user_id"], job["format"])
+            except ValueError as e:
+                # El usuario ya no tiene gastos para graficar
+                logger.info("Gráfico de %s descartado: %s", job["user_id"], e)
+            except Exception:
+                logger.exception("Error al dibujar el gráfico de %s", job["user_id"])
+            finally:
+                finish_chart_job(client, job)
+        processed += 1
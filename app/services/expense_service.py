@@ -1,26 +1,72 @@
-from typing import Optional
+from typing import List, Optional
 from datetime import date, datetime, timedelta
 from typing import Dict, Any
 from app.repository.transaction_repository import TransactionRepository
+from app.repository.monthly_summary_repository import MonthlySummaryRepository
+from app.services.report_cache import cached_report
 
 class ExpenseService:
-    def __init__(self, repo: TransactionRepository = None):
+    def __init__(self, repo: TransactionRepository = None, summary_repo: MonthlySummaryRepository = None):
         self.repo = repo or TransactionRepository()
+        self.summary_repo = summary_repo or MonthlySummaryRepository()
 
     def total_by_period(self, user_id: int = None, is_income: bool = None, start: date = None, end: date = None) -> float:
         """Suma todos los montos (ingresos negativos o solo egresos, según convenga) entre start y end inclusive"""
-        transaction = self.repo.filter(
-            user_id=user_id,
-            is_income=is_income,
-            start_date=start,
-            end_date=end,
-            page=1,
-            per_page=10**6  # tomar todos
+        return cached_report(
+            "total_by_period", user_id,
+            {"is_income": is_income, "start": start, "end": end},
+            lambda: self._total_by_period(user_id, is_income, start, end)
         )
-        return sum(txn.amount for txn in transaction)
 
     def compare_months(self, user_id: int = None, is_income: bool = None, month1: datetime = None, month2: datetime = None) -> Dict[str, Any]:
         """Compara el total de dos meses. Retorna {'month1_total', 'month2_total', 'percent_change'}"""
+        return cached_report(
+            "compare_months", user_id,
+            {"is_income": is_income, "month1": month1, "month2": month2},
+            lambda: self._compare_months(user_id, is_income, month1, month2)
+        )
+
+    def key_indicators(self, user_id: int = None, is_income: bool = None, start: date = None, end: date = None) -> Dict[str, Any]:
+        """Promedio diario, máximo y mínimo de gasto/ingreso en el periodo [start, end]"""
+        return cached_report(
+            "key_indicators", user_id,
+            {"is_income": is_income, "start": start, "end": end},
+            lambda: self._key_indicators(user_id, is_income, start, end)
+        )
+
+    def total_income_expense_balance(self, user_id: int) -> Dict[str, float]:
+        """Calcula el total de ingresos, el total de gastos y el balance de todas las transacciones de un usuario"""
+        return cached_report(
+            "total_income_expense_balance", user_id, {},
+            lambda: self._total_income_expense_balance(user_id)
+        )
+
+    # Los métodos públicos guardan en caché el resultado; estos lo calculan desde la base de datos
+
+    def _total_by_period(self, user_id: int, is_income: bool, start: date, end: date):
+        """Los meses completos se leen del resumen mensual; solo los días sueltos de los extremos van a transaction"""
+        if not start or not end or start > end:
+            return self._raw_total(user_id, is_income, start, end)
+
+        # Primer y último día de los meses completos incluidos en el periodo
+        first_full = start if start.day == 1 else (start.replace(day=1) + timedelta(days=32)).replace(day=1)
+        last_full = end if (end + timedelta(days=1)).day == 1 else end.replace(day=1) - timedelta(days=1)
+        if first_full > last_full:
+            return self._raw_total(user_id, is_income, start, end)
+
+        totals = self.summary_repo.totals_by_type(
+            user_id=user_id,
+            months=self._months_between(first_full, last_full),
+            is_income=is_income
+        )
+        total = sum(totals.values())
+        if start < first_full:
+            total += self._raw_total(user_id, is_income, start, first_full - timedelta(days=1))
+        if end > last_full:
+            total += self._raw_total(user_id, is_income, last_full + timedelta(days=1), end)
+        return total
+
+    def _compare_months(self, user_id: int, is_income: bool, month1: datetime, month2: datetime) -> Dict[str, Any]:
         def month_range(dt: datetime):
             first = dt.replace(day=1)
             next_month = (first + timedelta(days=32)).replace(day=1)
@@ -30,8 +76,8 @@ class ExpenseService:
         s1, e1 = month_range(month1)
         s2, e2 = month_range(month2)
 
-        total1 = self.total_by_period(user_id=user_id, is_income=is_income, start=s1, end=e1)
-        total2 = self.total_by_period(user_id=user_id, is_income=is_income, start=s2, end=e2)
+        total1 = self._total_by_period(user_id, is_income, s1, e1)
+        total2 = self._total_by_period(user_id, is_income, s2, e2)
 
         percent = ((total2 - total1) / total1 * 100) if total1 else None
         return {
@@ -42,36 +88,48 @@ class ExpenseService:
             "Porcentaje_de_cambio": percent
         }
 
-    def key_indicators(self, user_id: int = None, is_income: bool = None, start: date = None, end: date = None) -> Dict[str, Any]:
-        """Promedio diario, máximo y mínimo de gasto/ingreso en el periodo [start, end]"""
-        transaction = self.repo.filter(
+    def _key_indicators(self, user_id: int, is_income: bool, start: date, end: date) -> Dict[str, Any]:
+        totals = self.repo.aggregate(
             user_id=user_id,
             is_income=is_income,
             start_date=start,
-            end_date=end,
-            page=1,
-            per_page=10**6
-        )
-        amounts = [txn.amount for txn in transaction]
+            end_date=end
+        ).values()
+        total = sum(row.total for row in totals)
         days = (end - start).days + 1
         return {
-            "promedio_diario": float(sum(amounts) / days) if days else 0,
-            "suma_maxima": max(amounts) if amounts else 0,
-            "Suma_minima": min(amounts) if amounts else 0
+            "promedio_diario": float(total / days) if days else 0,
+            "suma_maxima": max(row.maximum for row in totals) if totals else 0,
+            "Suma_minima": min(row.minimum for row in totals) if totals else 0
         }
 
-    def total_income_expense_balance(self, user_id: int) -> Dict[str, float]:
-        """Calcula el total de ingresos, el total de gastos y el balance de todas las transacciones de un usuario"""
-        transactions = self.repo.filter(
-            user_id=user_id,
-            page=1,
-            per_page=10**6  # tomar todas las transacciones
-        )
-        total_income = sum(txn.amount for txn in transactions if txn.is_income)
-        total_expense = sum(txn.amount for txn in transactions if not txn.is_income)
+    def _total_income_expense_balance(self, user_id: int) -> Dict[str, float]:
+        totals = self.summary_repo.totals_by_type(user_id=user_id)
+        total_income = totals.get(True, 0)
+        total_expense = totals.get(False, 0)
         balance = total_income - total_expense
         return {
             "total_ingresos": total_income,
             "total_gastos": total_expense,
             "balance": balance
-        }
\ No newline at end of file
+        }
+
+    def _raw_total(self, user_id: int, is_income: bool, start: date, end: date):
+        """Suma los montos directamente desde la tabla transaction"""
+        totals = self.repo.aggregate(
+            user_id=user_id,
+            is_income=is_income,
+            start_date=start,
+            end_date=end
+        )
+        return sum(row.total for row in totals.values())
+
+    @staticmethod
+    def _months_between(first: date, last: date) -> List[str]:
+        """Lista las claves YYYY-MM de los meses entre first y last inclusive"""
+        months = []
+        current = first.replace(day=1)
+        while current <= last:
+            months.append(current.strftime('%Y-%m'))
+            current = (current + timedelta(days=32)).replace(day=1)
+        return months
@@ -0,0 +1,18 @@
+import base64
+import json
+from datetime import date
+from typing import Tuple
+
+def encode_cursor(txn_date: date, txn_id: int) -> str:
+    """Codifica la posición (date, id) de una transacción en un token opaco"""
+    raw = json.dumps([txn_date.isoformat(), txn_id], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(token: str) -> Tuple[date, int]:
+    """Decodifica un token generado por encode_cursor. Lanza ValueError si es inválido"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        txn_date, txn_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return date.fromisoformat(txn_date), int(txn_id)
+    except (TypeError, ValueError, UnicodeError) as exc:
+        raise ValueError("Cursor inválido") from exc
@@ -0,0 +1,63 @@
+import json
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+from app.extensions import cache
+
+"""
+Caché de reportes versionada por usuario.
+Cada usuario tiene un número de versión que se incrementa con cada escritura de sus transacciones;
+la versión forma parte de la clave, así invalidar todos sus reportes es un solo INCR.
+Los reportes globales (sin user_id) usan la versión 'all', que cambia con cualquier escritura.
+"""
+
+logger = logging.getLogger(__name__)
+
+REPORT_CACHE_TIMEOUT = int(os.environ.get('REPORT_CACHE_TIMEOUT', 600))
+ALL_USERS = 'all'
+
+def _version_key(user_id: Optional[int]) -> str:
+    return f"reports:version:{ALL_USERS if user_id is None else user_id}"
+
+def data_version(user_id: Optional[int]) -> int:
+    """Devuelve la versión actual de los datos del usuario (o global si user_id es None)"""
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        # Se arranca desde la hora actual para no coincidir con entradas de una versión anterior;
+        # la clave no expira (timeout=0) y add no pisa otra versión creada en paralelo
+        cache.add(key, time.time_ns(), timeout=0)
+        version = cache.get(key)
+    return version
+
+def bump_data_version(user_ids: Iterable[int]) -> None:
+    """Invalida los reportes de los usuarios indicados y los globales"""
+    keys = {_version_key(user_id) for user_id in user_ids}
+    keys.add(_version_key(None))
+    try:
+        for key in keys:
+            # Cache no expone inc: se usa el backend (INCR atómico en Redis)
+            cache.cache.inc(key)
+    except Exception as e:
+        logger.warning("No se pudo invalidar la caché de reportes: %s", e)
+
+def cached_report(name: str, user_id: Optional[int], params: Dict[str, Any], compute: Callable[[], Any]) -> Any:
+    """Devuelve el reporte desde la caché o lo calcula con compute() y lo guarda"""
+    try:
+        version = data_version(user_id)
+        key = f"reports:{name}:{ALL_USERS if user_id is None else user_id}:{version}:" \
+              f"{json.dumps(params, sort_keys=True, default=str)}"
+        cached = cache.get(key)
+    except Exception as e:
+        logger.warning("Caché de reportes no disponible: %s", e)
+        return compute()
+
+    if cached is not None:
+        return cached
+    result = compute()
+    try:
+        cache.set(key, result, timeout=REPORT_CACHE_TIMEOUT)
+    except Exception as e:
+        logger.warning("No se pudo guardar el reporte en caché: %s", e)
+    return result
@@ -6,12 +6,14 @@ class ResponseMessage:
     message: str = None
     status_code: int = None
     data: dict = None
+    next_cursor: str = None
 
 @dataclass
 class ResponseBuilder:
     message: str = None
     status_code: int = None
     data: dict = None
+    next_cursor: str = None
 
     def add_message(self, message: str):
         self.message = message
@@ -25,9 +27,14 @@ class ResponseBuilder:
         self.data = data
         return self
     
+    def add_next_cursor(self, next_cursor: str):
+        self.next_cursor = next_cursor
+        return self
+    
     def build(self):
         return ResponseMessage(
             message=self.message,
             status_code=self.status_code,
-            data=self.data
+            data=self.data,
+            next_cursor=self.next_cursor
         )
\ No newline at end of file
@@ -1,28 +1,53 @@
 import os
 from pathlib import Path
 from dotenv import load_dotenv
-from typing import List, Optional
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+from collections import defaultdict
+from decimal import Decimal
 from datetime import date
-import matplotlib
-import matplotlib.pyplot as plt
-from io import BytesIO
-from uuid import uuid4
-import redis
+import hashlib
+import json
+from app.extensions import get_redis
 from app.models import Transaction
 from app.repository.transaction_repository import TransactionRepository
+from app.repository.monthly_summary_repository import MonthlySummaryRepository
+from app.repository.user_respository import UserRepository
+from app.repository.category_repository import CategoryRepository
+from app.services.pagination import encode_cursor, decode_cursor
+from app.services.report_cache import bump_data_version
+from app.services.chart_queue import enqueue_chart, last_chart, remember_chart
+from app.reports.csv_import import iter_transaction_chunks
+from app.reports.charts import CHART_MIMETYPES, render_donut
 
 basedir = os.path.abspath(Path(__file__).parents[2])
 load_dotenv(os.path.join(basedir, '.env'))
 
+# Segundos que un gráfico permanece en Redis; al vencer (o por LFU de maxmemory) se vuelve a generar
+CHART_CACHE_TTL = int(os.environ.get('CHART_CACHE_TTL', 3600))
+# Formato de los gráficos: png (matplotlib) o svg (vectorial, sin matplotlib)
+CHART_FORMAT = os.environ.get('CHART_FORMAT', 'png')
+# sync: el gráfico se dibuja en el pedido; async: lo dibuja el worker de la cola (flask charts worker)
+CHART_RENDER_MODE = os.environ.get('CHART_RENDER_MODE', 'sync')
+# Filas por sentencia en las cargas masivas
+BULK_BATCH_SIZE = int(os.environ.get('BULK_BATCH_SIZE', 1000))
+# Filas validadas y enviadas por bloque en la importación CSV
+IMPORT_CHUNK_SIZE = int(os.environ.get('IMPORT_CHUNK_SIZE', 5000))
+# Máximo de errores por línea que se informan en una importación
+IMPORT_MAX_ERRORS = 100
+
+# Columnas que se insertan en la carga masiva (todas las filas deben tener las mismas claves)
+BULK_COLUMNS = ("amount", "date", "description", "method", "is_income", "deleted", "user_id", "category_id")
+
 class TransactionService:
-    def __init__(self, repo: TransactionRepository = None):
+    def __init__(self, repo: TransactionRepository = None, summary_repo: MonthlySummaryRepository = None, redis_client=None):
         self.repo = repo or TransactionRepository()
-        self.redis_client = redis.StrictRedis(
-            host=os.environ.get('REDIS_HOST'),
-            port=int(os.environ.get('REDIS_PORT')),
-            db=int(os.environ.get('REDIS_DB')),
-            password=os.environ.get('REDIS_PASSWORD'),
-        )
+        self.summary_repo = summary_repo or MonthlySummaryRepository()
+        self._redis_client = redis_client
+
+    @property
+    def redis_client(self):
+        """Cliente Redis recibido o, si no hay, el compartido de la app (un solo pool por proceso)"""
+        return self._redis_client if self._redis_client is not None else get_redis()
 
     def create_transaction(
         self,
@@ -44,7 +69,119 @@ class TransactionService:
             is_income=is_income,
             category_id=category_id
         )
-        return self.repo.save(transaction)
+        # El resumen mensual se actualiza en la misma transacción que el INSERT
+        self.summary_repo.apply(user_id, date, category_id, is_income, amount)
+        created = self.repo.save(transaction)
+        bump_data_version([created.user_id])
+        return created
+
+    def bulk_create_transactions(
+        self,
+        rows: Dict[int, Dict[str, Any]],
+        commit: bool = True
+    ) -> Tuple[List[int], Dict[int, Dict[str, List[str]]]]:
+        """
+        Crea muchas transacciones ya validadas en una sola transacción de base de datos.
+        rows asocia la posición de cada fila en el pedido con sus datos.
+        Las filas con usuario o categoría inexistente se descartan y se informan como errores,
+        sin abortar el resto. Devuelve los IDs creados y los errores por posición.
+        Con commit=False no confirma la transacción: lo hace quien llama.
+        """
+        errors = {}
+        users = UserRepository().existing_ids(row.get("user_id") for row in rows.values())
+        categories = CategoryRepository().existing_ids(
+            row["category_id"] for row in rows.values() if row.get("category_id") is not None
+        )
+
+        valid = []
+        deltas = defaultdict(lambda: [Decimal(0), 0])
+        for index, row in rows.items():
+            if row.get("user_id") not in users:
+                errors[index] = {"user_id": ["El usuario no existe."]}
+                continue
+            if row.get("category_id") is not None and row["category_id"] not in categories:
+                errors[index] = {"category_id": ["La categoría no existe."]}
+                continue
+            record = {column: row.get(column) for column in BULK_COLUMNS}
+            record["deleted"] = bool(record["deleted"])
+            valid.append(record)
+            if not record["deleted"]:
+                month = self.summary_repo.month_key(record["date"])
+                key = (record["user_id"], month, record["category_id"], record["is_income"])
+                deltas[key][0] += record["amount"]
+                deltas[key][1] += 1
+
+        if not valid:
+            return [], errors
+
+        # Un upsert por fila del resumen mensual, no por transacción
+        for (user_id, month, category_id, is_income), (amount, count) in deltas.items():
+            self.summary_repo.apply(user_id, month, category_id, is_income, amount, count=count)
+        created_ids = self.repo.bulk_insert(valid, batch_size=BULK_BATCH_SIZE, commit=commit)
+        if commit:
+            bump_data_version({record["user_id"] for record in valid})
+        return created_ids, errors
+
+    def import_csv(self, stream: TextIO, user_id: int) -> Tuple[int, Dict[int, Dict[str, List[str]]], int]:
+        """
+        Importa un CSV con el formato de exportación para un usuario, leyéndolo por bloques.
+        En PostgreSQL los bloques válidos se envían con COPY a una tabla temporal y se fusionan
+        en transaction (y en el resumen mensual) al final. En otros motores cada bloque se carga
+        con bulk_create_transactions. En ambos casos hay un único commit: si el archivo falla
+        a mitad de camino (UnicodeDecodeError, ValueError) no se importa ninguna fila.
+        Devuelve (filas importadas, primeros errores por número de línea, total de líneas con error).
+        Lanza ValueError si el usuario no existe o el encabezado es inválido.
+        """
+        if not UserRepository().get_by_id(user_id):
+            raise ValueError("El usuario no existe")
+
+        errors = {}
+        error_count = 0
+        imported = 0
+        checked_categories, known_categories = set(), set()
+        use_copy = self.repo.supports_copy()
+        try:
+            if use_copy:
+                self.repo.create_staging()
+
+            for rows, chunk_errors in iter_transaction_chunks(stream, user_id, chunk_size=IMPORT_CHUNK_SIZE):
+                if use_copy:
+                    # Solo se consultan las categorías que no aparecieron en bloques anteriores
+                    pending = {row["category_id"] for row in rows.values() if row.get("category_id") is not None}
+                    pending -= checked_categories
+                    checked_categories |= pending
+                    known_categories |= CategoryRepository().existing_ids(pending)
+                    valid = []
+                    for line_number, row in rows.items():
+                        if row.get("category_id") is not None and row["category_id"] not in known_categories:
+                            chunk_errors[line_number] = {"category_id": ["La categoría no existe."]}
+                        else:
+                            valid.append(row)
+                    self.repo.copy_to_staging(valid)
+                elif rows:
+                    created, reference_errors = self.bulk_create_transactions(rows, commit=False)
+                    imported += len(created)
+                    chunk_errors.update(reference_errors)
+
+                error_count += len(chunk_errors)
+                for line_number in sorted(chunk_errors):
+                    if len(errors) >= IMPORT_MAX_ERRORS:
+                        break
+                    errors[line_number] = chunk_errors[line_number]
+
+            if use_copy:
+                self.summary_repo.apply_staging(self.repo.STAGING_TABLE)
+                imported = self.repo.merge_staging()
+            else:
+                self.repo.commit()
+        except Exception:
+            # Se descartan también los bloques ya cargados
+            self.repo.rollback()
+            raise
+
+        if imported:
+            bump_data_version([user_id])
+        return imported, errors, error_count
 
     def get_transaction(self, transaction_id: int) -> Optional[Transaction]:
         """Obtiene una transacción por su ID"""
@@ -54,12 +191,13 @@ class TransactionService:
         self,
         user_id: Optional[int] = None,
         page: int = 1,
-        per_page: int = 20
+        per_page: int = 20,
+        read_only: bool = False
     ) -> List[Transaction]:
         """Lista transacciones (global o de un usuario)"""
         if user_id:
-            return self.repo.get_by_user(user_id, page=page, per_page=per_page)
-        return self.repo.get_all(page=page, per_page=per_page)
+            return self.repo.get_by_user(user_id, page=page, per_page=per_page, read_only=read_only)
+        return self.repo.get_all(page=page, per_page=per_page, read_only=read_only)
 
     def filter_transactions(
         self,
@@ -69,9 +207,13 @@ class TransactionService:
         is_income: bool = None,
         category_id: int = None,
         page: int = 1,
-        per_page: int = 20
+        per_page: int = 20,
+        read_only: bool = False
     ) -> List[Transaction]:
-        """Lista transacciones filtradas para un usuario"""
+        """
+        Lista transacciones filtradas para un usuario.
+        Con read_only=True devuelve registros de solo lectura (para mostrar o serializar, no para modificar).
+        """
         return self.repo.filter(
             user_id=user_id,
             start_date=start_date,
@@ -79,7 +221,65 @@ class TransactionService:
             is_income=is_income,
             category_id=category_id,
             page=page,
-            per_page=per_page
+            per_page=per_page,
+            read_only=read_only
+        )
+
+    def filter_transactions_by_cursor(
+        self,
+        user_id: Optional[int] = None,
+        start_date: date = None,
+        end_date: date = None,
+        is_income: bool = None,
+        category_id: int = None,
+        cursor: Optional[str] = None,
+        per_page: int = 20,
+        read_only: bool = False
+    ) -> Tuple[List[Transaction], Optional[str]]:
+        """
+        Lista transacciones filtradas paginando por cursor.
+        Devuelve la página y el cursor de la siguiente (None si no hay más).
+        Lanza ValueError si el cursor es inválido.
+        """
+        after = decode_cursor(cursor) if cursor else None
+        # Mismo valor por defecto que la paginación por OFFSET
+        per_page = per_page if per_page >= 1 else 20
+        # Se pide una fila extra para saber si existe una página siguiente
+        transactions = self.repo.filter_keyset(
+            user_id=user_id,
+            start_date=start_date,
+            end_date=end_date,
+            is_income=is_income,
+            category_id=category_id,
+            after=after,
+            limit=per_page + 1,
+            read_only=read_only
+        )
+        if len(transactions) <= per_page:
+            return transactions, None
+        transactions = transactions[:per_page]
+        last = transactions[-1]
+        return transactions, encode_cursor(last.date, last.id)
+
+    def stream_transactions(
+        self,
+        user_id: Optional[int] = None,
+        start_date: date = None,
+        end_date: date = None,
+        is_income: bool = None,
+        category_id: int = None,
+        chunk_size: int = 1000,
+        read_only: bool = False
+    ) -> Iterator[Transaction]:
+        """Recorre por bloques todas las transacciones filtradas (para exportaciones)"""
+        return self.repo.stream(
+            user_id=user_id,
+            start_date=start_date,
+            end_date=end_date,
+            is_income=is_income,
+            category_id=category_id,
+            chunk_size=chunk_size,
+            read_only=read_only
         )
 
     def update_transaction(
@@ -96,17 +296,33 @@ class TransactionService:
         data = {k: v for k, v in updates.items() if k in allowed}
         if not data:
             return transaction
-        return self.repo.update(transaction, **data)
+        if not transaction.deleted and data.keys() & {"amount", "date", "is_income", "category_id"}:
+            # Mueve el monto de la fila de resumen anterior a la nueva
+            self.summary_repo.add(transaction, sign=-1)
+            self.summary_repo.apply(
+                user_id=transaction.user_id,
+                txn_date=data.get("date", transaction.date),
+                category_id=data.get("category_id", transaction.category_id),
+                is_income=data.get("is_income", transaction.is_income),
+                amount=data.get("amount", transaction.amount)
+            )
+        updated = self.repo.update(transaction, **data)
+        bump_data_version([updated.user_id])
+        return updated
 
     def delete_transaction(self, transaction_id: int, soft: bool = True) -> bool:
         """Elimina o marca transacción como borrada. Por defecto hace soft-delete"""
         transaction = self.get_transaction(transaction_id)
         if not transaction:
             return False
+        if not transaction.deleted:
+            self.summary_repo.add(transaction, sign=-1)
+        user_id = transaction.user_id
         if soft:
             self.repo.soft_delete(transaction)
         else:
             self.repo.delete(transaction)
+        bump_data_version([user_id])
         return True
 
     def restore_transaction(self, transaction_id: int) -> Optional[Transaction]:
@@ -114,18 +330,99 @@ class TransactionService:
         transaction = self.get_transaction(transaction_id)
         if not transaction:
             return None
-        return self.repo.restore(transaction)
+        if transaction.deleted:
+            self.summary_repo.add(transaction)
+        restored = self.repo.restore(transaction)
+        bump_data_version([restored.user_id])
+        return restored
     
-    def generate_graph(self, user_id: int) -> str:
+    def bulk_delete_transactions(self, user_id: int, ids: Optional[List[int]] = None, soft: bool = True, **filters) -> List[int]:
+        """
+        Elimina en una sola sentencia las transacciones del usuario indicadas por ids y/o filtros
+        (start_date, end_date, is_income, category_id). Por defecto hace soft-delete.
+        Devuelve los IDs afectados; los que no existen, son de otro usuario o ya estaban borrados se ignoran.
+        """
+        if soft:
+            rows = self.repo.set_deleted_many(user_id, True, ids, **filters)
+            active = rows
+        else:
+            rows = self.repo.delete_many(user_id, ids, **filters)
+            # Las que ya estaban borradas no figuran en el resumen mensual
+            active = [row for row in rows if row.deleted is False]
+        self._apply_to_summary(active, sign=-1)
+        self.repo.commit()
+        if rows:
+            bump_data_version([user_id])
+        return sorted(row.id for row in rows)
+
+    def bulk_restore_transactions(self, user_id: int, ids: Optional[List[int]] = None, **filters) -> List[int]:
+        """Restaura en una sola sentencia las transacciones borradas del usuario indicadas por ids y/o filtros"""
+        rows = self.repo.set_deleted_many(user_id, False, ids, **filters)
+        self._apply_to_summary(rows, sign=1)
+        self.repo.commit()
+        if rows:
+            bump_data_version([user_id])
+        return sorted(row.id for row in rows)
+
+    def _apply_to_summary(self, rows, sign: int) -> None:
+        """Suma o resta al resumen mensual las filas devueltas por una operación masiva (un upsert por clave)"""
+        deltas = defaultdict(lambda: [Decimal(0), 0])
+        for row in rows:
+            key = (row.user_id, self.summary_repo.month_key(row.date), row.category_id, row.is_income)
+            deltas[key][0] += row.amount
+            deltas[key][1] += 1
+        for (user_id, month, category_id, is_income), (amount, count) in deltas.items():
+            self.summary_repo.apply(user_id, month, category_id, is_income, amount, sign=sign, count=count)
+
+    def generate_graph(self, user_id: int, chart_format: str = None) -> str:
         """
         Genera un gráfico tipo dona de los gastos por categoría para un usuario,
         lo guarda en Redis como un objeto binario y devuelve la URL para acceder a la imagen.
+        Si ya existe un gráfico con los mismos datos, devuelve su URL sin volver a dibujarlo.
+        chart_format es 'png' o 'svg' (por defecto CHART_FORMAT).
+        """
+        chart_format, amounts, labels, colors, image_key = self._chart_spec(user_id, chart_format)
+        if self.redis_client.exists(image_key):
+            return f"/transactions/images/{image_key}"
+
+        image_data = render_donut(chart_format, amounts, labels, colors)
+        try:
+            # Guardar la imagen en Redis con TTL; nx evita reescribirla si otro request ya la guardó
+            self.redis_client.set(image_key, image_data, ex=CHART_CACHE_TTL, nx=True)
+            remember_chart(self.redis_client, user_id, chart_format, image_key, CHART_CACHE_TTL)
+
+            print("✅ Imagen guardada en Redis con clave:", image_key)
+        except Exception as e:
+            print("❌ Error al guardar imagen en Redis:", e)
+            raise e
+
+        # Devolver la URL para acceder a la imagen
+        return f"/transactions/images/{image_key}"
+
+    def request_graph(self, user_id: int, chart_format: str = None) -> Dict[str, Any]:
         """
+        Versión asíncrona de generate_graph: no dibuja en el pedido.
+        Si la imagen de los datos actuales ya existe devuelve status 'ready' y su URL; si no, encola
+        el dibujo para el worker (flask charts worker) y devuelve status 'pending' con la URL
+        del último gráfico disponible del usuario (o None).
+        """
+        chart_format, _, _, _, image_key = self._chart_spec(user_id, chart_format)
+        if self.redis_client.exists(image_key):
+            return {"status": "ready", "image_url": f"/transactions/images/{image_key}"}
+
+        enqueue_chart(self.redis_client, user_id, chart_format)
+        last = last_chart(self.redis_client, user_id, chart_format)
+        return {"status": "pending", "image_url": f"/transactions/images/{last}" if last else None}
+
+    def _chart_spec(self, user_id: int, chart_format: Optional[str]) -> Tuple[str, List[float], List[str], List[str], str]:
+        """Valida el pedido y devuelve formato, datos, colores y clave de Redis del gráfico del usuario"""
         if not user_id:
             raise ValueError("El user_id no puede ser None")
-        
-        matplotlib.use('Agg')
-        amounts, labels = self.repo.generate_graph(user_id)
+        chart_format = chart_format or CHART_FORMAT
+        if chart_format not in CHART_MIMETYPES:
+            raise ValueError(f"Formato de gráfico no soportado: {chart_format}")
+
+        amounts, labels = self.summary_repo.expenses_by_category(user_id)
 
         if not amounts:
             raise ValueError("No hay datos para generar el gráfico")
@@ -135,48 +432,15 @@ class TransactionService:
             "#00FFA3", "#FFD6E0", "#96D3F5", "#FF6A6A"
         ][:len(amounts)]
 
-        fig, ax = plt.subplots(figsize=(6, 6), dpi=100)
-
-        wedges, _ = ax.pie(
-            amounts,
-            labels=None,
-            startangle=90,
-            wedgeprops=dict(width=0.4, edgecolor='white'),
-            colors=colors
-        )
-
-        legend_labels = [f"{label}  ${int(amount)}" for label, amount in zip(labels, amounts)]
-
-        ax.legend(
-            wedges,
-            legend_labels,
-            title="Categorías",
-            loc='lower center',
-            bbox_to_anchor=(0.5, -0.15),
-            ncol=2,
-            frameon=False,
-            fontsize=10
-        )
-
-        buffer = BytesIO()
-        try:
-            plt.savefig(buffer, format='png', transparent=True, bbox_inches='tight')
-            buffer.seek(0)
-            image_data = buffer.getvalue()
-            buffer.close()
-
-            # Generar un identificador único para la imagen
-            image_key = f"donut_chart_user_{user_id}_{uuid4().hex}"
+        # La clave depende solo de los datos del gráfico: mismos datos, misma imagen
+        # Los PNG conservan la clave sin extensión; los demás formatos la llevan para servir el tipo MIME correcto
+        image_key = f"donut_chart_{self._chart_fingerprint(amounts, labels, colors)}"
+        if chart_format != 'png':
+            image_key = f"{image_key}.{chart_format}"
+        return chart_format, amounts, labels, colors, image_key
 
-            # Guardar la imagen en Redis con un TTL de 300 segundos (5 minutos)
-            self.redis_client.setex(image_key, 300, image_data)
-
-            print("✅ Imagen guardada en Redis con clave:", image_key)
-        except Exception as e:
-            print("❌ Error al guardar imagen en Redis:", e)
-            raise e
-        finally:
-            plt.close()
-
-        # Devolver la URL para acceder a la imagen
-        return f"/transactions/images/{image_key}"
+    @staticmethod
+    def _chart_fingerprint(amounts: List[float], labels: List[str], colors: List[str]) -> str:
+        """Calcula un hash estable de los datos que determinan el gráfico"""
+        payload = json.dumps([amounts, labels, colors], ensure_ascii=False, separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
@@ -1,7 +1,11 @@
+import logging
 from typing import Optional, List
 from app.models.user import User
+from app.passwords import password_hasher
 from app.repository.user_respository import UserRepository
 
+logger = logging.getLogger(__name__)
+
 class UserService:
     def __init__(self, repo: UserRepository = None):
         self.repo = repo or UserRepository()
@@ -13,11 +17,25 @@ class UserService:
         return self.repo.save(user)
 
     def authenticate(self, login: str, password: str) -> Optional[User]:
-        """Verifica credenciales: intenta por username, si no busca email. Devuelve el User si coincide, o None"""
-        user = self.repo.get_by_username(login) or self.repo.get_by_email(login)
-        if user and user.check_password(password):
-            return user
-        return None
+        """
+        Verifica credenciales buscando por username o email. Devuelve el User si coincide, o None.
+        Lanza PasswordHasherBusy si no hay lugar para verificar el hash.
+        """
+        user = self.repo.get_by_login(login)
+        if not user or not user.check_password(password):
+            return None
+        if password_hasher.needs_rehash(user.password_hash):
+            self._rehash(user, password)
+        return user
+
+    def _rehash(self, user: User, password: str) -> None:
+        """Recalcula el hash con el costo configurado; si falla, el login sigue siendo válido"""
+        try:
+            user.set_password(password)
+            self.repo.update(user)
+        except Exception as e:
+            self.repo.rollback()
+            logger.warning("No se pudo actualizar el hash de la contraseña del usuario %s: %s", user.id, e)
 
     def get_user(self, user_id: int) -> Optional[User]:
         """Obtiene un usuario por su ID"""
@@ -0,0 +1,63 @@
+import os
+from flask import Flask
+from flask_migrate import upgrade
+from app import create_app
+from app.extensions import db, cache
+from app.models.partitioning import PARTITIONED, ensure_future_partitions
+
+"""
+Punto de entrada de producción para gunicorn con preload_app (ver gunicorn.conf.py):
+    gunicorn "app.wsgi:create_wsgi_app()"
+La app se crea una sola vez en el proceso maestro y los workers la heredan al hacer fork.
+Antes del fork se cierran las conexiones abiertas durante el arranque, y cada worker descarta
+las referencias heredadas para abrir conexiones propias (un socket no se puede compartir entre procesos).
+"""
+
+# Aplica las migraciones pendientes al arrancar (una sola vez, en el maestro)
+DB_UPGRADE_ON_START = os.environ.get('DB_UPGRADE_ON_START', 'false').lower() == 'true'
+
+def create_wsgi_app() -> Flask:
+    """Crea la app, ejecuta las tareas de arranque y la deja sin conexiones abiertas para el fork"""
+    app = create_app()
+    if DB_UPGRADE_ON_START:
+        with app.app_context():
+            upgrade()
+    if PARTITIONED:
+        ensure_partitions_on_start(app)
+    close_connections(app)
+    return app
+
+def ensure_partitions_on_start(app: Flask) -> None:
+    """Crea las particiones futuras de transaction que falten (complementa `flask partitions ensure` en cron)"""
+    with app.app_context():
+        if db.engine.dialect.name == 'postgresql':
+            with db.engine.begin() as connection:
+                ensure_future_partitions(connection)
+
+def close_connections(app: Flask) -> None:
+    """Cierra las conexiones del pool de la base y de Redis (en el maestro, antes del fork)"""
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+    for client in _redis_clients(app):
+        client.connection_pool.disconnect()
+
+def after_fork(app: Flask) -> None:
+    """
+    Se ejecuta en cada worker recién creado: descarta los pools heredados sin cerrar
+    sus conexiones (pertenecen al maestro) para que el worker abra las suyas.
+    """
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+    for client in _redis_clients(app):
+        client.connection_pool.reset()
+
+def _redis_clients(app: Flask) -> list:
+    """Clientes de Redis de la app: el compartido y el de Flask-Caching (normalmente usan el mismo pool)"""
+    backend = app.extensions.get('cache', {}).get(cache)
+    # cachelib no expone el cliente de forma pública; lectura y escritura suelen ser el mismo
+    candidates = (app.extensions.get('redis'), getattr(backend, '_write_client', None),
+                  getattr(backend, '_read_client', None))
+    clients = {id(client.connection_pool): client for client in candidates if client is not None}
+    return list(clients.values())
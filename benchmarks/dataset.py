@@ -0,0 +1,197 @@
+"""
+Generador de datos sintéticos para los benchmarks.
+Crea usuarios, categorías y transacciones con una semilla fija (la misma semilla genera los mismos datos):
+- fechas repartidas en los últimos --days días, con más movimientos en los más recientes y en fin de semana;
+- egresos con montos log-normales por categoría (muchos chicos, pocos grandes) y un ingreso fijo por mes (sueldo)
+  más ingresos ocasionales;
+- actividad desigual entre usuarios (unos pocos concentran la mayoría de las transacciones).
+Las filas se cargan con INSERT de a lotes (executemany) y al final se recalcula el resumen mensual.
+Uso: python -m benchmarks.dataset [--users 100] [--categories 20] [--transactions 1000000] [--seed 42]
+"""
+import argparse
+import math
+import os
+import random
+import time
+from dataclasses import dataclass, asdict
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, Iterator, List
+from sqlalchemy import insert
+from werkzeug.security import generate_password_hash
+from app import create_app, db
+from app.models import User, Category, Transaction
+from app.models.partitioning import PARTITIONED, ensure_partitions
+from app.repository import MonthlySummaryRepository
+
+METHODS = ('Debit', 'Credit', 'Cash', 'Transfer')
+CATEGORY_NAMES = ('Supermercado', 'Transporte', 'Salud', 'Servicios', 'Alquiler', 'Restaurantes',
+                  'Educación', 'Ropa', 'Entretenimiento', 'Viajes', 'Mascotas', 'Regalos')
+
+@dataclass
+class DatasetSpec:
+    users: int = 100
+    categories: int = 20
+    transactions: int = 1_000_000
+    days: int = 730
+    seed: int = 42
+    end: date = date(2025, 12, 31)
+    # Proporción de transacciones borradas lógicamente
+    deleted_ratio: float = 0.02
+
+    def as_dict(self) -> dict:
+        data = asdict(self)
+        data['end'] = self.end.isoformat()
+        return data
+
+@dataclass
+class Dataset:
+    spec: DatasetSpec
+    user_ids: List[int]
+    category_ids: List[int]
+    # Usuario con más transacciones (el peor caso para los listados y reportes)
+    heaviest_user_id: int
+    rows: int
+    seconds: float
+    # True si se usaron datos ya cargados (spec describe lo pedido, no necesariamente lo que hay)
+    reused: bool = False
+
+def _user_weights(rng: random.Random, users: int) -> List[float]:
+    """Actividad por usuario con cola larga (Pareto): unos pocos usuarios concentran la mayoría de las filas"""
+    return [rng.paretovariate(1.2) for _ in range(users)]
+
+def _day_weights(spec: DatasetSpec) -> List[float]:
+    """Más movimientos en los días recientes (crecimiento de uso) y en fin de semana"""
+    weights = []
+    for offset in range(spec.days):
+        day = spec.end - timedelta(days=offset)
+        weight = math.exp(-offset / spec.days)
+        if day.weekday() >= 5:
+            weight *= 1.4
+        weights.append(weight)
+    return weights
+
+def iter_transactions(spec: DatasetSpec, user_ids: List[int], category_ids: List[int]) -> Iterator[Dict]:
+    """Genera las filas de transaction (como diccionarios para INSERT) de forma determinística"""
+    rng = random.Random(spec.seed)
+    user_weights = _user_weights(rng, len(user_ids))
+    day_weights = _day_weights(spec)
+    # Cada categoría tiene su propio monto típico (mediana entre 5 y 300)
+    category_mu = {category_id: rng.uniform(math.log(5), math.log(300)) for category_id in category_ids}
+
+    # Un sueldo por usuario y por mes
+    months = sorted({(spec.end - timedelta(days=offset)).replace(day=1) for offset in range(spec.days)})
+    salaries = {user_id: round(rng.uniform(800, 6000), 2) for user_id in user_ids}
+    generated = 0
+    for month in months:
+        for user_id in user_ids:
+            if generated >= spec.transactions:
+                return
+            generated += 1
+            yield {
+                'user_id': user_id,
+                'category_id': None,
+                'amount': Decimal(str(salaries[user_id])),
+                'date': month,
+                'description': 'Sueldo',
+                'method': 'Transfer',
+                'is_income': True,
+                'deleted': False
+            }
+
+    batch = 10_000
+    while generated < spec.transactions:
+        size = min(batch, spec.transactions - generated)
+        users = rng.choices(user_ids, weights=user_weights, k=size)
+        offsets = rng.choices(range(spec.days), weights=day_weights, k=size)
+        for user_id, offset in zip(users, offsets):
+            is_income = rng.random() < 0.05
+            category_id = None if rng.random() < 0.08 else rng.choice(category_ids)
+            mu = category_mu[category_id] if category_id else math.log(40)
+            amount = min(rng.lognormvariate(mu, 0.9) * (3 if is_income else 1), 99_999_999)
+            yield {
+                'user_id': user_id,
+                'category_id': category_id,
+                'amount': Decimal(f'{amount:.2f}'),
+                'date': spec.end - timedelta(days=offset),
+                'description': f'Movimiento {generated}',
+                'method': rng.choice(METHODS),
+                'is_income': is_income,
+                'deleted': rng.random() < spec.deleted_ratio
+            }
+            generated += 1
+
+def generate(spec: DatasetSpec, batch_size: int = 5000) -> Dataset:
+    """Carga el conjunto de datos en la base de la app actual (debe estar vacía) y recalcula el resumen mensual"""
+    started = time.perf_counter()
+    # Todos los usuarios comparten la contraseña: el hash es caro y no es lo que se mide
+    password_hash = generate_password_hash('benchmark')
+    users = [User(username=f'bench_{i}', email=f'bench_{i}@example.com', password_hash=password_hash)
+             for i in range(spec.users)]
+    categories = [
+        Category(name=f'{CATEGORY_NAMES[i % len(CATEGORY_NAMES)]} {i // len(CATEGORY_NAMES) + 1}')
+        for i in range(spec.categories)
+    ]
+    db.session.add_all([*users, *categories])
+    db.session.commit()
+    user_ids = [user.id for user in users]
+    category_ids = [category.id for category in categories]
+    if PARTITIONED and db.engine.dialect.name == 'postgresql':
+        # Sin particiones para el rango, todas las filas caerían en la partición por defecto
+        ensure_partitions(db.session.connection(), spec.end - timedelta(days=spec.days), spec.end)
+
+    # INSERT sin RETURNING: con un millón de filas no hace falta traer los IDs
+    stmt = insert(Transaction)
+    per_user = dict.fromkeys(user_ids, 0)
+    rows = []
+    count = 0
+    for row in iter_transactions(spec, user_ids, category_ids):
+        rows.append(row)
+        per_user[row['user_id']] += 1
+        if len(rows) >= batch_size:
+            db.session.execute(stmt, rows)
+            count += len(rows)
+            rows = []
+    if rows:
+        db.session.execute(stmt, rows)
+        count += len(rows)
+    db.session.commit()
+    MonthlySummaryRepository().rebuild()
+    db.session.expunge_all()
+
+    return Dataset(
+        spec=spec,
+        user_ids=user_ids,
+        category_ids=category_ids,
+        heaviest_user_id=max(per_user, key=per_user.get),
+        rows=count,
+        seconds=time.perf_counter() - started
+    )
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = DatasetSpec()
+    parser.add_argument('--users', type=int, default=defaults.users)
+    parser.add_argument('--categories', type=int, default=defaults.categories)
+    parser.add_argument('--transactions', type=int, default=defaults.transactions)
+    parser.add_argument('--days', type=int, default=defaults.days)
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+
+def spec_from_args(args: argparse.Namespace) -> DatasetSpec:
+    return DatasetSpec(users=args.users, categories=args.categories, transactions=args.transactions,
+                       days=args.days, seed=args.seed)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    os.environ.setdefault('FLASK_CONTEXT', 'testing')
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        dataset = generate(spec_from_args(args))
+        print(f"{dataset.rows} transacciones de {len(dataset.user_ids)} usuarios cargadas "
+              f"en {dataset.seconds:.1f} s ({dataset.rows / dataset.seconds:,.0f} filas/s)")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Compara la lectura de listados con el ORM contra el modo read_only (Core + TransactionRecord).
+Carga las filas en la base de TEST_DB_URI (configuración testing) y borra las tablas al terminar.
+Uso: python -m benchmarks.read_path [--rows 10000] [--repeat 5]
+"""
+import argparse
+import os
+import time
+import tracemalloc
+from datetime import date, timedelta
+from decimal import Decimal
+from app import create_app, db
+from app.models import User, Category
+from app.mapping import TransactionSchema, FastSerializer
+from app.repository import TransactionRepository
+
+def seed(rows: int) -> int:
+    user = User(username='benchmark', email='benchmark@example.com', password_hash='x')
+    categories = [Category(name=f'Categoría {i}') for i in range(20)]
+    db.session.add_all([user, *categories])
+    db.session.commit()
+    start = date(2025, 1, 1)
+    TransactionRepository().bulk_insert([
+        {
+            'user_id': user.id,
+            'category_id': None if i % 7 == 0 else categories[i % 20].id,
+            'amount': Decimal(i % 5000) / 100,
+            'date': start + timedelta(days=i % 365),
+            'description': f'Movimiento {i}',
+            'method': 'Debit',
+            'is_income': i % 3 == 0,
+            'deleted': False
+        }
+        for i in range(rows)
+    ])
+    return user.id
+
+def measure(func, repeat: int):
+    """Devuelve el mejor tiempo y el pico de memoria asignada de func()"""
+    timings = []
+    for _ in range(repeat):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    db.session.expunge_all()
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return min(timings), peak
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    os.environ['FLASK_CONTEXT'] = 'testing'
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        try:
+            user_id = seed(args.rows)
+            repo = TransactionRepository()
+            serializer = FastSerializer(TransactionSchema())
+            cases = {
+                'orm': lambda: serializer.dump_many(repo.filter(user_id=user_id, per_page=args.rows)),
+                'read_only': lambda: serializer.dump_many(repo.filter(user_id=user_id, per_page=args.rows, read_only=True)),
+            }
+            for name, func in cases.items():
+                seconds, peak = measure(func, args.repeat)
+                print(f"{name:>10}: {seconds * 1e6 / args.rows:6.1f} µs/fila  "
+                      f"{peak / args.rows:7.0f} B/fila (pico)  total {seconds * 1000:7.1f} ms")
+        finally:
+            db.session.remove()
+            db.drop_all()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Compara el volcado de listados con marshmallow contra FastSerializer + dump_envelope.
+Uso: python -m benchmarks.serialization [--rows 1000 10000] [--repeat 5]
+"""
+import argparse
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from app.mapping import TransactionSchema, ResponseSchema, FastSerializer, dump_envelope
+from app.models import Transaction, User, Category
+from app.services.response_message import ResponseBuilder
+
+def build_transactions(rows: int):
+    """Arma transacciones en memoria (sin base de datos) con usuario y categoría"""
+    users = [User(id=i, username=f'user{i}', email=f'user{i}@example.com') for i in range(1, 11)]
+    categories = [Category(id=i, name=f'Categoría {i}') for i in range(1, 21)]
+    start = date(2025, 1, 1)
+    return [
+        Transaction(
+            id=i,
+            amount=Decimal(i % 5000) / 100,
+            date=start + timedelta(days=i % 365),
+            description=f'Movimiento {i}',
+            method='Debit',
+            is_income=i % 3 == 0,
+            deleted=False,
+            user_id=users[i % 10].id,
+            user=users[i % 10],
+            category_id=None if i % 7 == 0 else categories[i % 20].id,
+            category=None if i % 7 == 0 else categories[i % 20]
+        )
+        for i in range(1, rows + 1)
+    ]
+
+def marshmallow_path(transactions):
+    data = TransactionSchema(many=True).dump(transactions)
+    builder = ResponseBuilder().add_message("Listado de transacciones").add_status_code(200).add_data(data)
+    return ResponseSchema().dump(builder.build())
+
+def fast_path(transactions, serializer=FastSerializer(TransactionSchema())):
+    data = serializer.dump_many(transactions)
+    builder = ResponseBuilder().add_message("Listado de transacciones").add_status_code(200).add_data(data)
+    return dump_envelope(builder.build())
+
+def best_of(func, transactions, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(transactions)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        transactions = build_transactions(rows)
+        assert marshmallow_path(transactions) == fast_path(transactions)
+        slow = best_of(marshmallow_path, transactions, args.repeat)
+        fast = best_of(fast_path, transactions, args.repeat)
+        print(f"{rows:>7} filas  marshmallow {slow * 1000:8.1f} ms  rápido {fast * 1000:8.1f} ms  x{slow / fast:.1f}")
+
+if __name__ == '__main__':
+    main()
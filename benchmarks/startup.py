@@ -0,0 +1,58 @@
+"""
+Mide el arranque de create_app en un proceso nuevo: tiempo total, memoria (RSS máxima)
+y el desglose de tiempo de import por paquete (python -X importtime).
+Uso: python -m benchmarks.startup [--top 15]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+# Paquetes pesados que no deberían cargarse solo por crear la app
+HEAVY_PACKAGES = ('matplotlib', 'numpy', 'PIL')
+
+CHILD = """
+import json, resource, sys, time
+start = time.perf_counter()
+from app import create_app
+create_app()
+elapsed = time.perf_counter() - start
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"seconds": elapsed, "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, "heavy": heavy}}))
+"""
+
+def measure_startup() -> dict:
+    """Arranca create_app en un subproceso y devuelve tiempos, memoria e imports por paquete"""
+    env = dict(os.environ, FLASK_CONTEXT=os.environ.get('FLASK_CONTEXT', 'testing'))
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CHILD.format(heavy=HEAVY_PACKAGES)],
+        capture_output=True, text=True, env=env, check=True
+    )
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    # Cada línea: "import time: self [us] | cumulative | imported package"
+    by_package = defaultdict(int)
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        by_package[name.strip().split('.')[0]] += int(self_us)
+    result['imports_ms'] = {name: us / 1000 for name, us in by_package.items()}
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    result = measure_startup()
+    print(f"create_app: {result['seconds'] * 1000:.0f} ms  RSS máx: {result['max_rss_kb'] / 1024:.1f} MB")
+    print(f"paquetes pesados cargados: {', '.join(result['heavy']) or 'ninguno'}")
+    ranking = sorted(result['imports_ms'].items(), key=lambda item: item[1], reverse=True)[:args.top]
+    for name, ms in ranking:
+        print(f"  {name:<28} {ms:8.1f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,278 @@
+"""
+Suite de benchmarks sobre datos sintéticos (ver benchmarks/dataset.py).
+Mide las consultas del repositorio, los reportes de ExpenseService, el gráfico, la exportación CSV
+y las rutas principales a través del cliente de pruebas de Flask. Por cada caso informa p50/p95/p99,
+el mínimo y filas/s (filas procesadas sobre p50), y guarda los resultados en JSON para comparar corridas.
+Usa la base de TEST_DB_URI (configuración testing): para volúmenes reales conviene un PostgreSQL.
+Los casos que necesitan Redis (gráfico) se informan con error si no hay un servidor disponible.
+
+Uso:
+    python -m benchmarks.suite [--transactions 1000000] [--repeat 20] [--only expense,http]
+                               [--output resultados.json] [--compare anterior.json] [--reuse] [--keep]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+from sqlalchemy import func, select
+from app import create_app, db
+from app.extensions import cache
+from app.models import User, Category, Transaction
+from app.reports.csv_export import iter_transactions_csv
+from app.repository import TransactionRepository
+from app.services import ExpenseService, TransactionService
+from benchmarks.dataset import Dataset, add_arguments, generate, spec_from_args
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+
+@dataclass
+class Case:
+    name: str
+    # Ejecuta una vez el caso; si devuelve un int, es la cantidad de filas procesadas
+    run: Callable[[], Any]
+    # Se ejecuta antes de cada repetición, fuera de la medición (por ejemplo, vaciar la caché)
+    setup: Optional[Callable[[], None]] = None
+
+def percentile(samples: List[float], q: float) -> float:
+    """Percentil q (0-100) con interpolación lineal entre las muestras ordenadas"""
+    ordered = sorted(samples)
+    if len(ordered) == 1:
+        return ordered[0]
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+def summarize(samples: List[float], rows: Optional[int]) -> Dict[str, Any]:
+    p50 = percentile(samples, 50)
+    return {
+        "samples": len(samples),
+        "min_ms": round(min(samples) * 1000, 3),
+        "p50_ms": round(p50 * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+        "max_ms": round(max(samples) * 1000, 3),
+        "rows": rows,
+        "rows_per_sec": round(rows / p50, 1) if rows and p50 > 0 else None,
+    }
+
+def run_case(case: Case, repeat: int, warmup: int) -> Dict[str, Any]:
+    """Ejecuta el caso warmup veces sin medir y repeat veces midiendo; un error corta el caso"""
+    samples = []
+    rows = None
+    try:
+        for iteration in range(warmup + repeat):
+            if case.setup:
+                case.setup()
+            db.session.expunge_all()
+            start = time.perf_counter()
+            result = case.run()
+            elapsed = time.perf_counter() - start
+            rows = result if type(result) is int else None
+            if iteration >= warmup:
+                samples.append(elapsed)
+    except Exception as e:
+        db.session.rollback()
+        return {"error": f"{type(e).__name__}: {e}"}
+    return summarize(samples, rows)
+
+def load_dataset(args: argparse.Namespace) -> Dataset:
+    """Genera los datos, o con --reuse usa los que ya hay en la base"""
+    spec = spec_from_args(args)
+    if args.reuse and db.session.scalar(select(func.count()).select_from(Transaction)):
+        counts = db.session.execute(
+            select(Transaction.user_id, func.count()).group_by(Transaction.user_id)
+        ).all()
+        return Dataset(
+            spec=spec,
+            user_ids=list(db.session.scalars(select(User.id))),
+            category_ids=list(db.session.scalars(select(Category.id))),
+            heaviest_user_id=max(counts, key=lambda row: row[1])[0],
+            rows=sum(count for _, count in counts),
+            seconds=0.0,
+            reused=True
+        )
+    return generate(spec)
+
+def build_cases(app, dataset: Dataset) -> List[Case]:
+    repo = TransactionRepository()
+    expenses = ExpenseService()
+    transactions = TransactionService()
+    client = app.test_client()
+    user_id = dataset.heaviest_user_id
+    category_id = dataset.category_ids[0]
+    last = db.session.scalar(select(func.max(Transaction.date)))
+    year_start = last - timedelta(days=364)
+    quarter_start = last - timedelta(days=90)
+    # Meses con extremos sueltos: total_by_period combina el resumen mensual con la tabla transaction
+    period = (year_start.replace(day=15), last.replace(day=10))
+    month2 = last.replace(day=1)
+    month1 = (month2 - timedelta(days=1)).replace(day=1)
+
+    def rows_of(response) -> Optional[int]:
+        if response.status_code >= 400:
+            raise RuntimeError(f"HTTP {response.status_code}")
+        body = response.get_json(silent=True)
+        if body and isinstance(body.get('data'), list):
+            return len(body['data'])
+        return None
+
+    def get(url: str) -> Callable[[], Optional[int]]:
+        return lambda: rows_of(client.get(url))
+
+    def export_csv() -> int:
+        lines = 0
+        for chunk in iter_transactions_csv(repo.stream(user_id=user_id, read_only=True)):
+            lines += chunk.count('\n')
+        return lines - 1
+
+    def http_export() -> int:
+        response = client.get(f'/transactions/export?user_id={user_id}')
+        if response.status_code >= 400:
+            raise RuntimeError(f"HTTP {response.status_code}")
+        return response.get_data().count(b'\n') - 1
+
+    def home() -> None:
+        with client.session_transaction() as session:
+            session['user_id'] = user_id
+        response = client.get('/')
+        if response.status_code >= 400:
+            raise RuntimeError(f"HTTP {response.status_code}")
+
+    # Los reportes se cachean: se vacía la caché antes de cada repetición para medir el cálculo
+    clear_cache = cache.clear
+    return [
+        Case('repository.filter.page', lambda: len(repo.filter(user_id=user_id, per_page=20))),
+        Case('repository.filter.page_read_only', lambda: len(repo.filter(user_id=user_id, per_page=20, read_only=True))),
+        Case('repository.filter.deep_page', lambda: len(repo.filter(user_id=user_id, page=200, per_page=50, read_only=True))),
+        Case('repository.filter.range_category', lambda: len(repo.filter(
+            user_id=user_id, start_date=quarter_start, end_date=last, category_id=category_id,
+            per_page=1000, read_only=True))),
+        Case('repository.filter.large_read_only', lambda: len(repo.filter(user_id=user_id, per_page=10000, read_only=True))),
+        Case('repository.filter_keyset', lambda: len(repo.filter_keyset(user_id=user_id, limit=50, read_only=True))),
+        Case('expense.total_by_period', lambda: expenses.total_by_period(
+            user_id=user_id, is_income=False, start=period[0], end=period[1]), clear_cache),
+        Case('expense.total_by_period.all_users', lambda: expenses.total_by_period(
+            is_income=False, start=period[0], end=period[1]), clear_cache),
+        Case('expense.compare_months', lambda: expenses.compare_months(
+            user_id=user_id, is_income=False,
+            month1=datetime.combine(month1, datetime.min.time()),
+            month2=datetime.combine(month2, datetime.min.time())), clear_cache),
+        Case('expense.key_indicators', lambda: expenses.key_indicators(
+            user_id=user_id, is_income=False, start=year_start, end=last), clear_cache),
+        Case('expense.total_income_expense_balance', lambda: expenses.total_income_expense_balance(user_id),
+             clear_cache),
+        Case('expense.cached.key_indicators', lambda: expenses.key_indicators(
+            user_id=user_id, is_income=False, start=year_start, end=last)),
+        Case('charts.generate_graph.png', lambda: transactions.generate_graph(user_id, chart_format='png')),
+        Case('charts.generate_graph.svg', lambda: transactions.generate_graph(user_id, chart_format='svg')),
+        Case('csv.export', export_csv),
+        Case('http.transactions.list', get(f'/transactions?user_id={user_id}&per_page=20')),
+        Case('http.transactions.list_large', get(f'/transactions?user_id={user_id}&per_page=1000')),
+        Case('http.transactions.cursor', get(f'/transactions?user_id={user_id}&cursor=&per_page=50')),
+        Case('http.transactions.export', http_export),
+        Case('http.transactions.graph', get(f'/transactions/{user_id}/graph?format=svg')),
+        Case('http.expenses.total_by_period', get(
+            f'/expenses/total_by_period?user_id={user_id}&start={period[0]}&end={period[1]}&is_income=false'), clear_cache),
+        Case('http.expenses.compare_months', get(
+            f'/expenses/compare_months?user_id={user_id}&month1={month1:%Y-%m}&month2={month2:%Y-%m}'), clear_cache),
+        Case('http.expenses.key_indicators', get(
+            f'/expenses/key_indicators?user_id={user_id}&start={year_start}&end={last}'), clear_cache),
+        Case('http.expenses.total_income_expense_balance', get(
+            f'/expenses/total_income_expense_balance?user_id={user_id}'), clear_cache),
+        Case('http.categories.all', get('/categories/all')),
+        Case('http.users.list', get('/users')),
+        Case('http.home', home, clear_cache),
+    ]
+
+def metadata(app, dataset: Dataset, args: argparse.Namespace) -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "database": db.engine.dialect.name,
+        "dataset": dataset.spec.as_dict(),
+        "reused": dataset.reused,
+        "rows": dataset.rows,
+        "heaviest_user_id": dataset.heaviest_user_id,
+        "load_seconds": round(dataset.seconds, 2),
+        "load_rows_per_sec": round(dataset.rows / dataset.seconds, 1) if dataset.seconds else None,
+        "repeat": args.repeat,
+        "warmup": args.warmup,
+    }
+
+def print_results(results: Dict[str, Dict[str, Any]], previous: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+    print(f"{'caso':<45}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'filas/s':>14}{'vs. anterior':>14}")
+    for name, result in results.items():
+        if 'error' in result:
+            print(f"{name:<45}  error: {result['error']}")
+            continue
+        change = ''
+        before = (previous or {}).get(name, {}).get('p50_ms')
+        if before:
+            change = f"{(result['p50_ms'] - before) * 100 / before:+.1f}%"
+        rows_per_sec = f"{result['rows_per_sec']:,.0f}" if result['rows_per_sec'] else '-'
+        print(f"{name:<45}{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+              f"{rows_per_sec:>14}{change:>14}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_arguments(parser)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--warmup', type=int, default=2)
+    parser.add_argument('--only', default='', help='Prefijos de casos separados por coma (ej.: expense,http.transactions)')
+    parser.add_argument('--output', default=None, help=f'Archivo JSON de resultados (por defecto en {RESULTS_DIR})')
+    parser.add_argument('--compare', default=None, help='JSON de una corrida anterior para comparar p50')
+    parser.add_argument('--reuse', action='store_true', help='Usa los datos que ya están en la base si los hay')
+    parser.add_argument('--keep', action='store_true', help='No borra las tablas al terminar')
+    args = parser.parse_args()
+
+    os.environ.setdefault('FLASK_CONTEXT', 'testing')
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        try:
+            dataset = load_dataset(args)
+            print(f"datos: {dataset.rows} transacciones, {len(dataset.user_ids)} usuarios "
+                  f"(carga {dataset.seconds:.1f} s)", file=sys.stderr)
+            prefixes = tuple(prefix for prefix in args.only.split(',') if prefix)
+            results = {}
+            for case in build_cases(app, dataset):
+                if prefixes and not case.name.startswith(prefixes):
+                    continue
+                print(f"midiendo {case.name}...", file=sys.stderr)
+                results[case.name] = run_case(case, args.repeat, args.warmup)
+            report = {"meta": metadata(app, dataset, args), "results": results}
+        finally:
+            db.session.remove()
+            if not args.keep:
+                db.drop_all()
+
+    previous = None
+    if args.compare:
+        with open(args.compare) as file:
+            previous = json.load(file)['results']
+    print_results(results, previous)
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"run-{datetime.now():%Y%m%d-%H%M%S}.json")
+    with open(output, 'w') as file:
+        json.dump(report, file, indent=2)
+    print(f"resultados guardados en {output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+import multiprocessing
+import os
+
+"""
+Configuración de gunicorn para producción (se lee automáticamente desde el directorio de trabajo).
+    gunicorn "app.wsgi:create_wsgi_app()"
+Todo se puede ajustar con variables de entorno GUNICORN_*.
+"""
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+# sync: un pedido por worker; gthread: varios hilos por worker; gevent: corrutinas (E/S concurrente)
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 100))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+# Recicla los workers cada tantos pedidos para acotar el crecimiento de memoria
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+# La app se carga una vez en el maestro y los workers la heredan (arranque y memoria compartidos)
+preload_app = True
+
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+accesslog = '-'
+errorlog = '-'
+
+if worker_class == 'gevent':
+    # Con preload la app se importa en el maestro: hay que parchear antes de que se carguen
+    # socket, threading, psycopg2 y redis, no recién en el worker
+    from gevent import monkey
+    monkey.patch_all()
+    try:
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
+    except ImportError:
+        pass
+
+def post_fork(server, worker):
+    """Cada worker descarta las conexiones heredadas del maestro"""
+    from app.wsgi import after_fork
+    after_fork(server.app.wsgi())
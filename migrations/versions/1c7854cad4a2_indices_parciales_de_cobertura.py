@@ -0,0 +1,57 @@
+"""Índices parciales de cobertura para transacciones activas
+
+Revision ID: 1c7854cad4a2
+Revises: 6e9c4431e108
+Create Date: 2026-10-18 12:48:31.602917
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1c7854cad4a2'
+down_revision = '6e9c4431e108'
+branch_labels = None
+depends_on = None
+
+
+def _vacuum():
+    # Un index-only scan solo evita el heap en páginas marcadas como visibles: VACUUM actualiza ese mapa
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.execute('VACUUM (ANALYZE) "transaction"')
+
+
+def upgrade():
+    # ix_txn_active (id WHERE NOT deleted) no lo usa ninguna consulta, ix_txn_income es un booleano
+    # con dos valores e ix_txn_user es prefijo de ix_txn_user_date
+    op.drop_index('ix_txn_active', table_name='transaction', postgresql_where=sa.text('deleted = false'))
+    op.drop_index('ix_txn_income', table_name='transaction')
+    op.drop_index('ix_txn_user', table_name='transaction')
+
+    op.create_index(
+        'ix_txn_user_date_active', 'transaction',
+        ['user_id', sa.text('date DESC'), sa.text('id DESC')],
+        unique=False,
+        postgresql_include=['amount', 'is_income', 'category_id'],
+        postgresql_where=sa.text('deleted = false')
+    )
+    op.create_index(
+        'ix_txn_date_active', 'transaction',
+        [sa.text('date DESC'), sa.text('id DESC')],
+        unique=False,
+        postgresql_include=['amount', 'is_income'],
+        postgresql_where=sa.text('deleted = false')
+    )
+    _vacuum()
+
+
+def downgrade():
+    op.drop_index('ix_txn_date_active', table_name='transaction', postgresql_where=sa.text('deleted = false'))
+    op.drop_index('ix_txn_user_date_active', table_name='transaction', postgresql_where=sa.text('deleted = false'))
+
+    op.create_index('ix_txn_user', 'transaction', ['user_id'], unique=False)
+    op.create_index('ix_txn_income', 'transaction', ['is_income'], unique=False)
+    op.create_index('ix_txn_active', 'transaction', ['id'], unique=False, postgresql_where=sa.text('deleted = false'))
+    _vacuum()
@@ -0,0 +1,114 @@
+"""Particionado de transacciones por fecha
+
+Revision ID: 6e9c4431e108
+Revises: cd3b9f95cdcc
+Create Date: 2026-10-18 12:20:05.114273
+
+"""
+import os
+from datetime import date
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6e9c4431e108'
+down_revision = 'cd3b9f95cdcc'
+branch_labels = None
+depends_on = None
+
+# Mismo valor que app.models.partitioning: month, year o vacío (la migración no hace nada)
+INTERVAL = os.environ.get('TRANSACTION_PARTITION_INTERVAL', '').lower()
+AHEAD = int(os.environ.get('TRANSACTION_PARTITIONS_AHEAD', 3))
+
+COLUMNS = 'id, amount, date, description, method, is_income, deleted, user_id, category_id'
+
+
+def _next_start(start, interval):
+    if interval == 'year':
+        return start.replace(year=start.year + 1)
+    return start.replace(year=start.year + 1, month=1) if start.month == 12 else start.replace(month=start.month + 1)
+
+
+def _is_partitioned(bind):
+    return bind.scalar(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = '\"transaction\"'::regclass)"
+    ))
+
+
+def _create_indexes():
+    op.create_index('ix_txn_active', 'transaction', ['id'], unique=False, postgresql_where=sa.text('deleted = false'))
+    op.create_index('ix_txn_category', 'transaction', ['category_id'], unique=False)
+    op.create_index('ix_txn_income', 'transaction', ['is_income'], unique=False)
+    op.create_index('ix_txn_user', 'transaction', ['user_id'], unique=False)
+    op.create_index('ix_txn_user_date', 'transaction', ['user_id', 'date'], unique=False)
+
+
+def _rename_current():
+    """Renombra la tabla actual y su clave primaria para crear la nueva con los nombres originales"""
+    op.execute('ALTER TABLE "transaction" RENAME TO transaction_old')
+    op.execute('ALTER TABLE transaction_old RENAME CONSTRAINT transaction_pkey TO transaction_old_pkey')
+
+
+def _create_table(partitioned):
+    op.execute(f"""
+        CREATE TABLE "transaction" (
+            id INTEGER NOT NULL DEFAULT nextval('transaction_id_seq'::regclass),
+            amount NUMERIC(10, 2) NOT NULL,
+            date DATE NOT NULL,
+            description VARCHAR(255),
+            method VARCHAR(50),
+            is_income BOOLEAN NOT NULL,
+            deleted BOOLEAN,
+            user_id INTEGER NOT NULL REFERENCES "user" (id),
+            category_id INTEGER REFERENCES category (id),
+            PRIMARY KEY ({'id, date' if partitioned else 'id'})
+        ){' PARTITION BY RANGE (date)' if partitioned else ''}
+    """)
+    # La secuencia pasa a la tabla nueva antes de borrar la vieja (si no, se borraría con ella)
+    op.execute('ALTER SEQUENCE transaction_id_seq OWNED BY "transaction".id')
+
+
+def _move_rows():
+    """Copia las filas a la tabla nueva y borra la vieja (con sus índices, que se recrean después)"""
+    op.execute(f'INSERT INTO "transaction" ({COLUMNS}) SELECT {COLUMNS} FROM transaction_old')
+    op.execute('DROP TABLE transaction_old')
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql' or INTERVAL not in ('month', 'year') or _is_partitioned(bind):
+        return
+
+    # Desde la transacción más vieja hasta AHEAD intervalos después del actual
+    oldest = bind.scalar(sa.text('SELECT MIN(date) FROM "transaction"')) or date.today()
+    start = oldest.replace(month=1, day=1) if INTERVAL == 'year' else oldest.replace(day=1)
+    current = date.today().replace(month=1, day=1) if INTERVAL == 'year' else date.today().replace(day=1)
+    last = current
+    for _ in range(AHEAD):
+        last = _next_start(last, INTERVAL)
+
+    _rename_current()
+    _create_table(partitioned=True)
+    while start <= last:
+        end = _next_start(start, INTERVAL)
+        name = f"transaction_p{start:%Y}" if INTERVAL == 'year' else f"transaction_p{start:%Y_%m}"
+        op.execute(f"""CREATE TABLE {name} PARTITION OF "transaction" FOR VALUES FROM ('{start}') TO ('{end}')""")
+        start = end
+    op.execute('CREATE TABLE transaction_default PARTITION OF "transaction" DEFAULT')
+    _move_rows()
+    # Índices particionados: se crean en la tabla padre y PostgreSQL los crea en cada partición
+    _create_indexes()
+    op.execute('ANALYZE "transaction"')
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql' or not _is_partitioned(bind):
+        return
+
+    _rename_current()
+    _create_table(partitioned=False)
+    _move_rows()
+    _create_indexes()
+    op.execute('ANALYZE "transaction"')
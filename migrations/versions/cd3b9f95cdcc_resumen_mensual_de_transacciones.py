@@ -0,0 +1,41 @@
+"""Resumen mensual de transacciones
+
+Revision ID: cd3b9f95cdcc
+Revises: 69a0a7c971af
+Create Date: 2026-10-18 10:12:41.203518
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'cd3b9f95cdcc'
+down_revision = '69a0a7c971af'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('monthly_summary',
+    sa.Column('user_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('year_month', sa.String(length=7), nullable=False),
+    sa.Column('category_id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('is_income', sa.Boolean(), nullable=False),
+    sa.Column('total', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('user_id', 'year_month', 'category_id', 'is_income')
+    )
+
+    # Carga inicial desde las transacciones existentes (equivale a `flask rollup rebuild`)
+    op.execute("""
+        INSERT INTO monthly_summary (user_id, year_month, category_id, is_income, total, count)
+        SELECT user_id, to_char(date, 'YYYY-MM'), COALESCE(category_id, 0), is_income, SUM(amount), COUNT(id)
+        FROM "transaction"
+        WHERE deleted = false
+        GROUP BY user_id, to_char(date, 'YYYY-MM'), COALESCE(category_id, 0), is_income
+    """)
+
+
+def downgrade():
+    op.drop_table('monthly_summary')
@@ -0,0 +1,56 @@
+import unittest, os
+from sqlalchemy import func, select
+from app import create_app, db
+from app.models import Transaction, MonthlySummary
+from benchmarks.dataset import DatasetSpec, generate, iter_transactions
+from benchmarks.suite import Case, percentile, run_case
+
+class BenchmarksTestCase(unittest.TestCase):
+    def setUp(self):
+        # Configuración del entorno de testing
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_dataset_is_deterministic(self):
+        """Test que la misma semilla genera las mismas transacciones"""
+        spec = DatasetSpec(users=3, categories=4, transactions=500, days=90)
+        first = list(iter_transactions(spec, [1, 2, 3], [1, 2, 3, 4]))
+        second = list(iter_transactions(spec, [1, 2, 3], [1, 2, 3, 4]))
+        self.assertEqual(len(first), 500)
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, list(iter_transactions(DatasetSpec(users=3, categories=4, transactions=500,
+                                                                      days=90, seed=7), [1, 2, 3], [1, 2, 3, 4])))
+
+    def test_generate_loads_rows_and_rollup(self):
+        """Test que la carga inserta todas las filas y recalcula el resumen mensual"""
+        dataset = generate(DatasetSpec(users=3, categories=4, transactions=500, days=90), batch_size=128)
+        self.assertEqual(dataset.rows, 500)
+        self.assertEqual(db.session.scalar(select(func.count()).select_from(Transaction)), 500)
+        self.assertGreater(db.session.scalar(select(func.count()).select_from(MonthlySummary)), 0)
+        self.assertIn(dataset.heaviest_user_id, dataset.user_ids)
+
+    def test_run_case_reports_percentiles(self):
+        """Test que cada caso informa percentiles y filas/s, y los errores sin cortar la corrida"""
+        self.assertEqual(percentile([4.0, 1.0, 3.0, 2.0], 50), 2.5)
+        self.assertEqual(percentile([1.0, 2.0, 3.0], 100), 3.0)
+
+        result = run_case(Case('ok', lambda: 10), repeat=5, warmup=1)
+        self.assertEqual(result['samples'], 5)
+        self.assertEqual(result['rows'], 10)
+        self.assertLessEqual(result['p50_ms'], result['p95_ms'])
+        self.assertLessEqual(result['p95_ms'], result['p99_ms'])
+        self.assertIsNotNone(result['rows_per_sec'])
+
+        failed = run_case(Case('error', lambda: 1 / 0), repeat=3, warmup=0)
+        self.assertIn('ZeroDivisionError', failed['error'])
+
+if __name__ == '__main__':
+    unittest.main()
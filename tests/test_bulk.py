@@ -0,0 +1,83 @@
+import unittest, os
+from decimal import Decimal
+from app import create_app, db
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.models.category import Category
+from app.models.monthly_summary import MonthlySummary
+
+class BulkTransactionTestCase(unittest.TestCase):
+    def setUp(self):
+        # Configuración del entorno de testing
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.user = User(username='testuser', email='test@example.com')
+        self.user.set_password('TestPassword123')
+        db.session.add(self.user)
+        self.category = Category(name='Groceries')
+        db.session.add(self.category)
+        db.session.commit()
+
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _row(self, amount='10.00', **overrides):
+        row = {
+            'amount': amount,
+            'date': '2025-01-15',
+            'is_income': False,
+            'user_id': self.user.id,
+            'category_id': self.category.id
+        }
+        row.update(overrides)
+        return row
+
+    def test_bulk_create(self):
+        """Test carga masiva de transacciones válidas"""
+        payload = [self._row(amount=f'{i}.00', description=f'Compra {i}') for i in range(1, 51)]
+        payload.append(self._row(amount='5.00', category_id=None))
+
+        response = self.client.post('/transactions/bulk', json=payload)
+        self.assertEqual(response.status_code, 201)
+        data = response.get_json()['data']
+        self.assertEqual(data['created'], 51)
+        self.assertEqual(data['errors'], {})
+        self.assertEqual(Transaction.query.count(), 51)
+        self.assertEqual(Transaction.query.get(data['ids'][0]).description, 'Compra 1')
+
+        summary = MonthlySummary.query.filter_by(category_id=self.category.id).one()
+        self.assertEqual(summary.total, Decimal('1275.00'))
+        self.assertEqual(summary.count, 50)
+
+    def test_bulk_reports_row_errors(self):
+        """Test que las filas inválidas se informan sin impedir la carga de las válidas"""
+        payload = [
+            self._row(),
+            self._row(amount='no-es-un-monto'),
+            self._row(user_id=9999),
+            self._row(category_id=9999),
+            self._row(amount='20.00'),
+        ]
+
+        response = self.client.post('/transactions/bulk', json=payload)
+        self.assertEqual(response.status_code, 201)
+        data = response.get_json()['data']
+        self.assertEqual(data['created'], 2)
+        self.assertEqual(sorted(data['errors'].keys()), ['1', '2', '3'])
+        self.assertEqual(Transaction.query.count(), 2)
+
+    def test_bulk_rejects_non_list(self):
+        """Test que el cuerpo debe ser una lista"""
+        response = self.client.post('/transactions/bulk', json=self._row())
+        self.assertEqual(response.status_code, 422)
+
+if __name__ == '__main__':
+    unittest.main()
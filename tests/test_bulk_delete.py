@@ -0,0 +1,169 @@
+import unittest, os
+from datetime import date, timedelta
+from decimal import Decimal
+from sqlalchemy import event
+from app import create_app, db
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.models.category import Category
+from app.models.monthly_summary import MonthlySummary
+from app.repository import TransactionRepository
+from app.repository.monthly_summary_repository import MonthlySummaryRepository
+from app.services.transaction_service import TransactionService
+
+class BulkDeleteTestCase(unittest.TestCase):
+    def setUp(self):
+        # Configuración del entorno de testing
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.user = User(username='testuser', email='test@example.com', password_hash='x')
+        self.other = User(username='otheruser', email='other@example.com', password_hash='x')
+        self.category = Category(name='Groceries')
+        db.session.add_all([self.user, self.other, self.category])
+        db.session.commit()
+        self.user_id, self.other_id, self.category_id = self.user.id, self.other.id, self.category.id
+
+        self.service = TransactionService()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _create(self, user_id, amount, day, is_income=False, category_id=None):
+        return self.service.create_transaction(
+            user_id=user_id, amount=Decimal(amount), date=day, is_income=is_income, category_id=category_id
+        ).id
+
+    def _snapshot(self):
+        """Filas del resumen con movimientos, como diccionario clave → (total, count)"""
+        db.session.expire_all()
+        return {
+            (row.user_id, row.year_month, row.category_id, row.is_income): (row.total, row.count)
+            for row in MonthlySummary.query.all() if row.count
+        }
+
+    def assertSummaryConsistent(self):
+        """El resumen mantenido de forma incremental coincide con uno recalculado desde cero"""
+        incremental = self._snapshot()
+        MonthlySummaryRepository().rebuild()
+        db.session.commit()
+        self.assertEqual(incremental, self._snapshot())
+
+    def _deleted(self, ids):
+        db.session.expire_all()
+        return [Transaction.query.get(txn_id).deleted for txn_id in ids]
+
+    def test_soft_delete_by_ids_is_scoped_to_user(self):
+        """Test que el borrado por IDs solo alcanza transacciones activas del usuario indicado"""
+        mine = [self._create(self.user_id, '10.00', date(2025, 1, day)) for day in (3, 4, 5)]
+        theirs = self._create(self.other_id, '99.00', date(2025, 1, 3))
+
+        response = self.client.delete('/transactions', json={'user_id': self.user_id, 'ids': mine[:2] + [theirs, 999999]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['data'], {'count': 2, 'ids': sorted(mine[:2])})
+        self.assertEqual(self._deleted(mine + [theirs]), [True, True, False, False])
+        self.assertSummaryConsistent()
+
+        # Repetir el borrado no vuelve a restar del resumen
+        response = self.client.delete('/transactions', json={'user_id': self.user_id, 'ids': mine[:2]})
+        self.assertEqual(response.json['data'], {'count': 0, 'ids': []})
+        self.assertSummaryConsistent()
+
+    def test_soft_delete_by_filter(self):
+        """Test que el borrado por filtros toca solo las transacciones que cumplen todos"""
+        january = [self._create(self.user_id, '5.00', date(2025, 1, day), category_id=self.category_id) for day in (1, 15)]
+        income = self._create(self.user_id, '100.00', date(2025, 1, 10), is_income=True)
+        february = self._create(self.user_id, '7.00', date(2025, 2, 1), category_id=self.category_id)
+
+        response = self.client.delete('/transactions', json={
+            'user_id': self.user_id, 'start_date': '2025-01-01', 'end_date': '2025-01-31', 'is_income': False
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(response.json['data']['ids']), sorted(january))
+        self.assertEqual(self._deleted(january + [income, february]), [True, True, False, False])
+        self.assertSummaryConsistent()
+
+    def test_restore(self):
+        """Test que la restauración masiva solo devuelve las transacciones borradas y repone el resumen"""
+        ids = [self._create(self.user_id, '12.00', date(2025, 3, day), category_id=self.category_id) for day in (1, 2, 3)]
+        before = self._snapshot()
+        self.service.bulk_delete_transactions(self.user_id, ids=ids[:2])
+
+        response = self.client.patch('/transactions/restore', json={'user_id': self.user_id, 'ids': ids})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['data'], {'count': 2, 'ids': sorted(ids[:2])})
+        self.assertEqual(self._deleted(ids), [False, False, False])
+        self.assertEqual(self._snapshot(), before)
+        self.assertSummaryConsistent()
+
+    def test_hard_delete(self):
+        """Test que el borrado físico elimina también las ya borradas sin restarlas dos veces del resumen"""
+        ids = [self._create(self.user_id, '8.00', date(2025, 4, day)) for day in (1, 2, 3)]
+        keep = self._create(self.user_id, '1.00', date(2025, 4, 4))
+        self.service.bulk_delete_transactions(self.user_id, ids=ids[:1])
+
+        response = self.client.delete('/transactions', json={'user_id': self.user_id, 'ids': ids, 'hard': True})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['data']['count'], 3)
+        db.session.expire_all()
+        self.assertEqual([txn.id for txn in Transaction.query.all()], [keep])
+        self.assertSummaryConsistent()
+
+    def test_requires_a_selection(self):
+        """Test que sin IDs ni filtros, o con una lista vacía, el pedido se rechaza"""
+        self._create(self.user_id, '10.00', date(2025, 1, 1))
+        for payload in ({'user_id': self.user_id}, {'user_id': self.user_id, 'ids': []}, {'ids': [1]}):
+            self.assertEqual(self.client.delete('/transactions', json=payload).status_code, 422, payload)
+        self.assertEqual(self.client.patch('/transactions/restore', json={'user_id': self.user_id}).status_code, 422)
+        # hard no aplica a la restauración
+        response = self.client.patch('/transactions/restore', json={'user_id': self.user_id, 'ids': [1], 'hard': True})
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(self._deleted([1]), [False])
+
+    def test_thousands_of_ids_in_one_statement(self):
+        """Test que miles de IDs se borran y restauran con una sola sentencia cada vez"""
+        start = date(2024, 1, 1)
+        ids = TransactionRepository().bulk_insert([
+            {'user_id': self.user_id, 'amount': Decimal('1.00'), 'date': start + timedelta(days=i % 365),
+             'is_income': False, 'deleted': False}
+            for i in range(5000)
+        ])
+        MonthlySummaryRepository().rebuild(self.user_id)
+        db.session.commit()
+
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith(('UPDATE "TRANSACTION"', 'UPDATE TRANSACTION', 'DELETE')):
+                statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', capture)
+        try:
+            deleted = self.service.bulk_delete_transactions(self.user_id, ids=ids)
+            restored = self.service.bulk_restore_transactions(self.user_id, ids=ids)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', capture)
+
+        self.assertEqual(len(deleted), 5000)
+        self.assertEqual(sorted(restored), sorted(ids))
+        self.assertEqual(len(statements), 2)
+        self.assertSummaryConsistent()
+
+    def test_home_deletes_selected_transactions(self):
+        """Test que la página de borrado elimina varias transacciones seleccionadas, solo del usuario en sesión"""
+        mine = [self._create(self.user_id, '3.00', date(2025, 5, day)) for day in (1, 2)]
+        theirs = self._create(self.other_id, '3.00', date(2025, 5, 1))
+        with self.client.session_transaction() as session:
+            session['user_id'] = self.user_id
+
+        response = self.client.post('/delete', data={'transaction_id': mine + [theirs]})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self._deleted(mine + [theirs]), [True, True, False])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest, os
+from sqlalchemy import event
+from app import create_app, db
+from app.extensions import cache
+from app.models.category import Category
+from app.services.category_service import CategoryService
+
+class CategoryServiceCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        # Configuración del entorno de testing
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        cache.clear()
+
+        db.session.add_all([Category(name='Groceries', is_favorite=True), Category(name='Transport')])
+        db.session.commit()
+
+        self.service = CategoryService()
+        self.queries = []
+        event.listen(db.engine, 'before_cursor_execute', self._count_query)
+
+    def tearDown(self):
+        event.remove(db.engine, 'before_cursor_execute', self._count_query)
+        cache.clear()
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _count_query(self, conn, cursor, statement, parameters, context, executemany):
+        self.queries.append(statement)
+
+    def test_list_is_cached(self):
+        """Test que el segundo listado se responde desde la caché"""
+        first = self.service.list_categories()
+        self.queries.clear()
+        second = self.service.list_categories()
+
+        self.assertEqual(self.queries, [])
+        self.assertEqual([c.name for c in first], [c.name for c in second])
+
+    def test_get_category_is_cached(self):
+        """Test que una categoría leída queda en caché"""
+        category_id = self.service.list_categories()[0].id
+        self.service.get_category(category_id)
+        self.queries.clear()
+
+        self.assertEqual(self.service.get_category(category_id).name, 'Groceries')
+        self.assertEqual(self.queries, [])
+
+    def test_writes_invalidate_cache(self):
+        """Test que crear y modificar categorías invalida los listados"""
+        self.assertEqual(len(self.service.list_categories(favorites_only=True)), 1)
+
+        self.service.create_category(name='Health')
+        self.assertEqual(len(self.service.list_categories()), 3)
+
+        transport = Category.query.filter_by(name='Transport').one()
+        self.service.get_category(transport.id)
+        self.service.update_category(transport.id, is_favorite=True)
+        self.assertEqual(len(self.service.list_categories(favorites_only=True)), 2)
+        self.assertTrue(self.service.get_category(transport.id).is_favorite)
+
+        self.service.delete_category(transport.id, soft=False)
+        self.assertIsNone(self.service.get_category(transport.id))
+        self.assertEqual(len(self.service.list_categories()), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest, os
+from datetime import date
+from decimal import Decimal
+from app import create_app, db
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.reports.csv_export import export_transactions_to_csv, iter_transactions_csv
+
+class CsvExportTestCase(unittest.TestCase):
+    def setUp(self):
+        # Configuración del entorno de testing
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.user = User(username='testuser', email='test@example.com')
+        self.user.set_password('TestPassword123')
+        db.session.add(self.user)
+        db.session.commit()
+
+        for day in range(1, 6):
+            db.session.add(Transaction(
+                amount=Decimal('10.00') * day,
+                date=date(2025, 1, day),
+                description=f'Compra {day}',
+                method='Cash',
+                is_income=False,
+                user_id=self.user.id
+            ))
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_iter_emits_header_first(self):
+        """Test que el encabezado se emite antes de consumir las transacciones"""
+        def transactions():
+            raise AssertionError("No se debe consultar antes de emitir el encabezado")
+            yield
+
+        chunks = iter_transactions_csv(transactions())
+        self.assertEqual(next(chunks), "amount,date,description,method,is_income,category_id\r\n")
+
+    def test_iter_matches_full_export(self):
+        """Test que la versión incremental genera el mismo CSV que la exportación completa"""
+        transactions = Transaction.query.order_by(Transaction.date.desc()).all()
+        streamed = "".join(iter_transactions_csv(transactions, rows_per_chunk=2))
+        self.assertEqual(streamed.encode('utf-8'), export_transactions_to_csv(transactions))
+        self.assertEqual(len(streamed.splitlines()), 6)
+
+    def test_export_endpoint_streams(self):
+        """Test que el endpoint de exportación responde en streaming"""
+        client = self.app.test_client()
+        response = client.get(f'/transactions/export?user_id={self.user.id}')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_streamed)
+        lines = response.get_data(as_text=True).splitlines()
+        self.assertEqual(lines[0], "amount,date,description,method,is_income,category_id")
+        self.assertEqual(lines[1], "50.0,2025-01-05,Compra 5,Cash,False,")
+        self.assertEqual(len(lines), 6)
+
+if __name__ == '__main__':
+    unittest.main()
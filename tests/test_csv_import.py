@@ -0,0 +1,109 @@
+import unittest, os
+import io
+from datetime import date
+from decimal import Decimal
+from app import create_app, db
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.models.category import Category
+from app.models.monthly_summary import MonthlySummary
+from app.services import transaction_service
+from app.reports.csv_export import export_transactions_to_csv
+from app.reports.csv_import import iter_transaction_chunks
+
+class CsvImportTestCase(unittest.TestCase):
+    def setUp(self):
+        # Configuración del entorno de testing
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.user = User(username='testuser', email='test@example.com')
+        self.user.set_password('TestPassword123')
+        db.session.add(self.user)
+        self.category = Category(name='Groceries')
+        db.session.add(self.category)
+        db.session.commit()
+
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_chunks_report_line_numbers(self):
+        """Test que el lector valida por bloques e informa errores por número de línea"""
+        content = (
+            "amount,date,description,method,is_income,category_id\n"
+            "10.5,2025-01-01,Pan,Cash,False,\n"
+            "abc,2025-01-02,Leche,Cash,False,\n"
+            "20,2025-01-03,Sueldo,,True,\n"
+            "5,2025-01-04\n"
+        )
+        chunks = list(iter_transaction_chunks(io.StringIO(content), self.user.id, chunk_size=2))
+        self.assertEqual(len(chunks), 2)
+        rows = {**chunks[0][0], **chunks[1][0]}
+        errors = {**chunks[0][1], **chunks[1][1]}
+        self.assertEqual(sorted(rows), [2, 4])
+        self.assertEqual(sorted(errors), [3, 5])
+        self.assertEqual(rows[2]['amount'], Decimal('10.5'))
+        self.assertIsNone(rows[2].get('category_id'))
+        self.assertTrue(rows[4]['is_income'])
+
+    def test_invalid_header(self):
+        """Test que un encabezado distinto al de la exportación se rechaza"""
+        with self.assertRaises(ValueError):
+            next(iter_transaction_chunks(io.StringIO("a,b,c\n1,2,3\n"), self.user.id))
+
+    def test_failure_mid_file_imports_nothing(self):
+        """Test que si el archivo falla después de cargar algunos bloques no queda ninguna fila importada"""
+        header = b"amount,date,description,method,is_income,category_id\n"
+        # Más filas que el buffer del lector de texto, para que el error aparezca con bloques ya cargados
+        rows = b"".join(b"10.00,2025-01-%02d,Compra,Cash,False,\n" % (i % 28 + 1) for i in range(1000))
+        original = transaction_service.IMPORT_CHUNK_SIZE
+        transaction_service.IMPORT_CHUNK_SIZE = 100
+        try:
+            response = self.client.post(
+                f'/transactions/import?user_id={self.user.id}',
+                data={'file': (io.BytesIO(header + rows + b"\xff\xfe,2025-01-01\n"), 'transactions.csv')},
+                content_type='multipart/form-data'
+            )
+        finally:
+            transaction_service.IMPORT_CHUNK_SIZE = original
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(Transaction.query.count(), 0)
+        self.assertEqual(MonthlySummary.query.count(), 0)
+
+    def test_export_import_roundtrip(self):
+        """Test que un archivo exportado se puede volver a importar"""
+        originals = [
+            Transaction(amount=Decimal('12.30'), date=date(2025, 3, 1), description='Compra, con coma',
+                        method='Debit', is_income=False, category_id=self.category.id),
+            Transaction(amount=Decimal('900.00'), date=date(2025, 3, 2), description='Sueldo',
+                        method=None, is_income=True, category_id=None),
+        ]
+        csv_data = export_transactions_to_csv(originals)
+        csv_data += b"7,2025-03-03,Categoria inexistente,Cash,False,9999\n"
+
+        response = self.client.post(
+            f'/transactions/import?user_id={self.user.id}',
+            data={'file': (io.BytesIO(csv_data), 'transactions.csv')},
+            content_type='multipart/form-data'
+        )
+        self.assertEqual(response.status_code, 201)
+        data = response.get_json()['data']
+        self.assertEqual(data['imported'], 2)
+        self.assertEqual(data['error_count'], 1)
+        self.assertIn('4', data['errors'])
+
+        imported = Transaction.query.order_by(Transaction.date).all()
+        self.assertEqual([t.description for t in imported], ['Compra, con coma', 'Sueldo'])
+        self.assertEqual(imported[0].category_id, self.category.id)
+        self.assertEqual(imported[1].amount, Decimal('900.00'))
+        self.assertTrue(all(t.user_id == self.user.id for t in imported))
+
+if __name__ == '__main__':
+    unittest.main()
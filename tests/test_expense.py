@@ -0,0 +1,95 @@
+import unittest, os
+from datetime import date, datetime
+from decimal import Decimal
+from app import create_app, db
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.models.category import Category
+from app.repository.monthly_summary_repository import MonthlySummaryRepository
+from app.services.expense_service import ExpenseService
+
+class ExpenseServiceTestCase(unittest.TestCase):
+    def setUp(self):
+        # Configuración del entorno de testing
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.user = User(username='testuser', email='test@example.com')
+        self.user.set_password('TestPassword123')
+        db.session.add(self.user)
+
+        self.category = Category(name='Groceries')
+        db.session.add(self.category)
+        db.session.commit()
+
+        # Gastos e ingresos de prueba, incluida una transacción borrada que no debe contarse
+        rows = [
+            (Decimal('100.00'), date(2025, 1, 5), False, False),
+            (Decimal('50.50'), date(2025, 1, 20), False, False),
+            (Decimal('1000.00'), date(2025, 1, 1), True, False),
+            (Decimal('30.00'), date(2025, 2, 10), False, False),
+            (Decimal('999.00'), date(2025, 1, 10), False, True),
+        ]
+        for amount, day, is_income, deleted in rows:
+            db.session.add(Transaction(
+                amount=amount,
+                date=day,
+                is_income=is_income,
+                deleted=deleted,
+                user_id=self.user.id,
+                category_id=self.category.id
+            ))
+        db.session.commit()
+        # Los datos se insertan sin pasar por el servicio: se recalcula el resumen mensual
+        MonthlySummaryRepository().rebuild()
+
+        self.service = ExpenseService()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_total_by_period(self):
+        """Test suma de gastos en un periodo"""
+        total = self.service.total_by_period(
+            user_id=self.user.id, is_income=False, start=date(2025, 1, 1), end=date(2025, 1, 31)
+        )
+        self.assertEqual(total, Decimal('150.50'))
+
+    def test_total_by_period_without_rows(self):
+        """Test periodo sin transacciones"""
+        total = self.service.total_by_period(
+            user_id=self.user.id, start=date(2024, 1, 1), end=date(2024, 1, 31)
+        )
+        self.assertEqual(total, 0)
+
+    def test_compare_months(self):
+        """Test comparación entre dos meses"""
+        result = self.service.compare_months(
+            user_id=self.user.id, is_income=False, month1=datetime(2025, 1, 1), month2=datetime(2025, 2, 1)
+        )
+        self.assertEqual(result['mes1_total'], Decimal('150.50'))
+        self.assertEqual(result['mes2_total'], Decimal('30.00'))
+
+    def test_key_indicators(self):
+        """Test promedio diario, máximo y mínimo"""
+        result = self.service.key_indicators(
+            user_id=self.user.id, is_income=False, start=date(2025, 1, 1), end=date(2025, 1, 31)
+        )
+        self.assertAlmostEqual(result['promedio_diario'], 150.50 / 31)
+        self.assertEqual(result['suma_maxima'], Decimal('100.00'))
+        self.assertEqual(result['Suma_minima'], Decimal('50.50'))
+
+    def test_total_income_expense_balance(self):
+        """Test totales de ingresos, gastos y balance"""
+        result = self.service.total_income_expense_balance(user_id=self.user.id)
+        self.assertEqual(result['total_ingresos'], Decimal('1000.00'))
+        self.assertEqual(result['total_gastos'], Decimal('180.50'))
+        self.assertEqual(result['balance'], Decimal('819.50'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest, os
+from datetime import date
+from decimal import Decimal
+from app import create_app, db
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.models.category import Category
+from app.mapping import TransactionSchema, CategorySchema, UserSchema, ResponseSchema, FastSerializer, dump_envelope
+from app.services.response_message import ResponseBuilder
+
+class FastSerializerTestCase(unittest.TestCase):
+    def setUp(self):
+        # Configuración del entorno de testing
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.user = User(username='testuser', email='test@example.com')
+        self.user.set_password('TestPassword123')
+        self.category = Category(name='Groceries', is_favorite=True)
+        db.session.add_all([self.user, self.category])
+        db.session.commit()
+
+        db.session.add_all([
+            Transaction(user_id=self.user.id, category_id=self.category.id, amount=Decimal('12.50'),
+                        date=date(2025, 1, 2), description='Pan', method='Cash', is_income=False),
+            Transaction(user_id=self.user.id, category_id=None, amount=Decimal('1000'),
+                        date=date(2025, 1, 3), description=None, method=None, is_income=True),
+        ])
+        db.session.commit()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_same_output_as_marshmallow(self):
+        """Test que el serializador rápido produce lo mismo que Schema.dump"""
+        cases = [
+            (TransactionSchema, Transaction.query.all()),
+            (CategorySchema, Category.query.all()),
+            (UserSchema, User.query.all()),
+        ]
+        for schema_class, objs in cases:
+            with self.subTest(schema=schema_class.__name__):
+                self.assertEqual(FastSerializer(schema_class()).dump_many(objs), schema_class(many=True).dump(objs))
+                self.assertEqual(FastSerializer(schema_class()).dump_one(objs[0]), schema_class().dump(objs[0]))
+
+    def test_envelope_matches_response_schema(self):
+        """Test que dump_envelope arma el mismo cuerpo que ResponseSchema"""
+        plain = ResponseBuilder().add_message("ok").add_status_code(200).add_data([{"id": 1}]).build()
+        paged = ResponseBuilder().add_message("ok").add_status_code(200).add_data([]).add_next_cursor("abc").build()
+        for response in (plain, paged):
+            self.assertEqual(dump_envelope(response), ResponseSchema().dump(response))
+
+    def test_list_endpoint_output(self):
+        """Test que GET /transactions devuelve lo mismo que el volcado con marshmallow"""
+        response = self.client.get(f'/transactions?user_id={self.user.id}')
+        self.assertEqual(response.status_code, 200)
+        expected = TransactionSchema(many=True).dump(
+            Transaction.query.order_by(Transaction.date.desc()).all()
+        )
+        self.assertEqual(response.get_json()['data'], expected)
+
+if __name__ == '__main__':
+    unittest.main()
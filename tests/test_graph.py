@@ -0,0 +1,168 @@
+import unittest, os
+from datetime import date
+from decimal import Decimal
+from app import create_app, db
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.models.category import Category
+from app.repository.monthly_summary_repository import MonthlySummaryRepository
+from app.services.transaction_service import TransactionService
+from app.resources import transaction as transaction_resource
+from app.services.chart_queue import CHART_QUEUE_KEY
+from app.services.chart_worker import run_chart_worker
+from xml.dom import minidom
+
+class FakeRedis:
+    """Cliente Redis en memoria con los comandos que usa generate_graph"""
+    def __init__(self):
+        self.store = {}
+        self.writes = 0
+
+    def exists(self, key):
+        return int(key in self.store)
+
+    def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.store:
+            return None
+        if key.startswith('donut_chart_'):
+            # Solo se cuentan las imágenes guardadas
+            self.writes += 1
+        # Redis devuelve siempre bytes
+        self.store[key] = value if isinstance(value, bytes) else str(value).encode('utf-8')
+        return True
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def delete(self, *keys):
+        return sum(1 for key in keys if self.store.pop(key, None) is not None)
+
+    def lpush(self, key, value):
+        self.store.setdefault(key, []).insert(0, value.encode('utf-8'))
+
+    def brpop(self, key, timeout=0):
+        items = self.store.get(key)
+        return (key.encode('utf-8'), items.pop()) if items else None
+
+class GraphCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        # Configuración del entorno de testing
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.users = []
+        for name in ('alice', 'bob'):
+            user = User(username=name, email=f'{name}@example.com')
+            user.set_password('TestPassword123')
+            db.session.add(user)
+            self.users.append(user)
+        self.category = Category(name='Groceries')
+        db.session.add(self.category)
+        db.session.commit()
+
+        for user in self.users:
+            db.session.add(Transaction(
+                amount=Decimal('25.00'),
+                date=date(2025, 1, 1),
+                is_income=False,
+                user_id=user.id,
+                category_id=self.category.id
+            ))
+        db.session.commit()
+        # Los datos se insertan sin pasar por el servicio: se recalcula el resumen mensual
+        MonthlySummaryRepository().rebuild()
+
+        self.service = TransactionService(redis_client=FakeRedis())
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_same_data_reuses_image(self):
+        """Test que los mismos datos reutilizan la imagen sin volver a guardarla"""
+        first = self.service.generate_graph(self.users[0].id)
+        second = self.service.generate_graph(self.users[0].id)
+        other_user = self.service.generate_graph(self.users[1].id)
+
+        self.assertEqual(first, second)
+        self.assertEqual(first, other_user)
+        self.assertEqual(self.service.redis_client.writes, 1)
+
+    def test_changed_data_renders_new_image(self):
+        """Test que un cambio en los datos genera una imagen nueva"""
+        first = self.service.generate_graph(self.users[0].id)
+        self.service.create_transaction(
+            user_id=self.users[0].id,
+            amount=Decimal('10.00'),
+            date=date(2025, 1, 2),
+            is_income=False,
+            category_id=self.category.id
+        )
+        second = self.service.generate_graph(self.users[0].id)
+
+        self.assertNotEqual(first, second)
+        self.assertEqual(self.service.redis_client.writes, 2)
+
+    def test_svg_format(self):
+        """Test que el formato svg guarda un SVG válido y se sirve como image/svg+xml"""
+        url = self.service.generate_graph(self.users[0].id, chart_format='svg')
+        self.assertTrue(url.endswith('.svg'))
+        self.assertNotEqual(url, self.service.generate_graph(self.users[0].id, chart_format='png'))
+
+        svg = self.service.redis_client.get(url.rsplit('/', 1)[-1])
+        document = minidom.parseString(svg)
+        self.assertEqual(len(document.getElementsByTagName('path')), 1)
+        self.assertIn('Groceries  $25', svg.decode('utf-8'))
+
+        # El endpoint usa el servicio del módulo: se le inyecta el mismo Redis en memoria
+        original = transaction_resource.transaction_service._redis_client
+        transaction_resource.transaction_service._redis_client = self.service.redis_client
+        try:
+            client = self.app.test_client()
+            response = client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.mimetype, 'image/svg+xml')
+            self.assertEqual(client.get(f'/transactions/{self.users[0].id}/graph?format=gif').status_code, 422)
+        finally:
+            transaction_resource.transaction_service._redis_client = original
+
+    def test_async_mode_renders_in_worker(self):
+        """Test que el modo asíncrono encola una sola vez y muestra el último gráfico mientras se dibuja"""
+        redis_client = self.service.redis_client
+        user_id = self.users[0].id
+        pending = self.service.request_graph(user_id)
+        self.assertEqual(pending, {"status": "pending", "image_url": None})
+        self.service.request_graph(user_id)
+        self.assertEqual(len(redis_client.store[CHART_QUEUE_KEY]), 1)
+
+        self.assertEqual(run_chart_worker(self.app, client=redis_client, burst=True), 1)
+        ready = self.service.request_graph(user_id)
+        self.assertEqual(ready["status"], "ready")
+
+        self.service.create_transaction(
+            user_id=user_id, amount=Decimal('10.00'), date=date(2025, 1, 2),
+            is_income=False, category_id=self.category.id
+        )
+        refreshing = self.service.request_graph(user_id)
+        self.assertEqual(refreshing, {"status": "pending", "image_url": ready["image_url"]})
+        run_chart_worker(self.app, client=redis_client, burst=True)
+        self.assertNotEqual(self.service.request_graph(user_id)["image_url"], ready["image_url"])
+
+    def test_async_endpoint_returns_202(self):
+        """Test que el endpoint en modo asíncrono responde 202 mientras el gráfico está pendiente"""
+        original = transaction_resource.transaction_service._redis_client
+        transaction_resource.transaction_service._redis_client = self.service.redis_client
+        try:
+            response = self.app.test_client().get(f'/transactions/{self.users[0].id}/graph?mode=async')
+            self.assertEqual(response.status_code, 202)
+            self.assertEqual(response.headers['Retry-After'], '1')
+            self.assertEqual(response.get_json()['data']['status'], 'pending')
+        finally:
+            transaction_resource.transaction_service._redis_client = original
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest, os
+from unittest import mock
+from datetime import date
+from decimal import Decimal
+from app import create_app, db
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.models.category import Category
+from app.repository.monthly_summary_repository import MonthlySummaryRepository
+from app.resources import home
+
+class HomeDashboardTestCase(unittest.TestCase):
+    def setUp(self):
+        # Configuración del entorno de testing
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.user = User(username='testuser', email='test@example.com')
+        self.user.set_password('TestPassword123')
+        db.session.add(self.user)
+        self.category = Category(name='Groceries')
+        db.session.add(self.category)
+        db.session.commit()
+
+        db.session.add_all([
+            Transaction(amount=Decimal('1000.00'), date=date(2025, 1, 1), is_income=True,
+                        description='Sueldo', user_id=self.user.id),
+            Transaction(amount=Decimal('250.00'), date=date(2025, 1, 2), is_income=False,
+                        description='Supermercado', user_id=self.user.id, category_id=self.category.id),
+        ])
+        db.session.commit()
+        # Los datos se insertan sin pasar por el servicio: se recalcula el resumen mensual
+        MonthlySummaryRepository().rebuild()
+
+        self.client = self.app.test_client()
+        with self.client.session_transaction() as sess:
+            sess['user_id'] = self.user.id
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_index_renders_without_http_calls(self):
+        """Test que el dashboard arma totales, categorías y transacciones en el mismo proceso"""
+        response = self.client.get('/')
+        self.assertEqual(response.status_code, 200)
+        html = response.get_data(as_text=True)
+        self.assertIn('$1000.0', html)
+        self.assertIn('$250.0', html)
+        self.assertIn('$750.0', html)
+        self.assertIn('Groceries', html)
+        self.assertIn('Supermercado', html)
+
+    def test_index_degrades_when_sections_fail(self):
+        """Test que si fallan las categorías o los totales el dashboard se muestra igual, sin esos datos"""
+        with mock.patch.object(home.category_service, 'list_categories', side_effect=RuntimeError('db caída')), \
+                mock.patch.object(home.expense_service, 'total_income_expense_balance', side_effect=RuntimeError('db caída')), \
+                self.assertLogs('app.resources.home', level='ERROR') as logs:
+            response = self.client.get('/')
+        self.assertEqual(response.status_code, 200)
+        html = response.get_data(as_text=True)
+        self.assertIn('Supermercado', html)
+        self.assertIn('$0.0', html)
+        self.assertEqual(len(logs.records), 2)
+
+    def test_add_form_lists_categories(self):
+        """Test que el formulario de alta lista las categorías"""
+        response = self.client.get('/add')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Groceries', response.get_data(as_text=True))
+
+if __name__ == '__main__':
+    unittest.main()
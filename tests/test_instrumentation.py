@@ -0,0 +1,106 @@
+import unittest, os
+from datetime import date
+from decimal import Decimal
+from app import create_app, db
+from app import instrumentation
+from app.instrumentation import query_shape, query_stats
+from app.resources import admin
+from app.models.transaction import Transaction
+from app.models.user import User
+
+class InstrumentationTestCase(unittest.TestCase):
+    def setUp(self):
+        # Configuración del entorno de testing
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        query_stats.reset()
+
+        user = User(username='testuser', email='test@example.com')
+        user.set_password('TestPassword123')
+        db.session.add(user)
+        db.session.commit()
+        db.session.add(Transaction(user_id=user.id, amount=Decimal('10.00'), date=date(2025, 1, 1), is_income=False))
+        db.session.commit()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        query_stats.reset()
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_query_shape(self):
+        """Test que las sentencias que solo difieren en la cantidad de parámetros tienen la misma forma"""
+        self.assertEqual(
+            query_shape("SELECT id FROM t\n WHERE id IN (?, ?, ?)"),
+            query_shape("SELECT id FROM t WHERE id IN (?)")
+        )
+        self.assertEqual(
+            query_shape("SELECT id FROM t WHERE id IN (%(id_1)s, %(id_2)s)"),
+            "SELECT id FROM t WHERE id IN (?)"
+        )
+
+    def test_server_timing_header(self):
+        """Test que cada respuesta informa consultas y tiempos en Server-Timing"""
+        response = self.client.get('/transactions?per_page=5')
+        self.assertEqual(response.status_code, 200)
+        timing = response.headers['Server-Timing']
+        self.assertIn('db;dur=', timing)
+        self.assertIn('desc="1 queries"', timing)
+        self.assertIn('cache;dur=', timing)
+        self.assertIn('render;dur=', timing)
+
+    def test_slow_queries_are_logged_and_ranked(self):
+        """Test que las consultas lentas se registran con la ruta y aparecen en /admin/slow-queries"""
+        original = instrumentation.SLOW_QUERY_MS
+        instrumentation.SLOW_QUERY_MS = 0
+        try:
+            with self.assertLogs('app.instrumentation', level='WARNING') as logs:
+                self.client.get('/transactions?per_page=5')
+        finally:
+            instrumentation.SLOW_QUERY_MS = original
+        self.assertIn('GET /transactions', logs.output[0])
+
+        self.client.get('/transactions?per_page=10')
+        original = admin.ADMIN_TOKEN
+        admin.ADMIN_TOKEN = 'secret'
+        headers = {'X-Admin-Token': 'secret'}
+        try:
+            data = self.client.get('/admin/slow-queries', headers=headers).get_json()['data']
+            reset = self.client.delete('/admin/slow-queries', headers=headers)
+        finally:
+            admin.ADMIN_TOKEN = original
+        listing = [row for row in data if 'FROM "transaction"' in row['statement'] or 'FROM transaction' in row['statement']]
+        self.assertEqual(listing[0]['count'], 2)
+        self.assertEqual(listing[0]['slowest_route'], 'GET /transactions')
+
+        self.assertEqual(reset.status_code, 200)
+        self.assertEqual(query_stats.top(), [])
+
+    def test_admin_token(self):
+        """Test que con ADMIN_TOKEN definido el endpoint exige el encabezado"""
+        original = admin.ADMIN_TOKEN
+        admin.ADMIN_TOKEN = 'secret'
+        try:
+            self.assertEqual(self.client.get('/admin/slow-queries').status_code, 403)
+            self.assertEqual(self.client.get('/admin/slow-queries', headers={'X-Admin-Token': 'wrong'}).status_code, 403)
+            response = self.client.get('/admin/slow-queries', headers={'X-Admin-Token': 'secret'})
+            self.assertEqual(response.status_code, 200)
+        finally:
+            admin.ADMIN_TOKEN = original
+
+    def test_admin_disabled_without_token(self):
+        """Test que sin ADMIN_TOKEN configurado los endpoints de administración rechazan todo pedido"""
+        original = admin.ADMIN_TOKEN
+        admin.ADMIN_TOKEN = None
+        try:
+            self.assertEqual(self.client.get('/admin/slow-queries').status_code, 403)
+            self.assertEqual(self.client.delete('/admin/slow-queries', headers={'X-Admin-Token': ''}).status_code, 403)
+        finally:
+            admin.ADMIN_TOKEN = original
+
+if __name__ == '__main__':
+    unittest.main()
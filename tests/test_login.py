@@ -0,0 +1,125 @@
+import unittest, os, threading
+from sqlalchemy import event
+from app import create_app, db
+from app.models.user import User
+from unittest import mock
+from werkzeug.security import generate_password_hash
+from app.passwords import PasswordHasher, PasswordHasherBusy, normalize_method, password_hasher
+from app.services import UserService
+
+class LoginTestCase(unittest.TestCase):
+    def setUp(self):
+        # Configuración del entorno de testing
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        # Costo bajo para que los tests sean rápidos
+        self.original_method = password_hasher.method
+        password_hasher.method = 'pbkdf2:sha256:1000'
+        self.service = UserService()
+        self.user_id = self.service.create_user('alice', 'alice@example.com', 'TestPassword123').id
+        # Otro usuario cuyo email es el username del primero
+        self.service.create_user('bob', 'alice', 'OtherPassword123')
+        db.session.expunge_all()
+
+        self.queries = []
+        event.listen(db.engine, 'before_cursor_execute', self._count_query)
+
+    def tearDown(self):
+        event.remove(db.engine, 'before_cursor_execute', self._count_query)
+        password_hasher.method = self.original_method
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _count_query(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            self.queries.append(statement)
+
+    def test_login_is_a_single_query(self):
+        """Test que el login por username, por email o fallido hace una sola consulta"""
+        for login, password, expected in (
+            ('alice', 'TestPassword123', 'alice'),
+            ('alice@example.com', 'TestPassword123', 'alice'),
+            ('nobody', 'TestPassword123', None),
+        ):
+            self.queries.clear()
+            user = self.service.authenticate(login, password)
+            self.assertEqual(user.username if user else None, expected)
+            self.assertEqual(len(self.queries), 1, login)
+
+    def test_username_wins_over_email(self):
+        """Test que si el texto es el username de uno y el email de otro, se busca por username"""
+        self.assertEqual(self.service.authenticate('alice', 'TestPassword123').username, 'alice')
+        self.assertIsNone(self.service.authenticate('alice', 'OtherPassword123'))
+
+    def test_rehash_on_login_when_cost_changes(self):
+        """Test que al cambiar el costo configurado el hash se recalcula en el próximo login correcto"""
+        old_hash = db.session.get(User, self.user_id).password_hash
+        self.assertTrue(old_hash.startswith('pbkdf2:sha256:1000$'))
+
+        # Una contraseña incorrecta no cambia el hash
+        password_hasher.method = 'pbkdf2:sha256:2000'
+        self.assertIsNone(self.service.authenticate('alice', 'wrong'))
+        self.assertEqual(db.session.get(User, self.user_id).password_hash, old_hash)
+
+        user = self.service.authenticate('alice', 'TestPassword123')
+        self.assertTrue(user.password_hash.startswith('pbkdf2:sha256:2000$'))
+        db.session.expunge_all()
+        self.assertTrue(db.session.get(User, self.user_id).password_hash.startswith('pbkdf2:sha256:2000$'))
+        self.assertIsNotNone(self.service.authenticate('alice', 'TestPassword123'))
+
+    def test_normalized_method_matches_werkzeug(self):
+        """Test que el método normalizado coincide con el prefijo que guarda werkzeug, sin calcular un hash"""
+        for method in ('scrypt', 'scrypt:16384:8:2', 'pbkdf2', 'pbkdf2:sha512', 'pbkdf2:sha256:1000'):
+            self.assertEqual(normalize_method(method), generate_password_hash('x', method, 1).split('$', 1)[0], method)
+        with self.assertRaises(ValueError):
+            normalize_method('md5')
+
+        hasher = PasswordHasher(method='scrypt')
+        with mock.patch('app.passwords.generate_password_hash') as generate:
+            self.assertTrue(hasher.needs_rehash('pbkdf2:sha256:1000$salt$hash'))
+            self.assertFalse(hasher.needs_rehash('scrypt:32768:8:1$salt$hash'))
+        generate.assert_not_called()
+
+    def test_busy_hasher_rejects_new_work(self):
+        """Test que con la cola llena los hashes nuevos se rechazan en lugar de esperar indefinidamente"""
+        hasher = PasswordHasher(method='pbkdf2:sha256:1000', workers=1, max_pending=1, timeout=0.05)
+        release = threading.Event()
+        started = threading.Event()
+
+        def block():
+            started.set()
+            release.wait(5)
+        blocker = threading.Thread(target=hasher.run, args=(block,))
+        blocker.start()
+        started.wait(5)
+        try:
+            with self.assertRaises(PasswordHasherBusy):
+                hasher.hash('TestPassword123')
+        finally:
+            release.set()
+            blocker.join()
+        self.assertTrue(hasher.verify(hasher.hash('TestPassword123'), 'TestPassword123'))
+
+    def test_login_page_when_busy(self):
+        """Test que el formulario de login responde 503 si no hay lugar para verificar la contraseña"""
+        original_timeout = password_hasher.timeout
+        password_hasher.timeout = 0
+        acquired = 0
+        while password_hasher._slots.acquire(blocking=False):
+            acquired += 1
+        try:
+            response = self.app.test_client().post('/login', data={'login': 'alice', 'password': 'TestPassword123'})
+        finally:
+            for _ in range(acquired):
+                password_hasher._slots.release()
+            password_hasher.timeout = original_timeout
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers['Retry-After'], '1')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest, os
+from datetime import date, datetime
+from decimal import Decimal
+from app import create_app, db
+from app.models.user import User
+from app.models.category import Category
+from app.models.monthly_summary import MonthlySummary, NO_CATEGORY
+from app.repository.monthly_summary_repository import MonthlySummaryRepository
+from app.services.transaction_service import TransactionService
+from app.services.expense_service import ExpenseService
+
+class MonthlySummaryTestCase(unittest.TestCase):
+    def setUp(self):
+        # Configuración del entorno de testing
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.user = User(username='testuser', email='test@example.com')
+        self.user.set_password('TestPassword123')
+        db.session.add(self.user)
+        self.groceries = Category(name='Groceries')
+        self.transport = Category(name='Transport')
+        db.session.add_all([self.groceries, self.transport])
+        db.session.commit()
+
+        self.service = TransactionService()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _snapshot(self):
+        """Devuelve las filas del resumen con movimientos, como diccionario clave → (total, count)"""
+        return {
+            (row.user_id, row.year_month, row.category_id, row.is_income): (row.total, row.count)
+            for row in MonthlySummary.query.all() if row.count
+        }
+
+    def _create(self, amount, day, category=None, is_income=False):
+        return self.service.create_transaction(
+            user_id=self.user.id,
+            amount=Decimal(amount),
+            date=day,
+            is_income=is_income,
+            category_id=category.id if category else None
+        )
+
+    def test_create_updates_summary(self):
+        """Test que crear transacciones acumula en la fila del mes"""
+        self._create('10.00', date(2025, 1, 3), self.groceries)
+        self._create('15.50', date(2025, 1, 20), self.groceries)
+        self._create('7.00', date(2025, 1, 21))
+
+        summary = self._snapshot()
+        self.assertEqual(summary[(self.user.id, '2025-01', self.groceries.id, False)], (Decimal('25.50'), 2))
+        self.assertEqual(summary[(self.user.id, '2025-01', NO_CATEGORY, False)], (Decimal('7.00'), 1))
+
+    def test_update_delete_restore_match_rebuild(self):
+        """Test que el mantenimiento incremental coincide con recalcular desde cero"""
+        first = self._create('10.00', date(2025, 1, 3), self.groceries)
+        second = self._create('20.00', date(2025, 2, 3), self.transport)
+        self._create('500.00', date(2025, 2, 1), is_income=True)
+
+        self.service.update_transaction(first.id, amount=Decimal('12.00'), date=date(2025, 3, 1))
+        self.service.update_transaction(second.id, category_id=self.groceries.id)
+        self.service.delete_transaction(second.id)
+        self.service.delete_transaction(second.id)  # borrar dos veces no debe restar dos veces
+        self.service.restore_transaction(second.id)
+        self.service.restore_transaction(second.id)
+
+        incremental = self._snapshot()
+        MonthlySummaryRepository().rebuild()
+        self.assertEqual(incremental, self._snapshot())
+
+    def test_reports_read_summary(self):
+        """Test que los reportes mensuales combinan resumen y días sueltos"""
+        self._create('10.00', date(2025, 1, 3), self.groceries)
+        self._create('20.00', date(2025, 2, 3), self.groceries)
+        self._create('40.00', date(2025, 2, 27), self.groceries)
+        self._create('80.00', date(2025, 3, 10), self.groceries)
+
+        expenses = ExpenseService()
+        self.assertEqual(
+            expenses.total_by_period(user_id=self.user.id, start=date(2025, 1, 3), end=date(2025, 3, 9)),
+            Decimal('70.00')
+        )
+        comparison = expenses.compare_months(
+            user_id=self.user.id, month1=datetime(2025, 1, 1), month2=datetime(2025, 2, 1)
+        )
+        self.assertEqual(comparison['mes1_total'], Decimal('10.00'))
+        self.assertEqual(comparison['mes2_total'], Decimal('60.00'))
+
+if __name__ == '__main__':
+    unittest.main()
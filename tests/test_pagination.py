@@ -0,0 +1,84 @@
+import unittest, os
+from datetime import date
+from decimal import Decimal
+from app import create_app, db
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.services.pagination import encode_cursor, decode_cursor
+
+class CursorPaginationTestCase(unittest.TestCase):
+    def setUp(self):
+        # Configuración del entorno de testing
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.user = User(username='testuser', email='test@example.com')
+        self.user.set_password('TestPassword123')
+        db.session.add(self.user)
+        db.session.commit()
+
+        # Varias transacciones por día para verificar el desempate por id
+        for i in range(7):
+            db.session.add(Transaction(
+                amount=Decimal('10.00'),
+                date=date(2025, 1, 1 + i // 3),
+                is_income=False,
+                user_id=self.user.id
+            ))
+        db.session.commit()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_cursor_roundtrip(self):
+        """Test que el cursor codifica y decodifica (date, id)"""
+        token = encode_cursor(date(2025, 3, 4), 42)
+        self.assertEqual(decode_cursor(token), (date(2025, 3, 4), 42))
+        with self.assertRaises(ValueError):
+            decode_cursor('no-es-un-cursor')
+
+    def test_walk_all_pages(self):
+        """Test que recorrer las páginas por cursor devuelve todas las filas en orden, sin repetir"""
+        seen = []
+        cursor = ''
+        while True:
+            response = self.client.get(f'/transactions?user_id={self.user.id}&per_page=3&cursor={cursor}')
+            self.assertEqual(response.status_code, 200)
+            body = response.get_json()
+            seen.extend((row['date'], row['id']) for row in body['data'])
+            cursor = body.get('next_cursor')
+            if not cursor:
+                break
+
+        expected = [
+            (t.date.isoformat(), t.id)
+            for t in Transaction.query.order_by(Transaction.date.desc(), Transaction.id.desc())
+        ]
+        self.assertEqual(seen, expected)
+
+    def test_offset_mode_has_no_cursor(self):
+        """Test que la paginación clásica no agrega next_cursor a la respuesta"""
+        response = self.client.get(f'/transactions?user_id={self.user.id}&per_page=3')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('next_cursor', response.get_json())
+
+    def test_cursor_with_invalid_per_page(self):
+        """Test que un per_page menor que 1 usa el tamaño por defecto en lugar de fallar"""
+        for per_page in (0, -1):
+            response = self.client.get(f'/transactions?user_id={self.user.id}&per_page={per_page}&cursor=')
+            self.assertEqual(response.status_code, 200, per_page)
+            self.assertTrue(0 < len(response.get_json()['data']) <= 20)
+
+    def test_invalid_cursor(self):
+        """Test que un cursor inválido devuelve error de validación"""
+        response = self.client.get('/transactions?cursor=invalido')
+        self.assertEqual(response.status_code, 422)
+
+if __name__ == '__main__':
+    unittest.main()
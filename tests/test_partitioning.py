@@ -0,0 +1,71 @@
+import unittest, os
+from datetime import date
+from decimal import Decimal
+from app import create_app, db
+from app.models import Transaction, User
+from app.models.partitioning import PARTITIONED, existing_partitions, ensure_partitions, partition_ranges
+from app.repository import TransactionRepository
+
+class PartitioningTestCase(unittest.TestCase):
+    def setUp(self):
+        # Configuración del entorno de testing
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_monthly_ranges(self):
+        """Test que los rangos mensuales cubren el período completo y cruzan el cambio de año"""
+        ranges = list(partition_ranges(date(2024, 11, 15), date(2025, 2, 1), 'month'))
+        self.assertEqual([name for name, _, _ in ranges],
+                         ['transaction_p2024_11', 'transaction_p2024_12', 'transaction_p2025_01', 'transaction_p2025_02'])
+        self.assertEqual(ranges[1][1:], (date(2024, 12, 1), date(2025, 1, 1)))
+        # Cada partición termina donde empieza la siguiente
+        self.assertTrue(all(ranges[i][2] == ranges[i + 1][1] for i in range(len(ranges) - 1)))
+
+    def test_yearly_ranges(self):
+        """Test que los rangos anuales van del 1 de enero al 1 de enero siguiente"""
+        ranges = list(partition_ranges(date(2024, 6, 30), date(2025, 1, 1), 'year'))
+        self.assertEqual(ranges, [
+            ('transaction_p2024', date(2024, 1, 1), date(2025, 1, 1)),
+            ('transaction_p2025', date(2025, 1, 1), date(2026, 1, 1)),
+        ])
+
+    def test_get_by_id_uses_id_as_identity(self):
+        """Test que la identidad del ORM es solo id, aunque la tabla particionada use (id, date)"""
+        self.assertEqual([column.name for column in Transaction.__mapper__.primary_key], ['id'])
+        user = User(username='testuser', email='test@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.commit()
+        ids = TransactionRepository().bulk_insert([
+            {'user_id': user.id, 'amount': Decimal('1.00'), 'date': day, 'is_income': False, 'deleted': False}
+            for day in (date(2020, 1, 1), date(2025, 6, 15), date(2031, 12, 31))
+        ])
+        db.session.expunge_all()
+        for txn_id, day in zip(ids, (date(2020, 1, 1), date(2025, 6, 15), date(2031, 12, 31))):
+            self.assertEqual(TransactionRepository().get_by_id(txn_id).date, day)
+
+    @unittest.skipUnless(PARTITIONED and os.environ.get('TEST_DB_URI', '').startswith('postgresql'),
+                         'Requiere PostgreSQL con TRANSACTION_PARTITION_INTERVAL')
+    def test_ensure_moves_rows_out_of_default(self):
+        """Test que crear una partición mueve a ella las filas que estaban en la partición por defecto"""
+        user = User(username='testuser', email='test@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.commit()
+        far = date(2040, 3, 10)
+        TransactionRepository().bulk_insert([
+            {'user_id': user.id, 'amount': Decimal('1.00'), 'date': far, 'is_income': False, 'deleted': False}
+        ])
+        created = ensure_partitions(db.session.connection(), far, far)
+        self.assertEqual(len(created), 1)
+        self.assertIn(created[0], existing_partitions(db.session.connection()))
+        self.assertEqual(len(TransactionRepository().filter(user_id=user.id, start_date=far, end_date=far)), 1)
+
+if __name__ == '__main__':
+    unittest.main()
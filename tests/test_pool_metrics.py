@@ -0,0 +1,68 @@
+import unittest, os
+import tempfile
+from sqlalchemy import create_engine, exc, text
+from app import create_app, db
+from app.resources import admin
+from app.config.config import engine_options
+from app.pool_metrics import MeteredQueuePool, pool_stats, pool_status
+
+class PoolMetricsTestCase(unittest.TestCase):
+    def setUp(self):
+        # Configuración del entorno de testing
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        pool_stats.reset()
+
+    def tearDown(self):
+        pool_stats.reset()
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_engine_options(self):
+        """Test que las opciones del pool se arman con statement_timeout en connect_args"""
+        options = engine_options(pool_size=3, max_overflow=2, pool_timeout=5, pool_recycle=60, statement_timeout=1500)
+        self.assertIs(options['poolclass'], MeteredQueuePool)
+        self.assertEqual(options['pool_size'], 3)
+        self.assertTrue(options['pool_pre_ping'])
+        self.assertEqual(options['connect_args'], {'options': '-c statement_timeout=1500'})
+        self.assertNotIn('connect_args', engine_options(pool_size=3, max_overflow=2, pool_timeout=5, pool_recycle=60))
+
+    def test_metered_pool_records_checkouts_and_timeouts(self):
+        """Test que el pool registra checkouts, conexiones en uso y timeouts"""
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f'sqlite:///{tmp}/pool.db', poolclass=MeteredQueuePool,
+                                   pool_size=1, max_overflow=0, pool_timeout=0.05)
+            conn = engine.connect()
+            conn.execute(text('SELECT 1'))
+            self.assertEqual(pool_status(engine.pool)['checked_out'], 1)
+            with self.assertRaises(exc.TimeoutError):
+                engine.connect()
+            conn.close()
+            engine.dispose()
+
+        status = pool_stats.snapshot()
+        self.assertEqual(status['checkouts'], 2)
+        self.assertEqual(status['timeouts'], 1)
+        self.assertGreaterEqual(status['max_wait_ms'], 50)
+
+    def test_pool_endpoint(self):
+        """Test que /admin/pool informa el estado del pool solo con el token de administración"""
+        client = self.app.test_client()
+        original = admin.ADMIN_TOKEN
+        admin.ADMIN_TOKEN = 'secret'
+        try:
+            self.assertEqual(client.get('/admin/pool').status_code, 403)
+            response = client.get('/admin/pool', headers={'X-Admin-Token': 'secret'})
+        finally:
+            admin.ADMIN_TOKEN = original
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()['data']
+        self.assertIn('pool', data)
+        self.assertIn('avg_wait_ms', data)
+
+if __name__ == '__main__':
+    unittest.main()
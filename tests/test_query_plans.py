@@ -0,0 +1,183 @@
+import unittest, os
+from contextlib import contextmanager
+from sqlalchemy import event, func, select, text
+from app import create_app, db
+from app.models import Transaction
+from app.repository import TransactionRepository
+from benchmarks.dataset import DatasetSpec, generate
+
+"""
+Regresiones de planes de consulta: ejecuta EXPLAIN sobre cada consulta de TransactionRepository
+contra un PostgreSQL local con datos sembrados y falla si alguna lee transaction con un Seq Scan,
+si no usa el índice esperado o si ordena en memoria lo que el índice ya entrega ordenado.
+Solo corre con TEST_DB_URI apuntando a PostgreSQL (con SQLite los planes no son comparables).
+"""
+
+ON_POSTGRES = os.environ.get('TEST_DB_URI', '').startswith('postgresql')
+
+@unittest.skipUnless(ON_POSTGRES, 'Requiere TEST_DB_URI con PostgreSQL')
+class QueryPlansTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Configuración del entorno de testing; los datos se siembran una sola vez para todos los casos
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        cls.app = create_app()
+        cls.app_context = cls.app.app_context()
+        cls.app_context.push()
+        db.create_all()
+        generate(DatasetSpec(users=50, categories=12, transactions=100_000, days=730))
+        # Estadísticas y mapa de visibilidad al día (los index-only scan dependen de VACUUM)
+        with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+            connection.execute(text('VACUUM (ANALYZE) "transaction"'))
+
+        counts = db.session.execute(
+            select(Transaction.user_id, func.count()).group_by(Transaction.user_id).order_by(func.count())
+        ).all()
+        # Un usuario típico (mediana): con el más activo un Seq Scan podría ser el plan correcto
+        cls.user_id = counts[len(counts) // 2][0]
+        cls.last = db.session.scalar(select(func.max(Transaction.date)))
+        cls.some_id = db.session.scalar(select(func.max(Transaction.id)))
+        cls.category_id = db.session.scalar(
+            select(Transaction.category_id).where(Transaction.category_id.isnot(None)).limit(1)
+        )
+        cls.user_txn_ids = db.session.scalars(
+            select(Transaction.id).where(Transaction.user_id == cls.user_id).limit(50)
+        ).all()
+        db.session.commit()
+
+    @classmethod
+    def tearDownClass(cls):
+        db.session.remove()
+        db.drop_all()
+        cls.app_context.pop()
+
+    def setUp(self):
+        self.repo = TransactionRepository()
+
+    @contextmanager
+    def captured(self):
+        """Junta las sentencias (y sus parámetros) que ejecuta el bloque"""
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append((statement, parameters))
+        event.listen(db.engine, 'before_cursor_execute', capture)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', capture)
+
+    def plan_of(self, run):
+        """Ejecuta run() y devuelve los nodos de los planes de todas sus consultas sobre transaction"""
+        # Sin objetos en la sesión: get_by_id no puede resolverse desde el identity map
+        db.session.expunge_all()
+        with self.captured() as statements:
+            run()
+        db.session.rollback()
+        parents = self.parent_indexes()
+        nodes = []
+        for statement, parameters in statements:
+            if 'transaction' not in statement:
+                continue
+            plan = db.session.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+            nodes.extend(self.walk(plan[0]['Plan'], parents))
+        db.session.rollback()
+        self.assertTrue(nodes, 'No se ejecutó ninguna consulta sobre transaction')
+        return nodes
+
+    def walk(self, node, parents):
+        # En una tabla particionada cada partición tiene su copia del índice: se informa el de la tabla padre
+        if 'Index Name' in node:
+            node = dict(node, **{'Index Name': parents.get(node['Index Name'], node['Index Name'])})
+        yield node
+        for child in node.get('Plans', []):
+            yield from self.walk(child, parents)
+
+    def parent_indexes(self):
+        rows = db.session.execute(text("""
+            SELECT child.relname, parent.relname FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            WHERE child.relkind = 'i'
+        """)).all()
+        return dict(rows)
+
+    def assertPlan(self, run, index, index_only=False, sorted_by_index=False):
+        nodes = self.plan_of(run)
+        on_transaction = [node for node in nodes if node.get('Relation Name', '').startswith('transaction')]
+        seq_scans = [node['Relation Name'] for node in on_transaction if node['Node Type'] == 'Seq Scan']
+        self.assertEqual(seq_scans, [], f'Seq Scan sobre {seq_scans}')
+        used = {node['Index Name'] for node in nodes if 'Index Name' in node}
+        self.assertIn(index, used)
+        if index_only:
+            self.assertTrue(all(node['Node Type'] == 'Index Only Scan' for node in on_transaction),
+                            [node['Node Type'] for node in on_transaction])
+        if sorted_by_index:
+            self.assertNotIn('Sort', [node['Node Type'] for node in nodes])
+        return nodes
+
+    def test_filter_user_page(self):
+        """Test que la página de un usuario sale ordenada del índice parcial, sin ordenar en memoria"""
+        self.assertPlan(lambda: self.repo.filter(user_id=self.user_id, per_page=20, read_only=True),
+                        'ix_txn_user_date_active', sorted_by_index=True)
+        self.assertPlan(lambda: self.repo.filter(user_id=self.user_id, per_page=20),
+                        'ix_txn_user_date_active', sorted_by_index=True)
+
+    def test_filter_all_users_page(self):
+        """Test que el listado sin usuario usa el índice por fecha de las transacciones activas"""
+        self.assertPlan(lambda: self.repo.filter(per_page=20, read_only=True), 'ix_txn_date_active', sorted_by_index=True)
+
+    def test_filter_range_and_category(self):
+        """Test que los filtros por rango de fechas y categoría no recorren la tabla"""
+        self.assertPlan(lambda: self.repo.filter(
+            user_id=self.user_id, start_date=self.last.replace(day=1), end_date=self.last,
+            category_id=self.category_id, per_page=100, read_only=True
+        ), 'ix_txn_user_date_active')
+
+    def test_filter_keyset(self):
+        """Test que la paginación por cursor continúa sobre el índice"""
+        self.assertPlan(lambda: self.repo.filter_keyset(
+            user_id=self.user_id, after=(self.last, self.some_id), limit=50, read_only=True
+        ), 'ix_txn_user_date_active', sorted_by_index=True)
+
+    def test_stream(self):
+        """Test que la exportación de un usuario recorre el índice en orden"""
+        self.assertPlan(lambda: list(self.repo.stream(user_id=self.user_id, read_only=True)),
+                        'ix_txn_user_date_active', sorted_by_index=True)
+
+    def test_aggregate_is_index_only(self):
+        """Test que los totales por período se calculan sin leer el heap"""
+        self.assertPlan(lambda: self.repo.aggregate(
+            user_id=self.user_id, start_date=self.last.replace(month=1, day=1), end_date=self.last
+        ), 'ix_txn_user_date_active', index_only=True)
+
+    def test_generate_graph_is_index_only(self):
+        """Test que el total por categoría del gráfico se calcula sin leer el heap"""
+        self.assertPlan(lambda: self.repo.generate_graph(self.user_id), 'ix_txn_user_date_active', index_only=True)
+
+    def test_bulk_by_ids(self):
+        """Test que el borrado, la restauración y el borrado físico por IDs buscan por clave primaria"""
+        # plan_of hace rollback: cada operación se ejecuta y se descarta
+        for run in (
+            lambda: self.repo.set_deleted_many(self.user_id, True, self.user_txn_ids),
+            lambda: self.repo.set_deleted_many(self.user_id, False, self.user_txn_ids),
+            lambda: self.repo.delete_many(self.user_id, self.user_txn_ids),
+        ):
+            self.assertPlan(run, 'transaction_pkey')
+
+    def test_bulk_by_filter(self):
+        """Test que las operaciones masivas por usuario y rango de fechas no recorren la tabla"""
+        month = dict(start_date=self.last.replace(day=1), end_date=self.last)
+        # Borrar toca solo activas: coincide con el índice parcial
+        self.assertPlan(lambda: self.repo.set_deleted_many(self.user_id, True, **month), 'ix_txn_user_date_active')
+        self.assertPlan(lambda: self.repo.set_deleted_many(self.user_id, False, **month), 'ix_txn_user_date')
+        self.assertPlan(lambda: self.repo.delete_many(self.user_id, **month), 'ix_txn_user_date')
+
+    def test_get_by_id(self):
+        """Test que buscar por id usa la clave primaria (en todas las particiones si la tabla está particionada)"""
+        nodes = self.plan_of(lambda: self.repo.get_by_id(self.some_id))
+        self.assertIn('transaction_pkey', {node['Index Name'] for node in nodes if 'Index Name' in node})
+        self.assertNotIn('Seq Scan', [node['Node Type'] for node in nodes])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import unittest, os
+import redis
+from app import create_app
+from app.config.cache_config import redis_config
+from app.extensions import get_redis
+from app.services.transaction_service import TransactionService
+
+class RedisPoolTestCase(unittest.TestCase):
+    def setUp(self):
+        # Configuración del entorno de testing
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+    def tearDown(self):
+        self.app_context.pop()
+
+    def test_single_bounded_pool(self):
+        """Test que la app crea un único pool acotado y con timeouts"""
+        pool = get_redis().connection_pool
+        self.assertIsInstance(pool, redis.BlockingConnectionPool)
+        self.assertEqual(pool.max_connections, redis_config['max_connections'])
+        self.assertEqual(pool.connection_kwargs['socket_timeout'], redis_config['socket_timeout'])
+        self.assertEqual(pool.connection_kwargs['health_check_interval'], redis_config['health_check_interval'])
+
+    def test_services_share_the_app_client(self):
+        """Test que los servicios usan el cliente de la app en lugar de crear el suyo"""
+        first, second = TransactionService(), TransactionService()
+        self.assertIs(first.redis_client, get_redis())
+        self.assertIs(second.redis_client.connection_pool, first.redis_client.connection_pool)
+
+if __name__ == '__main__':
+    unittest.main()
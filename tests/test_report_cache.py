@@ -0,0 +1,83 @@
+import unittest, os
+from datetime import date
+from decimal import Decimal
+from sqlalchemy import event
+from app import create_app, db
+from app.models.user import User
+from app.services.expense_service import ExpenseService
+from app.services.transaction_service import TransactionService
+from app.services.report_cache import data_version
+
+class ReportCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        # Configuración del entorno de testing
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.users = []
+        for name in ('alice', 'bob'):
+            user = User(username=name, email=f'{name}@example.com')
+            user.set_password('TestPassword123')
+            db.session.add(user)
+            self.users.append(user)
+        db.session.commit()
+
+        self.transactions = TransactionService()
+        self.expenses = ExpenseService()
+        for user in self.users:
+            self.transactions.create_transaction(
+                user_id=user.id, amount=Decimal('100.00'), date=date(2025, 1, 10), is_income=True
+            )
+
+        self.queries = []
+        event.listen(db.engine, 'before_cursor_execute', self._count_query)
+
+    def tearDown(self):
+        event.remove(db.engine, 'before_cursor_execute', self._count_query)
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _count_query(self, conn, cursor, statement, parameters, context, executemany):
+        self.queries.append(statement)
+
+    def test_repeated_report_skips_database(self):
+        """Test que repetir un reporte no consulta la base de datos"""
+        first = self.expenses.total_income_expense_balance(self.users[0].id)
+        self.queries.clear()
+        second = self.expenses.total_income_expense_balance(self.users[0].id)
+
+        self.assertEqual(self.queries, [])
+        self.assertEqual(first, second)
+
+    def test_write_invalidates_only_that_user(self):
+        """Test que una escritura invalida los reportes del usuario y no los de otros"""
+        alice, bob = self.users
+        self.expenses.total_income_expense_balance(alice.id)
+        self.expenses.total_income_expense_balance(bob.id)
+        bob_version = data_version(bob.id)
+
+        txn = self.transactions.create_transaction(
+            user_id=alice.id, amount=Decimal('30.00'), date=date(2025, 1, 11), is_income=False
+        )
+        self.assertEqual(self.expenses.total_income_expense_balance(alice.id)['balance'], Decimal('70.00'))
+        self.assertEqual(data_version(bob.id), bob_version)
+
+        self.transactions.delete_transaction(txn.id)
+        self.assertEqual(self.expenses.total_income_expense_balance(alice.id)['balance'], Decimal('100.00'))
+
+    def test_global_reports_follow_any_write(self):
+        """Test que los reportes sin user_id se invalidan con cualquier escritura"""
+        period = dict(start=date(2025, 1, 1), end=date(2025, 1, 31), is_income=True)
+        self.assertEqual(self.expenses.total_by_period(**period), Decimal('200.00'))
+
+        self.transactions.create_transaction(
+            user_id=self.users[1].id, amount=Decimal('50.00'), date=date(2025, 1, 12), is_income=True
+        )
+        self.assertEqual(self.expenses.total_by_period(**period), Decimal('250.00'))
+
+if __name__ == '__main__':
+    unittest.main()
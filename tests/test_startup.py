@@ -0,0 +1,16 @@
+import unittest, os
+from benchmarks.startup import measure_startup
+
+class StartupTestCase(unittest.TestCase):
+    def setUp(self):
+        # Configuración del entorno de testing
+        os.environ['FLASK_CONTEXT'] = 'testing'
+
+    def test_create_app_skips_heavy_packages(self):
+        """Test que crear la app no importa matplotlib ni numpy (se cargan al dibujar el primer gráfico)"""
+        result = measure_startup()
+        self.assertEqual(result['heavy'], [])
+        self.assertIn('app', result['imports_ms'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest, os
+from datetime import date, timedelta
+from decimal import Decimal
+from sqlalchemy import event
+from app import create_app, db
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.models.category import Category
+from app.models.records import TransactionRecord
+from app.mapping import TransactionSchema, FastSerializer
+from app.reports.csv_export import export_transactions_to_csv
+from app.repository.transaction_repository import TransactionRepository
+
+class TransactionQueriesTestCase(unittest.TestCase):
+    def setUp(self):
+        # Configuración del entorno de testing
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_app()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        users = []
+        for name in ('alice', 'bob', 'carol'):
+            user = User(username=name, email=f'{name}@example.com')
+            user.set_password('TestPassword123')
+            users.append(user)
+        categories = [Category(name=name) for name in ('Groceries', 'Transport', 'Health')]
+        db.session.add_all(users + categories)
+        db.session.commit()
+
+        # 30 transacciones repartidas entre usuarios y categorías distintas
+        for i in range(30):
+            db.session.add(Transaction(
+                user_id=users[i % 3].id,
+                category_id=categories[i % 3].id if i % 4 else None,
+                amount=Decimal('10.00'),
+                date=date(2025, 1, 1) + timedelta(days=i),
+                is_income=bool(i % 2)
+            ))
+        db.session.commit()
+        db.session.expunge_all()
+
+        self.client = self.app.test_client()
+        self.queries = []
+        event.listen(db.engine, 'before_cursor_execute', self._count_query)
+
+    def tearDown(self):
+        event.remove(db.engine, 'before_cursor_execute', self._count_query)
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _count_query(self, conn, cursor, statement, parameters, context, executemany):
+        self.queries.append(statement)
+
+    def _count_for(self, url):
+        self.queries.clear()
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(self.queries), response.get_json()['data']
+
+    def test_page_query_count_is_constant(self):
+        """Test que listar transacciones no hace una consulta por fila para user y category"""
+        small, small_data = self._count_for('/transactions?per_page=5')
+        large, large_data = self._count_for('/transactions?per_page=25')
+
+        self.assertEqual(len(small_data), 5)
+        self.assertEqual(len(large_data), 25)
+        self.assertEqual(small, large)
+        self.assertEqual(large, 1)
+        self.assertTrue(all(row['user']['username'] for row in large_data))
+
+    def test_cursor_page_query_count_is_constant(self):
+        """Test que la paginación por cursor también trae las relaciones en la misma consulta"""
+        small, _ = self._count_for('/transactions?cursor=&per_page=5')
+        large, large_data = self._count_for('/transactions?cursor=&per_page=25&user_id=1')
+
+        self.assertEqual(small, large)
+        self.assertEqual(large, 1)
+        self.assertTrue(any(row['category'] for row in large_data))
+
+    def test_read_only_records_match_models(self):
+        """Test que el modo de solo lectura devuelve registros equivalentes a los modelos y fuera de la sesión"""
+        repo = TransactionRepository()
+        records = repo.filter(user_id=1, per_page=50, read_only=True)
+        self.assertEqual(len(db.session.identity_map), 0)
+        models = repo.filter(user_id=1, per_page=50)
+
+        self.assertTrue(all(isinstance(record, TransactionRecord) for record in records))
+        self.assertEqual([r.id for r in records], [m.id for m in models])
+        self.assertEqual(FastSerializer(TransactionSchema()).dump_many(records), TransactionSchema(many=True).dump(models))
+        self.assertEqual(export_transactions_to_csv(records), export_transactions_to_csv(models))
+        self.assertEqual(list(repo.stream(user_id=1, read_only=True)), records)
+        self.assertEqual(repo.get_by_user(1, page=2, per_page=4, read_only=True), records[4:8])
+
+if __name__ == '__main__':
+    unittest.main()
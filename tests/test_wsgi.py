@@ -0,0 +1,29 @@
+import unittest, os
+from app import db
+from app.models.category import Category
+from app.wsgi import create_wsgi_app, after_fork
+
+class WsgiTestCase(unittest.TestCase):
+    def setUp(self):
+        # Configuración del entorno de testing
+        os.environ['FLASK_CONTEXT'] = 'testing'
+        self.app = create_wsgi_app()
+
+    def test_worker_reconnects_after_fork(self):
+        """Test que después de descartar los pools heredados el worker vuelve a conectarse"""
+        after_fork(self.app)
+        with self.app.app_context():
+            db.create_all()
+            db.session.add(Category(name='Groceries'))
+            db.session.commit()
+            self.assertEqual(Category.query.count(), 1)
+            db.session.remove()
+            db.drop_all()
+
+    def test_serves_requests(self):
+        """Test que la app creada por la fábrica WSGI atiende pedidos"""
+        response = self.app.test_client().get('/login')
+        self.assertEqual(response.status_code, 200)
+
+if __name__ == '__main__':
+    unittest.main()